@@ -0,0 +1,250 @@
+"""Offline load test of the agent loop and the /api/v1/chat route.
+
+The LLM is replaced by the local stub in benchmarks/stub_llm.py (through
+litellm with ``api_base``), the database is the Postgres configured in
+Settings. Nothing leaves the machine.
+
+Usage:
+    python -m benchmarks.load_test --target agent --concurrency 8 --requests 200
+    python -m benchmarks.load_test --target api --delay-ms 50 \\
+        --output benchmarks/results/api.json --baseline benchmarks/baselines/api.json
+
+Reported metrics: latency p50/p95/p99, requests/s, LLM calls per chat, DB
+round-trips (pool checkouts) per chat and peak RSS. ``--output`` saves them
+as JSON; ``--baseline`` prints the relative change against a saved run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.stub_llm import StubLLMServer
+
+# Cycled by the workers; keywords drive the stub script (see stub_llm.py)
+MESSAGES = [
+    "insert: gasté 12.5 en comida",
+    "query: ¿cuánto llevo gastado en comida?",
+    "hola",
+]
+
+# Metrics where a higher value is an improvement (for the baseline diff)
+HIGHER_IS_BETTER = {"completed", "requests_per_second"}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def configure_environment(stub: StubLLMServer) -> None:
+    """Point Settings at the stub before any src module reads them."""
+    os.environ["MODEL_NAME"] = "openai/stub"
+    os.environ["LLM_API_BASE"] = stub.api_base
+    os.environ["REASONING_EFFORT"] = "none"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+
+def run_agent_target(concurrency: int, requests: int) -> tuple[list[float], int, Callable[[], int]]:
+    """Drive FinancialAgent.chat from a thread pool, one agent per worker."""
+    from src.agent import AgentTracer, FinancialAgent, LLMClient, ToolRegistry
+    from src.database import DatabaseConnection, FinancialRepository
+
+    db = DatabaseConnection()
+    db.initialize_schema()
+    client = LLMClient()
+    registry = ToolRegistry(FinancialRepository(db))
+    local = threading.local()
+
+    def one_chat(index: int) -> float:
+        agent = getattr(local, "agent", None)
+        if agent is None:
+            agent = FinancialAgent(client, registry, tracer=AgentTracer())
+            local.agent = agent
+        start = time.perf_counter()
+        agent.chat(MESSAGES[index % len(MESSAGES)])
+        return time.perf_counter() - start
+
+    latencies: list[float] = []
+    errors = 0
+    checkouts_before = db.pool_stats()["checkouts"]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(one_chat, i) for i in range(requests)]:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+
+    return latencies, errors, lambda: db.pool_stats()["checkouts"] - checkouts_before
+
+
+def run_api_target(concurrency: int, requests: int) -> tuple[list[float], int, Callable[[], int]]:
+    """Serve main:app with uvicorn in-process and hit /api/v1/chat over HTTP."""
+    import httpx
+    import uvicorn
+
+    from main import app
+    from src.api.dependencies import get_db_connection
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    db = get_db_connection()
+    checkouts_before = db.pool_stats()["checkouts"]
+
+    async def drive() -> tuple[list[float], int]:
+        latencies: list[float] = []
+        errors = 0
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency)
+
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as http:
+
+            async def one_chat(index: int) -> None:
+                nonlocal errors
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await http.post(
+                        "/api/v1/chat",
+                        json={
+                            "message": MESSAGES[index % len(MESSAGES)],
+                            "session_id": f"bench-{index % concurrency}",
+                        },
+                    )
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+
+            await asyncio.gather(*(one_chat(i) for i in range(requests)))
+        return latencies, errors
+
+    try:
+        latencies, errors = asyncio.run(drive())
+        round_trips = db.pool_stats()["checkouts"] - checkouts_before
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    return latencies, errors, lambda: round_trips
+
+
+def summarize(
+    target: str,
+    args: argparse.Namespace,
+    latencies: list[float],
+    errors: int,
+    elapsed: float,
+    llm_calls: int,
+    db_round_trips: int,
+) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    completed = len(latencies)
+    return {
+        "target": target,
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "llm_delay_ms": args.delay_ms,
+        },
+        "completed": completed,
+        "errors": errors,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 50) * 1000, 2),
+            "p95": round(percentile(ordered, 95) * 1000, 2),
+            "p99": round(percentile(ordered, 99) * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        },
+        "requests_per_second": round(completed / elapsed, 2) if elapsed else 0.0,
+        "llm_calls_per_chat": round(llm_calls / completed, 3) if completed else 0.0,
+        "db_round_trips_per_chat": round(db_round_trips / completed, 3) if completed else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def flatten(report: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for key, value in report.items():
+        if key == "config":
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            flat[name] = float(value)
+    return flat
+
+
+def print_comparison(report: dict[str, Any], baseline: dict[str, Any], threshold: float) -> None:
+    current, previous = flatten(report), flatten(baseline)
+    print(f"\n{'metric':<28}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, value in current.items():
+        if name not in previous:
+            continue
+        before = previous[name]
+        change = (value - before) / before * 100 if before else 0.0
+        worse = change < 0 if name in HIGHER_IS_BETTER else change > 0
+        flag = "  <-- regression" if worse and abs(change) >= threshold else ""
+        print(f"{name:<28}{before:>12.2f}{value:>12.2f}{change:>9.1f}%{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["agent", "api"], default="agent")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay-ms", type=float, default=20.0, help="Stub LLM latency per call")
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous JSON report")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Change (%%) flagged as regression against the baseline"
+    )
+    args = parser.parse_args()
+
+    stub = StubLLMServer(delay_ms=args.delay_ms).start()
+    configure_environment(stub)
+
+    runner = run_agent_target if args.target == "agent" else run_api_target
+    start = time.perf_counter()
+    latencies, errors, db_round_trips = runner(args.concurrency, args.requests)
+    elapsed = time.perf_counter() - start
+    stub.stop()
+
+    report = summarize(
+        args.target, args, latencies, errors, elapsed, stub.request_count, db_round_trips()
+    )
+    print(json.dumps(report, indent=2))
+
+    if args.baseline and args.baseline.exists():
+        print_comparison(report, json.loads(args.baseline.read_text()), args.threshold)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Benchmark of prepared statements on the repository query path.
+
+For a few ``FinancialRepository.query`` shapes it reports:
+
+- the server planning time of the plain statement versus ``EXECUTE`` of
+  the prepared one on a pooled connection (``EXPLAIN (ANALYZE)``),
+- end-to-end ``query`` latency with DATABASE_PREPARED_STATEMENTS on and
+  off (query cache disabled, parameters varied on every call), and
+- how many generic (reused) and custom (re-planned) plans the server ran.
+
+Usage:
+    python -m benchmarks.prepared --calls 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import DEFAULT_USER_ID, DatabaseConnection, FinancialRepository, StatementRegistry
+from src.schemas import TableName
+
+TABLE = TableName.EXPENSES
+
+
+def shapes(categories: list[str], cursors: list[str]) -> dict[str, Callable[[random.Random], dict[str, Any]]]:
+    """Query arguments per shape, randomized per call."""
+
+    def month(rng: random.Random) -> tuple[date, date]:
+        start = date(2022, 1, 1) + timedelta(days=rng.randrange(330))
+        return start, start + timedelta(days=30)
+
+    def latest(rng: random.Random) -> dict[str, Any]:
+        return {"limit": rng.choice([10, 20, 50])}
+
+    def category_month(rng: random.Random) -> dict[str, Any]:
+        date_from, date_to = month(rng)
+        return {"filters": {"category": rng.choice(categories)}, "date_from": date_from, "date_to": date_to, "limit": 20}
+
+    def amounts_page(rng: random.Random) -> dict[str, Any]:
+        low = rng.randrange(1, 400)
+        return {"amount_min": low, "amount_max": low + 50, "cursor": rng.choice(cursors), "limit": 20}
+
+    return {"latest": latest, "category + month": category_month, "amount range + cursor": amounts_page}
+
+
+def planning_ms(db: DatabaseConnection, registry: StatementRegistry, query: str, values: list[Any], prepared: bool) -> float:
+    with db.get_connection() as conn, conn.cursor() as cursor:
+        if prepared:
+            registry.execute(cursor, query, values)
+            name = registry.statement_name(query)
+            cursor.execute(
+                f"EXPLAIN (ANALYZE, FORMAT JSON) EXECUTE {name} ({', '.join(['%s'] * len(values))})", values
+            )
+        else:
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", values)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Planning Time"]
+
+
+def time_calls(repository: FinancialRepository, make_args: Callable[[random.Random], dict[str, Any]], calls: int) -> list[float]:
+    rng = random.Random(7)
+    timings = []
+    for _ in range(calls):
+        args = make_args(rng)
+        start = time.perf_counter()
+        repository.query(DEFAULT_USER_ID, TABLE, **args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000, help="query calls per shape and mode")
+    parser.add_argument("--repeat", type=int, default=20, help="EXPLAIN samples per shape and mode")
+    args = parser.parse_args()
+
+    # Every call must reach the database; only the explicit registry prepares
+    os.environ["QUERY_CACHE_ENABLED"] = "false"
+    os.environ["DATABASE_PREPARED_STATEMENTS"] = "false"
+
+    plain_db = DatabaseConnection()
+    registry = StatementRegistry()
+    prepared_db = DatabaseConnection(statements=registry)
+    plain = FinancialRepository(plain_db)
+    prepared = FinancialRepository(prepared_db)
+
+    with plain_db.get_cursor() as cursor:
+        cursor.execute(
+            f"SELECT category FROM {TABLE.value} WHERE user_id = %s GROUP BY 1 ORDER BY COUNT(*) DESC LIMIT 10",
+            (DEFAULT_USER_ID,),
+        )
+        categories = [row["category"] for row in cursor.fetchall()]
+    records = plain.query(DEFAULT_USER_ID, TABLE, limit=500)
+    cursors = [plain.encode_cursor(record) for record in records[::25]] or [None]
+    cases = shapes(categories, cursors)
+
+    print("Server planning time (ms, median of EXPLAIN ANALYZE)")
+    print(f"{'shape':<26}{'plain':>10}{'prepared':>10}")
+    rng = random.Random(1)
+    queries = {}
+    for name, make_args in cases.items():
+        a = make_args(rng)
+        query, values = plain._query_statement(
+            DEFAULT_USER_ID, TABLE, a.get("filters"), a["limit"], a.get("date_from"), a.get("date_to"),
+            a.get("amount_min"), a.get("amount_max"), a.get("cursor"),
+        )
+        queries[name] = query
+        samples = {
+            mode: statistics.median(planning_ms(prepared_db, registry, query, values, mode) for _ in range(args.repeat))
+            for mode in (False, True)
+        }
+        print(f"{name:<26}{samples[False]:>10.3f}{samples[True]:>10.3f}")
+
+    print()
+    print(f"repository.query latency over {args.calls} calls (ms)")
+    print(f"{'shape':<26}{'mode':<10}{'mean':>8}{'p50':>8}{'p95':>8}{'calls/s':>10}")
+    for name, make_args in cases.items():
+        for mode, repository in (("plain", plain), ("prepared", prepared)):
+            time_calls(repository, make_args, 50)  # warm-up: connections, caches, generic plans
+            timings = sorted(time_calls(repository, make_args, args.calls))
+            mean = statistics.fmean(timings)
+            print(
+                f"{name:<26}{mode:<10}{mean * 1000:>8.3f}{timings[len(timings) // 2] * 1000:>8.3f}"
+                f"{timings[int(len(timings) * 0.95)] * 1000:>8.3f}{1 / mean:>10,.0f}"
+            )
+
+    print()
+    print("Plans chosen by the server for the prepared shapes")
+    with prepared_db.get_cursor() as cursor:
+        cursor.execute(
+            "SELECT name, generic_plans, custom_plans FROM pg_prepared_statements WHERE name = ANY(%s)",
+            ([StatementRegistry.statement_name(query) for query in queries.values()],),
+        )
+        plans = {row["name"]: row for row in cursor.fetchall()}
+    for name, query in queries.items():
+        row = plans.get(StatementRegistry.statement_name(query), {})
+        print(f"{name:<26}generic={row.get('generic_plans', 0)} custom={row.get('custom_plans', 0)}")
+
+    print()
+    print("prepared statements:", registry.stats())
+    plain_db.close()
+    prepared_db.close()
+
+
+if __name__ == "__main__":
+    main()
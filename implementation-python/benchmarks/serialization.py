@@ -0,0 +1,123 @@
+"""Micro-benchmark of FinancialRepository row serialization.
+
+Compares the per-value path (RealDictCursor rows + ``_serialize_record``)
+with the column-typed converters built once from the cursor description,
+in record, tuple and columnar shapes.
+
+Usage:
+    python -m benchmarks.serialization --rows 100000
+    python -m benchmarks.serialization --rows 100000 --db   # fetch from the expenses table
+
+Without ``--db`` the rows are synthetic and only the Python conversion is
+timed; with ``--db`` each path runs the same SELECT end to end.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from psycopg2.extensions import Column
+
+from src.database import DatabaseConnection, FinancialRepository
+
+# id, amount, category, description, created_at
+DESCRIPTION = [
+    Column(name="id", type_code=23),
+    Column(name="amount", type_code=1700),
+    Column(name="category", type_code=1043),
+    Column(name="description", type_code=1043),
+    Column(name="created_at", type_code=1114),
+]
+
+
+def synthetic_rows(count: int) -> list[tuple[Any, ...]]:
+    start = datetime(2024, 1, 1)
+    return [
+        (i, Decimal(f"{i % 500}.{i % 100:02d}"), f"cat{i % 7}", None if i % 3 else "nota", start + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, run: Callable[[], Any]) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def synthetic_cases(repository: FinancialRepository, rows: list[tuple[Any, ...]]) -> dict[str, Callable[[], Any]]:
+    names = [column.name for column in DESCRIPTION]
+
+    def per_value() -> list[dict[str, Any]]:
+        # Stands in for RealDictCursor building a dict per row
+        return [repository._serialize_record(dict(zip(names, row))) for row in rows]
+
+    return {
+        "per-value (dict rows + _serialize_record)": per_value,
+        "typed records": lambda: repository._records_converter(DESCRIPTION)(rows),
+        "typed tuples": lambda: repository._tuples_converter(DESCRIPTION)(rows),
+        "typed columns": lambda: repository._columns_converter(DESCRIPTION)(rows),
+    }
+
+
+def db_cases(repository: FinancialRepository, db: DatabaseConnection, limit: int) -> dict[str, Callable[[], Any]]:
+    query = "SELECT id, amount, category, description, created_at FROM expenses ORDER BY created_at DESC, id DESC LIMIT %s"
+
+    def per_value() -> list[dict[str, Any]]:
+        with db.get_cursor() as cursor:
+            cursor.execute(query, (limit,))
+            return [repository._serialize_record(dict(row)) for row in cursor.fetchall()]
+
+    def typed(converter: Callable[[Any], Callable[[list[tuple[Any, ...]]], Any]]) -> Callable[[], Any]:
+        def run() -> Any:
+            with db.get_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (limit,))
+                return converter(cursor.description)(cursor.fetchall())
+
+        return run
+
+    return {
+        "per-value (RealDictCursor + _serialize_record)": per_value,
+        "typed records": typed(repository._records_converter),
+        "typed tuples": typed(repository._tuples_converter),
+        "typed columns": typed(repository._columns_converter),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", action="store_true", help="Fetch the rows from the expenses table")
+    args = parser.parse_args()
+
+    db = DatabaseConnection()
+    repository = FinancialRepository(db)
+
+    if args.db:
+        cases = db_cases(repository, db, args.rows)
+    else:
+        cases = synthetic_cases(repository, synthetic_rows(args.rows))
+
+    print(f"{'path':<50}{'best ms':>10}{'median ms':>12}{'rows/s':>14}")
+    baseline = None
+    for name, run in cases.items():
+        best, median = best_of(args.repeat, run)
+        baseline = baseline or best
+        speedup = f"  x{baseline / best:.2f}" if best else ""
+        print(f"{name:<50}{best * 1000:>10.1f}{median * 1000:>12.1f}{args.rows / best:>14,.0f}{speedup}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Local OpenAI-compatible chat completions server with scripted answers.
+
+litellm can target it with ``model="openai/stub"`` and ``api_base`` pointing
+here. The reply depends on the conversation:
+
+- last message from a tool -> final answer
+- last user message contains "insert" -> one insert_record call
+- last user message contains "query" -> query_records + aggregate_records calls
+- anything else -> direct answer
+
+Usage:
+    python -m benchmarks.stub_llm --port 8100 --delay-ms 50
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+def _tool_call(call_id: str, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)},
+    }
+
+
+class StubLLMServer:
+    """Threaded HTTP server answering POST /v1/chat/completions."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay_ms: float = 0.0):
+        self.delay_ms = delay_ms
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._requests = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                body = json.dumps(stub.respond(payload)).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def request_count(self) -> int:
+        with self._lock:
+            return self._requests
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, payload: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            self._requests += 1
+            response_id = next(self._ids)
+
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+
+        messages = payload.get("messages", [])
+        message = self._script(messages, response_id)
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+
+        return {
+            "id": f"chatcmpl-stub-{response_id}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": 20,
+                "total_tokens": prompt_tokens + 20,
+            },
+        }
+
+    def _script(self, messages: list[dict[str, Any]], response_id: int) -> dict[str, Any]:
+        last = messages[-1] if messages else {}
+        if last.get("role") == "tool":
+            return {"role": "assistant", "content": "Hecho. Aquí tienes el resultado."}
+
+        text = str(last.get("content") or "").lower()
+        if "insert" in text:
+            return {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    _tool_call(
+                        f"call_{response_id}_0",
+                        "insert_record",
+                        {"table": "expenses", "amount": 12.5, "category": "comida"},
+                    )
+                ],
+            }
+        if "query" in text:
+            return {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    _tool_call(
+                        f"call_{response_id}_0",
+                        "query_records",
+                        {"table": "expenses", "category": "comida", "limit": 20},
+                    ),
+                    _tool_call(
+                        f"call_{response_id}_1",
+                        "aggregate_records",
+                        {"table": "expenses", "group_by": "category", "period": "month"},
+                    ),
+                ],
+            }
+        return {"role": "assistant", "content": "Hola, ¿en qué puedo ayudarte?"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Latency added to every response")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.delay_ms)
+    print(f"Stub LLM listening on {server.api_base}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
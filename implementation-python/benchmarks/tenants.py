@@ -0,0 +1,176 @@
+"""Benchmark of per-user reads on the hash-partitioned record tables.
+
+Seeds ``--users`` synthetic users (``bench-<n>``) with ``--rows`` expenses
+each through ``FinancialRepository.copy_records`` (skipped when they are
+already loaded), then reports for randomly chosen users:
+
+- ``query`` latency for a one-week window and for the latest records,
+- ``aggregate`` latency for a year of monthly totals per category (served
+  by the monthly rollup) and for a one-week total (scanned), and
+- how many partitions the planner keeps for a user-scoped statement.
+
+The query cache is disabled so every call reaches the database.
+
+Usage:
+    python -m benchmarks.tenants --users 50 --rows 20000
+    python -m benchmarks.tenants --drop   # delete the bench-* users and exit
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import DatabaseConnection, FinancialRepository
+from src.schemas import TableName
+
+TABLE = TableName.EXPENSES
+PREFIX = "bench-"
+CATEGORIES = ["comida", "transporte", "ocio", "hogar", "salud", "ropa", "viajes", "servicios"]
+START = datetime(2023, 1, 1)
+
+
+def synthetic_records(seed: int, count: int) -> Iterator[dict[str, Any]]:
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "amount": round(rng.uniform(1, 500), 2),
+            "category": rng.choice(CATEGORIES),
+            "description": None,
+            "created_at": START + timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+        }
+
+
+def seed_users(db: DatabaseConnection, repository: FinancialRepository, users: list[str], rows: int) -> None:
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            f"SELECT user_id FROM {TABLE.value} WHERE user_id = ANY(%s) GROUP BY 1 HAVING COUNT(*) >= %s",
+            (users, rows),
+        )
+        loaded = {row["user_id"] for row in cursor.fetchall()}
+    missing = [user for user in users if user not in loaded]
+    if not missing:
+        return
+    print(f"Seeding {len(missing)} users x {rows:,} rows...")
+    start = time.perf_counter()
+    with db.get_cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE.value} WHERE user_id = ANY(%s)", (missing,))
+    for user in missing:
+        repository.copy_records(user, TABLE, synthetic_records(users.index(user), rows))
+    with db.get_cursor() as cursor:
+        cursor.execute(f"ANALYZE {TABLE.value}")
+    print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+
+def drop_users(db: DatabaseConnection) -> None:
+    with db.get_cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE.value} WHERE user_id LIKE %s", (PREFIX + "%",))
+        print(f"Deleted {cursor.rowcount:,} rows")
+
+
+def scanned_partitions(db: DatabaseConnection, query: str, values: list[Any]) -> list[str]:
+    def relations(node: dict[str, Any]) -> Iterator[str]:
+        if "Relation Name" in node:
+            yield node["Relation Name"]
+        for child in node.get("Plans", []):
+            yield from relations(child)
+
+    with db.get_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", values)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+    return sorted(set(relations(plan[0]["Plan"])))
+
+
+def cases(repository: FinancialRepository) -> dict[str, Callable[[str, random.Random], Any]]:
+    def week(rng: random.Random) -> tuple[date, date]:
+        start = START.date() + timedelta(days=rng.randrange(358))
+        return start, start + timedelta(days=7)
+
+    def latest(user: str, rng: random.Random) -> Any:
+        return repository.query(user, TABLE, limit=20)
+
+    def week_records(user: str, rng: random.Random) -> Any:
+        date_from, date_to = week(rng)
+        return repository.query(user, TABLE, date_from=date_from, date_to=date_to, limit=100)
+
+    def year_by_month(user: str, rng: random.Random) -> Any:
+        return repository.aggregate(
+            user, TABLE, ["sum", "count"], group_by="category", period="month",
+            date_from=date(2023, 1, 1), date_to=date(2023, 12, 31),
+        )
+
+    def week_total(user: str, rng: random.Random) -> Any:
+        date_from, date_to = week(rng)
+        return repository.aggregate(user, TABLE, ["sum", "count"], date_from=date_from, date_to=date_to)
+
+    return {
+        "query latest 20": latest,
+        "query one week": week_records,
+        "aggregate year by month": year_by_month,
+        "aggregate one week": week_total,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="synthetic users to seed")
+    parser.add_argument("--rows", type=int, default=20000, help="expenses per synthetic user")
+    parser.add_argument("--calls", type=int, default=1000, help="calls per case, each for a random user")
+    parser.add_argument("--drop", action="store_true", help="delete the synthetic users and exit")
+    args = parser.parse_args()
+
+    os.environ["QUERY_CACHE_ENABLED"] = "false"
+    db = DatabaseConnection()
+    db.initialize_schema()
+    repository = FinancialRepository(db)
+
+    if args.drop:
+        drop_users(db)
+        db.close()
+        return
+
+    users = [f"{PREFIX}{n}" for n in range(args.users)]
+    seed_users(db, repository, users, args.rows)
+    with db.get_cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) AS rows, COUNT(DISTINCT user_id) AS users FROM {TABLE.value}")
+        totals = cursor.fetchone()
+    print(f"{TABLE.value}: {totals['rows']:,} rows, {totals['users']:,} users")
+
+    query, values = repository._query_statement(users[0], TABLE, None, 20, None, None, None, None, None)
+    partitions = scanned_partitions(db, query, values)
+    print(f"Partitions scanned by a user-scoped query: {len(partitions)} ({', '.join(partitions)})")
+
+    print()
+    print(f"Latency over {args.calls} calls, random user per call (ms)")
+    print(f"{'case':<26}{'mean':>8}{'p50':>8}{'p95':>8}{'calls/s':>10}")
+    for name, run in cases(repository).items():
+        rng = random.Random(3)
+        for _ in range(20):  # warm-up
+            run(rng.choice(users), rng)
+        timings = []
+        for _ in range(args.calls):
+            user = rng.choice(users)
+            start = time.perf_counter()
+            run(user, rng)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        mean = statistics.fmean(timings)
+        print(
+            f"{name:<26}{mean * 1000:>8.3f}{timings[len(timings) // 2] * 1000:>8.3f}"
+            f"{timings[int(len(timings) * 0.95)] * 1000:>8.3f}{1 / mean:>10,.0f}"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,37 @@
 """Interactive CLI for the Financial Agent."""
 
+import argparse
+import asyncio
+import atexit
+import json
 import sys
+from datetime import date
+from pathlib import Path
 
-from src.agent import FinancialAgent, LLMClient, ToolRegistry
-from src.database import DatabaseConnection, FinancialRepository
+from src.agent import AgentTracer, FinancialAgent, LLMClient, ToolRegistry
+from src.database import DEFAULT_USER_ID, DatabaseConnection, FinancialRepository, RecordExporter, RecordImporter
 from src.config import get_settings
+from src.observability import JsonlTraceSink
+from src.schemas import TableName
 
 
-def create_agent() -> FinancialAgent:
-    """Create and configure the financial agent."""
+def create_agent(user_id: str) -> FinancialAgent:
+    """Create and configure the financial agent for a user."""
     db_connection = DatabaseConnection()
     db_connection.initialize_schema()
     repository = FinancialRepository(db_connection)
     client = LLMClient()
     tool_registry = ToolRegistry(repository)
 
-    return FinancialAgent(client=client, tool_registry=tool_registry)
+    settings = get_settings()
+    sink = None
+    if settings.trace_log_path:
+        sink = JsonlTraceSink(settings.trace_log_path, max_queue=settings.trace_log_queue_size)
+        atexit.register(sink.close)
+    # The CLI is the only place where the chain of thought is printed
+    tracer = AgentTracer(console=True, sink=sink)
+
+    return FinancialAgent(client=client, tool_registry=tool_registry, tracer=tracer, user_id=user_id)
 
 
 def print_banner() -> None:
@@ -24,17 +40,134 @@ def print_banner() -> None:
     print("  FINANCIAL AGENT - Asistente Financiero Inteligente")
 
 
+async def stream_response(agent: FinancialAgent, user_input: str) -> None:
+    """Print the agent answer token by token as the model produces it."""
+    streamed = False
+    async for event in agent.astream(user_input):
+        if event["event"] == "token":
+            if not streamed:
+                print("\n🤖 Asistente: ", end="", flush=True)
+                streamed = True
+            print(event["data"]["content"], end="", flush=True)
+        elif event["event"] == "tool_call_start":
+            if streamed:
+                print()
+            streamed = False
+        elif event["event"] == "done":
+            if streamed:
+                print()
+            else:
+                # Fallback answers (e.g. max iterations) are not model tokens.
+                print(f"\n🤖 Asistente: {event['data']['response']}")
+
+
+def import_file(user_id: str, table: str, path: Path, fmt: str | None) -> None:
+    """Bulk load a CSV / JSON Lines file and print the import report."""
+    settings = get_settings()
+    db_connection = DatabaseConnection()
+    db_connection.initialize_schema()
+    importer = RecordImporter(
+        FinancialRepository(db_connection),
+        chunk_size=settings.import_chunk_size,
+        max_reported_errors=settings.import_max_reported_errors,
+    )
+
+    with path.open(encoding="utf-8-sig", newline="") as stream:
+        fmt = fmt or RecordImporter.detect_format(path.name)
+        report = importer.import_stream(user_id, TableName(table), stream, fmt)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    db_connection.close()
+
+
+def export_table(
+    user_id: str, table: str, fmt: str, output: Path | None, date_from: date | None, date_to: date | None
+) -> None:
+    """Stream a table to a file (or stdout) chunk by chunk."""
+    db_connection = DatabaseConnection()
+    exporter = RecordExporter(FinancialRepository(db_connection), batch_size=get_settings().export_batch_size)
+    chunks = exporter.export(user_id, TableName(table), fmt, date_from=date_from, date_to=date_to)
+
+    if output is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+    else:
+        with output.open("w", encoding="utf-8", newline="") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        print(f"Exportado {table} a {output}", file=sys.stderr)
+    db_connection.close()
+
+
+def rebuild_rollups(tables: list[TableName]) -> None:
+    """Recompute the monthly rollups of the given tables (all by default)."""
+    db_connection = DatabaseConnection()
+    db_connection.initialize_schema()
+    repository = FinancialRepository(db_connection)
+
+    for table in tables or list(TableName):
+        groups = repository.rebuild_rollups(table)
+        print(f"{table.value}_monthly: {groups} grupos (mes, grupo)")
+    db_connection.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Financial Agent CLI")
+    parser.add_argument(
+        "--user", default=DEFAULT_USER_ID, help=f"Usuario dueño de los registros (por defecto, {DEFAULT_USER_ID})"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    import_parser = commands.add_parser("import", help="Importar registros desde un fichero CSV o JSONL")
+    import_parser.add_argument("table", choices=[table.value for table in TableName])
+    import_parser.add_argument("file", type=Path)
+    import_parser.add_argument(
+        "--format", choices=RecordImporter.FORMATS, help="Por defecto según la extensión del fichero"
+    )
+
+    export_parser = commands.add_parser("export", help="Exportar registros a CSV, JSONL o columnas")
+    export_parser.add_argument("table", choices=[table.value for table in TableName])
+    export_parser.add_argument("--format", choices=RecordExporter.FORMATS, default="csv")
+    export_parser.add_argument("--output", type=Path, help="Fichero de salida (por defecto, stdout)")
+    export_parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="YYYY-MM-DD")
+    export_parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="YYYY-MM-DD")
+
+    rollups_parser = commands.add_parser(
+        "rebuild-rollups", help="Recalcular los resúmenes mensuales a partir de los registros"
+    )
+    # choices would reject the empty default of nargs="*"
+    rollups_parser.add_argument(
+        "tables", nargs="*", type=TableName, metavar="table", help="expenses, savings o investments (por defecto, todas)"
+    )
+
+    return parser.parse_args()
+
+
 def main() -> None:
-    """Run the interactive CLI."""
+    """Run the interactive CLI, or a subcommand."""
+    args = parse_args()
+    if args.command == "import":
+        import_file(args.user, args.table, args.file, args.format)
+        return
+    if args.command == "export":
+        export_table(args.user, args.table, args.format, args.output, args.date_from, args.date_to)
+        return
+    if args.command == "rebuild-rollups":
+        rebuild_rollups(args.tables)
+        return
+
     print_banner()
 
     try:
-        agent = create_agent()
+        agent = create_agent(args.user)
         print("Agente inicializado correctamente\n")
     except Exception as e:
         print(f"Error inicializando el agente: {e}")
         sys.exit(1)
 
+    # One loop for the whole session so litellm's async clients are reused.
+    loop = asyncio.new_event_loop()
+
     while True:
         try:
             user_input = input("\n - Tú: ").strip()
@@ -56,8 +189,7 @@ def main() -> None:
                 continue
 
             print()  
-            response = agent.chat(user_input)
-            print(f"\n🤖 Asistente: {response}")
+            loop.run_until_complete(stream_response(agent, user_input))
 
         except KeyboardInterrupt:
             print("\n\n¡Hasta luego!")
@@ -65,6 +197,8 @@ def main() -> None:
         except Exception as e:
             print(f"\nError: {e}")
 
+    loop.close()
+
 
 if __name__ == "__main__":
     main()
@@ -5,8 +5,14 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 
+from src.agent.search import get_search_backend
 from src.api import router
-from src.api.dependencies import get_db_connection
+from src.api.dependencies import (
+    get_async_db_connection,
+    get_db_connection,
+    get_trace_sink,
+    uses_async_backend,
+)
 
 
 @asynccontextmanager
@@ -14,13 +20,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler for startup/shutdown events."""
     # Startup: Initialize database schema
     db = get_db_connection()
-    db.initialize_schema()
+    if uses_async_backend():
+        await get_async_db_connection().initialize_schema()
+    else:
+        db.initialize_schema()
     print("Database schema initialized")
 
     yield
 
-    # Shutdown: cleanup if needed
+    # Shutdown: release pooled connections and clients and flush queued traces
     print("Shutting down...")
+    db.close()
+    get_search_backend().close()
+    if uses_async_backend():
+        await get_async_db_connection().close()
+    sink = get_trace_sink()
+    if sink is not None:
+        sink.close()
 
 
 app = FastAPI(
@@ -9,6 +9,7 @@ from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.config import get_settings
+from src.database import DatabaseConnection
 
 
 def create_database_if_not_exists() -> bool:
@@ -45,46 +46,15 @@ def create_database_if_not_exists() -> bool:
 
 
 def initialize_schema() -> None:
-    """Create database tables."""
-    settings = get_settings()
-
-    conn = psycopg2.connect(settings.database_url)
-    cursor = conn.cursor()
-
-    schema_sql = """
-    CREATE TABLE IF NOT EXISTS expenses (
-        id SERIAL PRIMARY KEY,
-        amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
-        category VARCHAR(100) NOT NULL,
-        description VARCHAR(500),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-
-    CREATE TABLE IF NOT EXISTS savings (
-        id SERIAL PRIMARY KEY,
-        amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
-        goal VARCHAR(100) NOT NULL,
-        description VARCHAR(500),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-
-    CREATE TABLE IF NOT EXISTS investments (
-        id SERIAL PRIMARY KEY,
-        amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
-        asset_type VARCHAR(100) NOT NULL,
-        description VARCHAR(500),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-    """
-
-    cursor.execute(schema_sql)
-    conn.commit()
+    """Create database tables and indexes."""
+    db = DatabaseConnection(get_settings().database_url)
+    try:
+        db.initialize_schema()
+    finally:
+        db.close()
 
     print("Database schema initialized successfully.")
 
-    cursor.close()
-    conn.close()
-
 
 def main() -> None:
     try:
@@ -2,7 +2,22 @@ from src.agent.client import LLMClient
 from src.agent.tools import ToolRegistry
 from src.agent.agent import FinancialAgent
 from src.agent.tracer import AgentTracer, TraceType
+from src.agent.sessions import SessionStore
+from src.agent.conversations import ConversationStore, InMemoryConversationStore
+from src.agent.search import DuckDuckGoBackend, SearchBackend
 
 OpenRouterClient = LLMClient
 
-__all__ = ["LLMClient", "OpenRouterClient", "ToolRegistry", "FinancialAgent", "AgentTracer", "TraceType"]
+__all__ = [
+    "LLMClient",
+    "OpenRouterClient",
+    "ToolRegistry",
+    "FinancialAgent",
+    "AgentTracer",
+    "TraceType",
+    "SessionStore",
+    "ConversationStore",
+    "InMemoryConversationStore",
+    "DuckDuckGoBackend",
+    "SearchBackend",
+]
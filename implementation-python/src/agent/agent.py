@@ -1,11 +1,27 @@
+import asyncio
 import json
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, ContextManager, Iterator
 
 from src.agent.client import LLMClient
+from src.agent.completion import CompletionPolicy, write_only_reply
+from src.agent.conversations import ConversationStore
+from src.agent.fast_path import InsertIntent, format_insert_confirmation, parse_insert_intent
+from src.agent.history import ConversationHistory
 from src.agent.tools import ToolRegistry
 from src.agent.tracer import AgentTracer, TraceType
 from src.config import get_settings
+from src.database import DEFAULT_USER_ID
+from src.observability import Span
+from src.observability.metrics import (
+    AGENT_ITERATIONS,
+    FAST_PATH_TURNS,
+    LLM_CALLS_SKIPPED,
+    MAX_ITERATIONS_REACHED,
+)
 
 
 class FinancialAgent:
@@ -17,109 +33,491 @@ class FinancialAgent:
         tool_registry: ToolRegistry,
         max_iterations: int | None = None,
         tracer: AgentTracer | None = None,
+        fast_path: bool | None = None,
+        completion_policy: CompletionPolicy | str | None = None,
+        user_id: str = DEFAULT_USER_ID,
+        session_id: str = "default",
+        conversation_store: ConversationStore | None = None,
     ):
+        settings = get_settings()
         self._client = client
         self._tools = tool_registry
-        self._max_iterations = max_iterations or get_settings().max_iterations
-        self._tracer = tracer or AgentTracer(enabled=True)
+        # Every database tool call of this agent is scoped to this user
+        self._user_id = user_id
+        self._session_id = session_id
+        # Without a store the history lives only in this agent
+        self._store = conversation_store
+        self._resume_messages = settings.conversation_resume_messages
+        self._stored_epoch = -1
+        self._stored_id = 0
+        self._max_iterations = max_iterations or settings.max_iterations
+        self._tracer = tracer or AgentTracer()
+        self._fast_path = settings.fast_path_enabled if fast_path is None else fast_path
+        self._completion_policy = CompletionPolicy(completion_policy or settings.completion_policy)
         self._system_prompt = self._load_system_prompt()
-        self._conversation: list[dict[str, Any]] = [
-            {"role": "system", "content": self._system_prompt}
-        ]
+        self._conversation = ConversationHistory(
+            self._dated_system_prompt(),
+            model=client.model,
+            max_tokens=settings.context_max_tokens,
+            keep_recent_turns=settings.context_keep_recent_turns,
+        )
 
     def _load_system_prompt(self) -> str:
         prompt_file = self.PROMPTS_DIR / "system_prompt.txt"
         if prompt_file.exists():
-            return prompt_file.read_text(encoding="utf-8")
-        return "Eres un asistente financiero inteligente."
+            prompt = prompt_file.read_text(encoding="utf-8")
+        else:
+            prompt = "Eres un asistente financiero inteligente."
+        return prompt
+
+    def _dated_system_prompt(self) -> str:
+        # Needed to resolve relative date ranges such as "este mes"; refreshed
+        # every turn so a long-lived session does not keep yesterday's date
+        return f"{self._system_prompt}\n\nFecha actual: {date.today().isoformat()}"
 
     def chat(self, user_message: str) -> str:
+        with self._turn():
+            self._start_turn(user_message)
+
+            fast_path = self._match_fast_path(user_message)
+            if fast_path is not None:
+                tool_call, intent = fast_path
+                result = self._tools.execute(*self._start_tool_call(tool_call), self._user_id)
+                reply = self._finish_fast_path(tool_call, intent, result)
+                if reply is not None:
+                    return reply
+
+            for iteration in range(self._max_iterations):
+                self._prepare_model_request()
+                with self._llm_span() as llm_span:
+                    response = self._client.chat_completion(
+                        messages=self._conversation.messages,
+                        tools=self._tools.get_tool_definitions(),
+                    )
+                    llm_span.set_usage(response.get("usage"))
+
+                tool_calls, final = self._handle_model_response(response)
+                if final is not None:
+                    return final
+
+                calls = [self._start_tool_call(tool_call) for tool_call in tool_calls]
+                results = self._tools.execute_many(calls, self._user_id)
+                for tool_call, (tool_name, _), result in zip(tool_calls, calls, results):
+                    self._finish_tool_call(tool_call, tool_name, result)
+
+                reply = self._complete_without_model(user_message, iteration, calls, results)
+                if reply is not None:
+                    return reply
+
+            return self._max_iterations_reached()
+
+    async def achat(self, user_message: str) -> str:
+        """Async variant of chat: awaits the model and the tools instead of blocking."""
+        async with self._aturn("async"):
+            self._start_turn(user_message)
+
+            fast_path = self._match_fast_path(user_message)
+            if fast_path is not None:
+                tool_call, intent = fast_path
+                result = await self._tools.aexecute(*self._start_tool_call(tool_call), self._user_id)
+                reply = self._finish_fast_path(tool_call, intent, result)
+                if reply is not None:
+                    return reply
+
+            for iteration in range(self._max_iterations):
+                self._prepare_model_request()
+                with self._llm_span() as llm_span:
+                    response = await self._client.achat_completion(
+                        messages=self._conversation.messages,
+                        tools=self._tools.get_tool_definitions(),
+                    )
+                    llm_span.set_usage(response.get("usage"))
+
+                tool_calls, final = self._handle_model_response(response)
+                if final is not None:
+                    return final
+
+                calls = [self._start_tool_call(tool_call) for tool_call in tool_calls]
+                results = await self._tools.aexecute_many(calls, self._user_id)
+                for tool_call, (tool_name, _), result in zip(tool_calls, calls, results):
+                    self._finish_tool_call(tool_call, tool_name, result)
+
+                reply = self._complete_without_model(user_message, iteration, calls, results)
+                if reply is not None:
+                    return reply
+
+            return self._max_iterations_reached()
+
+    async def astream(self, user_message: str) -> AsyncIterator[dict[str, Any]]:
+        """Run the agent loop streaming its progress as events.
+
+        Yields dicts ``{"event": name, "data": dict}`` where name is one of
+        ``token`` (text delta from the model), ``tool_call_start``,
+        ``tool_call_end``, ``trace`` (an AgentTracer entry) and, last,
+        ``done`` with the final response.
+        """
+        pending_traces: list[dict[str, Any]] = []
+        listener = pending_traces.append
+        self._tracer.add_listener(listener)
+        try:
+            final: str | None = None
+            async with self._aturn("stream"):
+                self._start_turn(user_message)
+
+                fast_path = self._match_fast_path(user_message)
+                if fast_path is not None:
+                    tool_call, intent = fast_path
+                    tool_name, arguments = self._start_tool_call(tool_call)
+                    yield {
+                        "event": "tool_call_start",
+                        "data": {"id": tool_call["id"], "name": tool_name, "arguments": arguments},
+                    }
+                    result = await self._tools.aexecute(tool_name, arguments, self._user_id)
+                    final = self._finish_fast_path(tool_call, intent, result)
+                    yield {
+                        "event": "tool_call_end",
+                        "data": {
+                            "id": tool_call["id"],
+                            "name": tool_name,
+                            "success": result.get("success", False),
+                            "result": result,
+                        },
+                    }
+                    for event in self._drain_traces(pending_traces):
+                        yield event
+
+                for iteration in range(0 if final is not None else self._max_iterations):
+                    self._prepare_model_request()
+                    for event in self._drain_traces(pending_traces):
+                        yield event
+
+                    response: dict[str, Any] = {}
+                    with self._llm_span() as llm_span:
+                        async for chunk in self._client.astream_chat_completion(
+                            messages=self._conversation.messages,
+                            tools=self._tools.get_tool_definitions(),
+                        ):
+                            if chunk["type"] == "token":
+                                yield {"event": "token", "data": {"content": chunk["content"]}}
+                            else:
+                                response = chunk["response"]
+                        llm_span.set_usage(response.get("usage"))
+
+                    tool_calls, final = self._handle_model_response(response)
+                    for event in self._drain_traces(pending_traces):
+                        yield event
+                    if final is not None:
+                        break
+
+                    calls = [self._start_tool_call(tool_call) for tool_call in tool_calls]
+                    for event in self._drain_traces(pending_traces):
+                        yield event
+                    for tool_call, (tool_name, arguments) in zip(tool_calls, calls):
+                        yield {
+                            "event": "tool_call_start",
+                            "data": {"id": tool_call["id"], "name": tool_name, "arguments": arguments},
+                        }
+
+                    results = await self._tools.aexecute_many(calls, self._user_id)
+                    for tool_call, (tool_name, _), result in zip(tool_calls, calls, results):
+                        self._finish_tool_call(tool_call, tool_name, result)
+                        yield {
+                            "event": "tool_call_end",
+                            "data": {
+                                "id": tool_call["id"],
+                                "name": tool_name,
+                                "success": result.get("success", False),
+                                "result": result,
+                            },
+                        }
+
+                    final = self._complete_without_model(user_message, iteration, calls, results)
+                    for event in self._drain_traces(pending_traces):
+                        yield event
+                    if final is not None:
+                        break
+
+                if final is None:
+                    final = self._max_iterations_reached()
+
+            # Emitted after the turn span closes so its latency summary is streamed too
+            for event in self._drain_traces(pending_traces):
+                yield event
+            yield {"event": "done", "data": {"response": final}}
+        finally:
+            self._tracer.remove_listener(listener)
+
+    def _match_fast_path(self, user_message: str) -> tuple[dict[str, Any], InsertIntent] | None:
+        """Build the insert_record call for a plain one-line insert, if recognized."""
+        if not self._fast_path:
+            return None
+
+        intent = parse_insert_intent(user_message)
+        if intent is None:
+            FAST_PATH_TURNS.inc("miss")
+            return None
+
         self._tracer.trace(
             TraceType.THINKING,
-            "Analizando mensaje del usuario",
-            {"entrada": user_message}
+            "Ruta rápida: inserción reconocida sin consultar al modelo",
+            {"tabla": intent.table.value}
         )
+        tool_call = {
+            # Unique across agents: a resumed conversation keeps earlier ids
+            "id": f"fast_path_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {
+                "name": "insert_record",
+                "arguments": json.dumps(intent.arguments, ensure_ascii=False),
+            },
+        }
+        return tool_call, intent
 
-        self._conversation.append({"role": "user", "content": user_message})
-
-        for _ in range(self._max_iterations):
+    def _finish_fast_path(
+        self, tool_call: dict[str, Any], intent: InsertIntent, result: dict[str, Any]
+    ) -> str | None:
+        """Record the fast-path insert and reply, or None to fall back to the model."""
+        if not result.get("success", False):
+            FAST_PATH_TURNS.inc("fallback")
             self._tracer.trace(
                 TraceType.THINKING,
-                "Consultando al modelo LLM para decidir siguiente acción",
-                None
+                "Ruta rápida fallida, se consulta al modelo",
+                {"datos": result}
             )
+            return None
 
-            response = self._client.chat_completion(
-                messages=self._conversation,
-                tools=self._tools.get_tool_definitions(),
-            )
-            extracted = self._client.extract_response(response)
+        FAST_PATH_TURNS.inc("hit")
+        self._conversation.append({"role": "assistant", "tool_calls": [tool_call]})
+        self._finish_tool_call(tool_call, "insert_record", result)
 
-            tool_calls = extracted.get("tool_calls")
-            content = extracted.get("content")
-            reasoning_content = extracted.get("reasoning_content")
+        reply = format_insert_confirmation(intent.table.value, result["record"], intent.language)
+        self._record_reply(reply)
+        return reply
 
-            if reasoning_content:
-                self._tracer.trace(
-                    TraceType.THINKING,
-                    "Razonamiento interno del modelo",
-                    {"pensamiento": reasoning_content}
-                )
+    def _complete_without_model(
+        self,
+        user_message: str,
+        iteration: int,
+        calls: list[tuple[str, dict[str, Any]]],
+        results: list[dict[str, Any]],
+    ) -> str | None:
+        """Reply from the tool results when the completion policy allows skipping the model.
+
+        Only the first batch of the turn qualifies: once the model has read
+        data in this turn, its answer depends on it.
+        """
+        if self._completion_policy != CompletionPolicy.SKIP_AFTER_WRITES or iteration > 0:
+            return None
+
+        reply = write_only_reply(user_message, calls, results)
+        if reply is None:
+            return None
+
+        LLM_CALLS_SKIPPED.inc("write_only")
+        self._tracer.trace(
+            TraceType.THINKING,
+            "Llamada al modelo omitida: el turno solo contenía escrituras correctas",
+            {"política": self._completion_policy.value, "herramientas": [name for name, _ in calls]}
+        )
+        self._record_reply(reply)
+        return reply
+
+    @contextmanager
+    def _turn(self) -> Iterator[None]:
+        """Span of a chat turn, synced with the conversation store around it."""
+        with self._tracer.span("chat.turn", "turn", mode="sync"):
+            self._resume_conversation()
+            try:
+                yield
+            finally:
+                self._save_conversation()
+
+    @asynccontextmanager
+    async def _aturn(self, mode: str) -> AsyncIterator[None]:
+        with self._tracer.span("chat.turn", "turn", mode=mode):
+            if self._store is not None:
+                await asyncio.to_thread(self._resume_conversation)
+            try:
+                yield
+            finally:
+                if self._store is not None:
+                    await asyncio.to_thread(self._save_conversation)
+
+    def _resume_conversation(self) -> None:
+        """Catch up with the stored conversation before a turn.
 
-            if content and tool_calls:
+        A new agent loads only the latest ``conversation_resume_messages``;
+        afterwards each turn fetches what other workers appended since. If
+        the conversation was reset elsewhere, or more was appended than one
+        window holds, the history is replaced by the latest window plus the
+        messages this agent has not managed to save yet.
+        """
+        if self._store is None:
+            return
+        try:
+            epoch, stored = self._store.load(
+                self._user_id, self._session_id, self._stored_epoch, self._stored_id, self._resume_messages
+            )
+        except Exception as e:
+            self._tracer.trace(TraceType.ERROR, "No se pudo cargar el historial guardado", {"error": str(e)})
+            return
+
+        messages = [message for _, message in stored]
+        if epoch != self._stored_epoch or len(stored) >= self._resume_messages:
+            self._conversation.restore(messages)
+            if messages:
                 self._tracer.trace(
                     TraceType.THINKING,
-                    "Decisión del modelo",
-                    {"razonamiento": content}
+                    "Historial recuperado del almacén de conversaciones",
+                    {"mensajes": len(self._conversation) - 1}
                 )
+        else:
+            self._conversation.extend_saved(messages)
+        self._stored_epoch = epoch
+        if stored:
+            self._stored_id = stored[-1][0]
 
-            if not tool_calls:
-                if content:
-                    self._conversation.append({"role": "assistant", "content": content})
-                    self._tracer.trace(
-                        TraceType.RESPONSE,
-                        "Respuesta final del agente",
-                        {"respuesta": content}
-                    )
-                return content or "No estoy seguro de cómo ayudarte con eso."
+    def _save_conversation(self) -> None:
+        """Append the messages of the turn to the conversation store.
+
+        On failure they stay pending and are retried after the next turn.
+        """
+        if self._store is None:
+            return
+        unsaved = self._conversation.unsaved
+        if not unsaved:
+            return
+        try:
+            ids = self._store.append(self._user_id, self._session_id, unsaved)
+        except Exception as e:
+            self._tracer.trace(TraceType.ERROR, "No se pudo guardar el historial", {"error": str(e)})
+            return
+        self._conversation.mark_saved(len(unsaved))
+        self._stored_id = max(self._stored_id, ids[-1])
+
+    def _record_reply(self, reply: str) -> None:
+        self._conversation.append({"role": "assistant", "content": reply})
+        self._tracer.trace(
+            TraceType.RESPONSE,
+            "Respuesta final del agente",
+            {"respuesta": reply}
+        )
 
-            tool_names = [tc["function"]["name"] for tc in tool_calls]
+    def _llm_span(self) -> ContextManager[Span]:
+        return self._tracer.span("llm.chat_completion", "llm", model=self._client.model)
+
+    def _drain_traces(self, pending: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for entry in pending:
+            yield {"event": "trace", "data": entry}
+        pending.clear()
+
+    def _start_turn(self, user_message: str) -> None:
+        self._tracer.trace(
+            TraceType.THINKING,
+            "Analizando mensaje del usuario",
+            {"entrada": user_message}
+        )
+
+        self._conversation.set_system_prompt(self._dated_system_prompt())
+        self._conversation.append({"role": "user", "content": user_message})
+
+    def _prepare_model_request(self) -> None:
+        AGENT_ITERATIONS.inc()
+        compaction = self._conversation.compact()
+        if compaction:
             self._tracer.trace(
                 TraceType.THINKING,
-                "Decisión: usar herramienta(s)",
-                {"herramientas_seleccionadas": tool_names}
+                "Historial compactado para ajustarse al presupuesto de contexto",
+                compaction
             )
 
-            assistant_message: dict[str, Any] = {"role": "assistant", "tool_calls": tool_calls}
-            if content:
-                assistant_message["content"] = content
-            self._conversation.append(assistant_message)
+        self._tracer.trace(
+            TraceType.THINKING,
+            "Consultando al modelo LLM para decidir siguiente acción",
+            {"tokens_contexto": self._conversation.total_tokens}
+        )
 
-            for tool_call in tool_calls:
-                tool_name = tool_call["function"]["name"]
-                arguments = json.loads(tool_call["function"]["arguments"])
+    def _handle_model_response(
+        self, response: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Record the model output in the conversation.
 
-                self._tracer.trace(
-                    TraceType.TOOL_CALL,
-                    f"Ejecutando: {tool_name}",
-                    {"parámetros": arguments}
-                )
+        Returns:
+            The tool calls to run, and the final answer when there are none.
+        """
+        extracted = self._client.extract_response(response)
 
-                result = self._tools.execute(tool_name, arguments)
+        tool_calls = extracted.get("tool_calls")
+        content = extracted.get("content")
+        reasoning_content = extracted.get("reasoning_content")
 
-                success = result.get("success", False)
+        if reasoning_content:
+            self._tracer.trace(
+                TraceType.THINKING,
+                "Razonamiento interno del modelo",
+                {"pensamiento": reasoning_content}
+            )
+
+        if content and tool_calls:
+            self._tracer.trace(
+                TraceType.THINKING,
+                "Decisión del modelo",
+                {"razonamiento": content}
+            )
+
+        if not tool_calls:
+            if content:
+                self._conversation.append({"role": "assistant", "content": content})
                 self._tracer.trace(
-                    TraceType.TOOL_RESULT,
-                    f"Resultado de {tool_name}: {'éxito' if success else 'error'}",
-                    {"datos": result}
+                    TraceType.RESPONSE,
+                    "Respuesta final del agente",
+                    {"respuesta": content}
                 )
+            return [], content or "No estoy seguro de cómo ayudarte con eso."
+
+        tool_names = [tc["function"]["name"] for tc in tool_calls]
+        self._tracer.trace(
+            TraceType.THINKING,
+            "Decisión: usar herramienta(s)",
+            {"herramientas_seleccionadas": tool_names}
+        )
+
+        assistant_message: dict[str, Any] = {"role": "assistant", "tool_calls": tool_calls}
+        if content:
+            assistant_message["content"] = content
+        self._conversation.append(assistant_message)
 
-                self._conversation.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call["id"],
-                    "content": json.dumps(result, ensure_ascii=False),
-                })
+        return tool_calls, None
 
+    def _start_tool_call(self, tool_call: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        tool_name = tool_call["function"]["name"]
+        arguments = json.loads(tool_call["function"]["arguments"])
+
+        self._tracer.trace(
+            TraceType.TOOL_CALL,
+            f"Ejecutando: {tool_name}",
+            {"parámetros": arguments}
+        )
+        return tool_name, arguments
+
+    def _finish_tool_call(
+        self, tool_call: dict[str, Any], tool_name: str, result: dict[str, Any]
+    ) -> None:
+        success = result.get("success", False)
+        self._tracer.trace(
+            TraceType.TOOL_RESULT,
+            f"Resultado de {tool_name}: {'éxito' if success else 'error'}",
+            {"datos": result}
+        )
+
+        self._conversation.append({
+            "role": "tool",
+            "tool_call_id": tool_call["id"],
+            "content": json.dumps(result, ensure_ascii=False),
+        })
+
+    def _max_iterations_reached(self) -> str:
+        MAX_ITERATIONS_REACHED.inc()
         self._tracer.trace(
             TraceType.ERROR,
             "Máximo de iteraciones alcanzado",
@@ -127,13 +525,29 @@ class FinancialAgent:
         )
         return "He alcanzado el máximo de operaciones. Por favor, intenta de nuevo."
 
+    @property
+    def user_id(self) -> str:
+        return self._user_id
+
+    @property
+    def session_id(self) -> str:
+        return self._session_id
+
     def reset_conversation(self) -> None:
-        """Reset the conversation history."""
-        self._conversation = [
-            {"role": "system", "content": self._system_prompt}
-        ]
+        """Reset the conversation history, also in the conversation store."""
+        self._conversation.reset()
         self._tracer.clear()
+        if self._store is not None:
+            self._store.clear(self._user_id, self._session_id)
+
+    def get_traces(self, offset: int = 0, limit: int | None = None) -> list[dict[str, Any]]:
+        """Get stored trace entries, oldest first."""
+        return self._tracer.get_traces(offset, limit)
+
+    def trace_count(self) -> int:
+        """Number of stored trace entries."""
+        return self._tracer.trace_count()
 
-    def get_traces(self) -> list[dict[str, Any]]:
-        """Get all trace entries."""
-        return self._tracer.get_traces()
+    def last_turn_summary(self) -> dict[str, Any] | None:
+        """Latency breakdown of the last chat turn."""
+        return self._tracer.last_turn_summary()
@@ -1,10 +1,10 @@
 """LLM client using LiteLLM for multi-provider support."""
 
 import warnings
-from typing import Any, Literal
+from typing import Any, AsyncIterator, Literal
 
 import litellm
-from litellm import completion
+from litellm import acompletion, completion
 
 from src.config import get_settings
 
@@ -18,16 +18,26 @@ ReasoningEffort = Literal["none", "low", "medium", "high"]
 
 
 class LLMClient:
-    def __init__(self, model: str | None = None, reasoning_effort: ReasoningEffort | None = None):
+    def __init__(
+        self,
+        model: str | None = None,
+        reasoning_effort: ReasoningEffort | None = None,
+        api_base: str | None = None,
+    ):
         settings = get_settings()
         self._model = model or settings.model_name
         self._reasoning_effort = reasoning_effort or settings.reasoning_effort
+        self._api_base = api_base or settings.llm_api_base
 
-    def chat_completion(
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def _build_kwargs(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        temperature: float = 0.7,
+        tools: list[dict[str, Any]] | None,
+        temperature: float,
     ) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "model": self._model,
@@ -35,6 +45,9 @@ class LLMClient:
             "temperature": temperature,
         }
 
+        if self._api_base:
+            kwargs["api_base"] = self._api_base
+
         if tools:
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
@@ -49,9 +62,56 @@ class LLMClient:
                 "budget_tokens": budget,
             }
 
-        response = completion(**kwargs)
+        return kwargs
+
+    def chat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.7,
+    ) -> dict[str, Any]:
+        response = completion(**self._build_kwargs(messages, tools, temperature))
         return response.model_dump()
 
+    async def achat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.7,
+    ) -> dict[str, Any]:
+        """Async variant of chat_completion that does not block the event loop."""
+        response = await acompletion(**self._build_kwargs(messages, tools, temperature))
+        return response.model_dump()
+
+    async def astream_chat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a completion as it is generated.
+
+        Yields ``{"type": "token", "content": str}`` for every text delta and,
+        once the stream ends, a single ``{"type": "response", "response": dict}``
+        with the full response rebuilt from the chunks (same shape as
+        chat_completion, tool calls included).
+        """
+        kwargs = self._build_kwargs(messages, tools, temperature)
+        kwargs["stream"] = True
+
+        chunks = []
+        stream = await acompletion(**kwargs)
+        async for chunk in stream:
+            chunks.append(chunk)
+            if not chunk.choices:
+                continue
+            content = getattr(chunk.choices[0].delta, "content", None)
+            if content:
+                yield {"type": "token", "content": content}
+
+        response = litellm.stream_chunk_builder(chunks, messages=messages)
+        yield {"type": "response", "response": response.model_dump()}
+
     def extract_response(self, response: dict[str, Any]) -> dict[str, Any]:
         choice = response.get("choices", [{}])[0]
         message = choice.get("message", {})
@@ -0,0 +1,69 @@
+"""Completion policy: when a turn can be answered without another model call.
+
+After the model asks only for writes (insert_record, insert_records) and
+they all succeed, the follow-up completion just paraphrases "registrado".
+With the ``skip_after_writes`` policy the agent builds that reply from the
+tool results instead, unless the user message also asks for something
+(a question, totals, a listing), which still needs the model.
+"""
+
+import re
+from enum import Enum
+from typing import Any
+
+from src.agent.fast_path import format_insert_confirmation
+
+WRITE_TOOLS = {"insert_record", "insert_records"}
+
+_READ_REQUEST = re.compile(
+    r"[?¿]|\b(?:cu[áa]nto|cu[áa]ntos|cu[áa]l|qu[ée]|c[óo]mo|total|resumen|muestra|mu[ée]strame|"
+    r"lista|listar|ver|consulta|busca|compara|how|what|which|show|list|total|summary|search|compare)\b",
+    re.IGNORECASE,
+)
+_ENGLISH_HINTS = re.compile(r"\b(?:i|spent|paid|saved|invested|add|record|the|on|for|my)\b", re.IGNORECASE)
+_SPANISH_HINTS = re.compile(
+    r"\b(?:gast[ée]|gastado|pagu[ée]|ahorr[ée]|invert[íi]|a[ñn]ade|registra|en|de|para|el|la|mi)\b",
+    re.IGNORECASE,
+)
+
+
+class CompletionPolicy(str, Enum):
+    ALWAYS_MODEL = "always_model"
+    SKIP_AFTER_WRITES = "skip_after_writes"
+
+
+def asks_for_more(user_message: str) -> bool:
+    """Whether the message requests something besides recording data."""
+    return _READ_REQUEST.search(user_message) is not None
+
+
+def guess_language(user_message: str) -> str:
+    english = len(_ENGLISH_HINTS.findall(user_message))
+    spanish = len(_SPANISH_HINTS.findall(user_message))
+    return "en" if english > spanish else "es"
+
+
+def write_only_reply(
+    user_message: str,
+    calls: list[tuple[str, dict[str, Any]]],
+    results: list[dict[str, Any]],
+) -> str | None:
+    """Templated reply for a turn made only of successful writes, else None."""
+    if not calls or asks_for_more(user_message):
+        return None
+    if any(name not in WRITE_TOOLS for name, _ in calls):
+        return None
+    if not all(result.get("success", False) for result in results):
+        return None
+
+    language = guess_language(user_message)
+    confirmations: list[str] = []
+    for (name, arguments), result in zip(calls, results):
+        if name == "insert_records":
+            confirmations.extend(
+                format_insert_confirmation(requested["table"], record, language)
+                for requested, record in zip(arguments["records"], result["records"])
+            )
+        else:
+            confirmations.append(format_insert_confirmation(arguments["table"], result["record"], language))
+    return " ".join(confirmations)
@@ -0,0 +1,69 @@
+"""Conversation stores: where session histories live between turns, restarts and workers."""
+
+import copy
+import itertools
+import threading
+from typing import Any, Protocol
+
+StoredMessage = tuple[int, dict[str, Any]]
+
+
+class ConversationStore(Protocol):
+    """Append-only log of the messages of each (user, session) conversation.
+
+    Message ids grow with every append. ``clear`` starts a new epoch, so an
+    agent holding a copy from before the reset (e.g. in another worker)
+    knows to drop it.
+    """
+
+    def load(
+        self, user_id: str, session_id: str, epoch: int, after: int, limit: int
+    ) -> tuple[int, list[StoredMessage]]:
+        """Return the current epoch and at most ``limit`` of the newest messages.
+
+        While the conversation is still at ``epoch`` only messages with id
+        above ``after`` are returned, oldest first.
+        """
+        ...
+
+    def append(self, user_id: str, session_id: str, messages: list[dict[str, Any]]) -> list[int]:
+        """Store messages after the existing ones and return their ids."""
+        ...
+
+    def clear(self, user_id: str, session_id: str) -> None:
+        """Delete the conversation's messages and start a new epoch."""
+        ...
+
+
+class InMemoryConversationStore:
+    """ConversationStore kept in this process, for tests and single-worker setups."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # (user_id, session_id) -> (epoch, messages)
+        self._conversations: dict[tuple[str, str], tuple[int, list[StoredMessage]]] = {}
+
+    def load(
+        self, user_id: str, session_id: str, epoch: int, after: int, limit: int
+    ) -> tuple[int, list[StoredMessage]]:
+        with self._lock:
+            current, messages = self._conversations.get((user_id, session_id), (0, []))
+            if current != epoch:
+                after = 0
+            newer = [(id_, message) for id_, message in messages if id_ > after][-limit:] if limit > 0 else []
+            return current, copy.deepcopy(newer)
+
+    def append(self, user_id: str, session_id: str, messages: list[dict[str, Any]]) -> list[int]:
+        with self._lock:
+            _, stored = self._conversations.setdefault((user_id, session_id), (0, []))
+            appended = [(next(self._ids), copy.deepcopy(message)) for message in messages]
+            stored.extend(appended)
+            return [id_ for id_, _ in appended]
+
+    def clear(self, user_id: str, session_id: str) -> None:
+        with self._lock:
+            key = (user_id, session_id)
+            if key in self._conversations:
+                epoch, _ = self._conversations[key]
+                self._conversations[key] = (epoch + 1, [])
@@ -0,0 +1,100 @@
+"""Deterministic parser for one-line insert requests.
+
+Messages such as "gasté 12 euros en comida" or "saved 100 for vacation"
+map to a single insert_record call, so the agent can run the tool and
+answer from a template without asking the model twice. The patterns are
+anchored to the whole message and the label is a single word: anything
+they do not fully explain (questions, several amounts, dates, "y"/"and",
+trailing detail such as "con amigos") returns None and goes through the
+normal agent loop, so a phrase never ends up stored as a category.
+"""
+
+import re
+from typing import Any, NamedTuple
+
+from src.schemas import TableName
+
+LABEL_FIELDS = {
+    TableName.EXPENSES: "category",
+    TableName.SAVINGS: "goal",
+    TableName.INVESTMENTS: "asset_type",
+}
+
+_AMOUNT = r"(?:[$€]\s*)?(?P<amount>\d+(?:[.,]\d{1,2})?)(?:\s*(?:€|\$|euros?|eur|d[óo]lares|dollars?|usd))?"
+_ARTICLE = r"(?:(?:el|la|los|las|un|una|mi|mis|the|my|a)\s+)?"
+_LABEL = r"(?P<label>[a-záéíóúüñ]+(?:-[a-záéíóúüñ]+)*)"
+
+# (table, language, verb, prepositions)
+_PATTERNS = [
+    (TableName.EXPENSES, "es", r"(?:he\s+)?(?:gast[ée]|gastado|pagu[ée]|pagado)", r"en|de|para"),
+    (TableName.SAVINGS, "es", r"(?:he\s+)?(?:ahorr[ée]|ahorrado|guard[ée]|guardado)", r"para|en"),
+    (TableName.INVESTMENTS, "es", r"(?:he\s+)?(?:invert[íi]|invertido)", r"en"),
+    (TableName.EXPENSES, "en", r"(?:i\s+)?(?:spent|paid)", r"on|for"),
+    (TableName.SAVINGS, "en", r"(?:i\s+)?saved", r"for|towards?"),
+    (TableName.INVESTMENTS, "en", r"(?:i\s+)?invested", r"in|into"),
+]
+
+_COMPILED = [
+    (table, language, re.compile(rf"{verb}\s+{_AMOUNT}\s+(?:{prepositions})\s+{_ARTICLE}{_LABEL}"))
+    for table, language, verb, prepositions in _PATTERNS
+]
+
+# Words that mean the message says more than a plain insert (another
+# record, a date, a negation), so the model has to handle it.
+_AMBIGUOUS_WORDS = {
+    "y", "e", "o", "pero", "no", "ayer", "anteayer", "anoche", "hoy", "mañana", "hace", "semana", "mes",
+    "año", "pasado", "cada", "lunes", "martes", "miércoles", "miercoles", "jueves", "viernes", "sábado",
+    "sabado", "domingo",
+    "and", "or", "but", "not", "yesterday", "today", "tomorrow", "ago", "week", "month", "year", "last",
+    "every", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+}
+
+
+class InsertIntent(NamedTuple):
+    table: TableName
+    amount: float
+    label: str
+    language: str
+
+    @property
+    def arguments(self) -> dict[str, Any]:
+        return {"table": self.table.value, "amount": self.amount, LABEL_FIELDS[self.table]: self.label}
+
+
+def parse_insert_intent(message: str) -> InsertIntent | None:
+    """Recognize a single-record insert, or return None when unsure."""
+    text = " ".join(message.lower().split()).rstrip(".!")
+    if not text or len(text) > 120:
+        return None
+
+    for table, language, pattern in _COMPILED:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+        label = match.group("label")
+        if _AMBIGUOUS_WORDS.intersection(label.replace("-", " ").split()):
+            return None
+        amount = float(match.group("amount").replace(",", "."))
+        if amount <= 0:
+            return None
+        return InsertIntent(table, amount, label, language)
+
+    return None
+
+
+def format_insert_confirmation(table: str, record: dict[str, Any], language: str = "es") -> str:
+    """Templated confirmation for a record returned by insert_record."""
+    table_enum = TableName(table)
+    amount = f"{float(record.get('amount', 0)):.2f}"
+    label = record.get(LABEL_FIELDS[table_enum])
+
+    if language == "en":
+        noun = {"expenses": "an expense", "savings": "a saving", "investments": "an investment"}[table]
+        preposition = {"expenses": "for", "savings": "for", "investments": "in"}[table]
+        suffix = f" {preposition} {label}" if label else ""
+        return f"Recorded {noun} of {amount}{suffix}."
+
+    noun = {"expenses": "un gasto", "savings": "un ahorro", "investments": "una inversión"}[table]
+    preposition = {"expenses": "en", "savings": "para", "investments": "en"}[table]
+    suffix = f" {preposition} {label}" if label else ""
+    return f"He registrado {noun} de {amount}{suffix}."
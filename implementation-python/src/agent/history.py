@@ -0,0 +1,200 @@
+"""Token-budgeted conversation history."""
+
+import json
+from typing import Any, Iterable, Iterator
+
+import litellm
+
+
+class ConversationHistory:
+    """Conversation messages with cached token counts and budgeted compaction.
+
+    The system prompt and the last ``keep_recent_turns`` user turns are never
+    touched. When the history exceeds ``max_tokens``, older tool results are
+    first replaced by a short summary and, if that is not enough, the oldest
+    turns are dropped whole so tool calls and their results stay paired.
+
+    Appended messages are also kept, as appended, until a conversation store
+    has saved them (``unsaved`` / ``mark_saved``); compaction only shrinks
+    the copy sent to the model.
+    """
+
+    # Tool results at or below this size are not worth summarizing.
+    SUMMARY_MIN_TOKENS = 64
+
+    def __init__(
+        self,
+        system_prompt: str,
+        model: str,
+        max_tokens: int = 16000,
+        keep_recent_turns: int = 3,
+    ):
+        self._model = model
+        self._max_tokens = max_tokens
+        self._keep_recent_turns = keep_recent_turns
+        self._messages: list[dict[str, Any]] = []
+        self._tokens: list[int] = []
+        self._summarized: list[bool] = []
+        self._unsaved: list[dict[str, Any]] = []
+        self._add({"role": "system", "content": system_prompt})
+
+    @property
+    def messages(self) -> list[dict[str, Any]]:
+        """Messages to send to the model."""
+        return self._messages
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self._tokens)
+
+    @property
+    def unsaved(self) -> list[dict[str, Any]]:
+        """Messages appended since the last ``mark_saved``, oldest first."""
+        return list(self._unsaved)
+
+    def append(self, message: dict[str, Any]) -> None:
+        self._add(message)
+        self._unsaved.append(message)
+
+    def extend_saved(self, messages: Iterable[dict[str, Any]]) -> None:
+        """Append messages that are already in the conversation store."""
+        for message in messages:
+            self._add(message)
+
+    def mark_saved(self, count: int) -> None:
+        """Forget the first ``count`` unsaved messages once they are stored."""
+        del self._unsaved[:count]
+
+    def restore(self, messages: list[dict[str, Any]]) -> None:
+        """Replace the saved part of the history with stored messages.
+
+        Messages before the first user message are skipped: a window cut in
+        the middle of a turn could start with tool results whose call is not
+        in it. Unsaved messages (e.g. from a turn whose save failed) are kept
+        after the stored ones and remain unsaved.
+        """
+        unsaved = self.unsaved
+        self.reset()
+        start = next((i for i, message in enumerate(messages) if message["role"] == "user"), len(messages))
+        self.extend_saved(messages[start:])
+        for message in unsaved:
+            self.append(message)
+
+    def set_system_prompt(self, system_prompt: str) -> None:
+        """Replace the system prompt, keeping the rest of the history."""
+        if self._messages[0]["content"] == system_prompt:
+            return
+        self._messages[0] = {"role": "system", "content": system_prompt}
+        self._tokens[0] = self._count_tokens(self._messages[0])
+
+    def reset(self) -> None:
+        """Drop everything but the system prompt."""
+        del self._messages[1:], self._tokens[1:], self._summarized[1:]
+        self._unsaved.clear()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self._messages)
+
+    def compact(self) -> dict[str, int] | None:
+        """Shrink the history to the token budget.
+
+        Returns:
+            Compaction statistics, or None if the history was within budget.
+        """
+        tokens_before = self.total_tokens
+        if tokens_before <= self._max_tokens:
+            return None
+
+        protected_from = self._protected_start()
+
+        summarized = 0
+        for index in range(1, protected_from):
+            if self.total_tokens <= self._max_tokens:
+                break
+            message = self._messages[index]
+            if (
+                message["role"] == "tool"
+                and not self._summarized[index]
+                and self._tokens[index] > self.SUMMARY_MIN_TOKENS
+            ):
+                summary = {**message, "content": self._summarize_tool_content(message["content"])}
+                self._messages[index] = summary
+                self._tokens[index] = self._count_tokens(summary)
+                self._summarized[index] = True
+                summarized += 1
+
+        dropped = 0
+        while self.total_tokens > self._max_tokens:
+            turn_end = self._first_turn_end(protected_from)
+            if turn_end is None:
+                break
+            del self._messages[1:turn_end], self._tokens[1:turn_end], self._summarized[1:turn_end]
+            dropped += turn_end - 1
+            protected_from -= turn_end - 1
+
+        tokens_after = self.total_tokens
+        return {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": tokens_before - tokens_after,
+            "tool_results_summarized": summarized,
+            "messages_dropped": dropped,
+        }
+
+    def _add(self, message: dict[str, Any]) -> None:
+        self._messages.append(message)
+        self._tokens.append(self._count_tokens(message))
+        self._summarized.append(False)
+
+    def _user_indexes(self) -> list[int]:
+        return [i for i, message in enumerate(self._messages) if message["role"] == "user"]
+
+    def _protected_start(self) -> int:
+        """Index of the first message belonging to the recent turns."""
+        user_indexes = self._user_indexes()
+        keep = max(1, self._keep_recent_turns)
+        if len(user_indexes) <= keep:
+            return user_indexes[0] if user_indexes else len(self._messages)
+        return user_indexes[-keep]
+
+    def _first_turn_end(self, protected_from: int) -> int | None:
+        """End (exclusive) of the oldest droppable turn, if any.
+
+        A turn starts at a user message and ends right before the next one.
+        """
+        for index in range(2, protected_from + 1):
+            if self._messages[index]["role"] == "user":
+                return index
+        return None
+
+    def _count_tokens(self, message: dict[str, Any]) -> int:
+        try:
+            return litellm.token_counter(model=self._model, messages=[message])
+        except Exception:
+            # Rough estimate for models litellm cannot tokenize.
+            return len(json.dumps(message, ensure_ascii=False)) // 4
+
+    @staticmethod
+    def _summarize_tool_content(content: str) -> str:
+        """Keep the outcome of a tool result and drop its bulky payload."""
+        try:
+            result = json.loads(content)
+        except (TypeError, ValueError):
+            return json.dumps({"resumen": content[:200]}, ensure_ascii=False)
+
+        if not isinstance(result, dict):
+            return json.dumps({"resumen": str(result)[:200]}, ensure_ascii=False)
+
+        summary: dict[str, Any] = {}
+        for key, value in result.items():
+            if isinstance(value, list):
+                summary[key] = f"{len(value)} elementos omitidos"
+            elif isinstance(value, dict):
+                summary[key] = {k: v for k, v in value.items() if k == "id"} or "omitido"
+            else:
+                summary[key] = value
+        summary["compactado"] = True
+        return json.dumps(summary, ensure_ascii=False)
@@ -0,0 +1,88 @@
+"""Web search backends and the process-wide search backend and result cache."""
+
+import threading
+from functools import lru_cache
+from typing import Any, Protocol
+
+from duckduckgo_search import DDGS
+
+from src.cache import TTLCache
+from src.config import get_settings
+
+
+class SearchBackend(Protocol):
+    """Anything able to run a text search (DuckDuckGo, a local fake in tests...)."""
+
+    def search(self, query: str, max_results: int) -> list[dict[str, Any]]:
+        """Return results as dicts with ``title``, ``url`` and ``snippet``."""
+        ...
+
+
+class DuckDuckGoBackend:
+    """Search backend on top of duckduckgo_search.
+
+    DDGS keeps an HTTP session, so searches borrow a client from a small
+    pool instead of opening a new session each time. Tool threads only
+    live for one batch of calls, so clients are not tied to threads; at
+    most ``max_clients`` idle ones are kept, and ``close`` drops them.
+    """
+
+    def __init__(self, max_clients: int | None = None) -> None:
+        self._max_clients = max_clients or get_settings().tool_max_concurrency
+        self._idle: list[DDGS] = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> DDGS:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return DDGS()
+
+    def _release(self, client: DDGS) -> None:
+        with self._lock:
+            # Searches beyond max_clients used a throwaway client
+            if not self._closed and len(self._idle) < self._max_clients:
+                self._idle.append(client)
+
+    def close(self) -> None:
+        """Drop the idle clients; searches still running discard theirs when done."""
+        with self._lock:
+            self._closed = True
+            self._idle.clear()
+
+    def search(self, query: str, max_results: int) -> list[dict[str, Any]]:
+        client = self._acquire()
+        try:
+            results = client.text(query, max_results=max_results)
+        finally:
+            self._release(client)
+        return [
+            {
+                "title": r.get("title", ""),
+                "url": r.get("href", ""),
+                "snippet": r.get("body", ""),
+            }
+            for r in results
+        ]
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used as cache key."""
+    return " ".join(query.lower().split())
+
+
+@lru_cache
+def get_search_cache() -> TTLCache[dict[str, Any]]:
+    """Cache of web_search results shared by every ToolRegistry in the process."""
+    settings = get_settings()
+    return TTLCache(
+        max_size=settings.web_search_cache_max_entries,
+        ttl_seconds=settings.web_search_cache_ttl_seconds,
+    )
+
+
+@lru_cache
+def get_search_backend() -> DuckDuckGoBackend:
+    """DuckDuckGo backend shared by every ToolRegistry in the process."""
+    return DuckDuckGoBackend()
@@ -0,0 +1,148 @@
+"""Session-keyed store of agents so each conversation keeps its own state."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Callable
+
+from src.agent.agent import FinancialAgent
+from src.agent.conversations import ConversationStore
+from src.database import DEFAULT_USER_ID
+
+# (user_id, session_id): the same session id of two users names two conversations
+SessionKey = tuple[str, str]
+
+
+class _Session:
+    __slots__ = ("agent", "lock", "last_used")
+
+    def __init__(self, agent: FinancialAgent):
+        self.agent = agent
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """Holds one FinancialAgent per session with LRU eviction and idle TTL.
+
+    The store lock only guards the session map and is never held across an
+    ``await``; each session has its own asyncio lock so concurrent requests
+    for different sessions never wait on each other, while requests for the
+    same session are serialized without tying up a thread.
+
+    Sessions belong to a user: ``agent_factory`` builds the agent of a new
+    session from its user and session ids, and lookups only find the user's
+    own sessions. With a ``conversations`` store evicting a session only
+    frees memory: its next request resumes the stored conversation.
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[str, str], FinancialAgent],
+        max_sessions: int = 1000,
+        ttl_seconds: float = 3600.0,
+        conversations: ConversationStore | None = None,
+    ):
+        self._agent_factory = agent_factory
+        self._conversations = conversations
+        self._max_sessions = max_sessions
+        self._ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[SessionKey, _Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop idle sessions. Must be called with the store lock held."""
+        # Least recently used sessions sit at the front of the OrderedDict. Iterate
+        # a snapshot: refreshed sessions move to the back and are not seen twice.
+        for key, session in list(self._sessions.items()):
+            if now - session.last_used < self._ttl_seconds:
+                break
+            if session.lock.locked():
+                # In use right now: refresh instead of evicting under its feet.
+                session.last_used = now
+                self._sessions.move_to_end(key)
+                continue
+            del self._sessions[key]
+
+    def _evict_overflow(self, keep: SessionKey) -> None:
+        """Drop the least recently used idle sessions beyond ``max_sessions``.
+
+        Must be called with the store lock held. Sessions in use are kept, so
+        the store may briefly hold more than ``max_sessions``.
+        """
+        overflow = len(self._sessions) - self._max_sessions
+        if overflow <= 0:
+            return
+        # Least recently used first; ``keep`` is the session being handed out
+        idle = [key for key, session in self._sessions.items() if key != keep and not session.lock.locked()]
+        for key in idle[:overflow]:
+            del self._sessions[key]
+
+    def _get_or_create(self, key: SessionKey) -> _Session:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+
+            session = self._sessions.get(key)
+            if session is None:
+                session = _Session(self._agent_factory(*key))
+                self._sessions[key] = session
+                self._evict_overflow(key)
+            else:
+                self._sessions.move_to_end(key)
+
+            session.last_used = now
+            return session
+
+    @asynccontextmanager
+    async def session(
+        self, session_id: str, user_id: str = DEFAULT_USER_ID
+    ) -> AsyncGenerator[FinancialAgent, None]:
+        """Get exclusive access to the agent of a session, creating it if needed.
+
+        Args:
+            session_id: Conversation identifier supplied by the client.
+            user_id: Owner of the session, whose records its tools work on.
+
+        Yields:
+            The session's agent, locked for the duration of the block.
+        """
+        session = self._get_or_create((user_id, session_id))
+        async with session.lock:
+            try:
+                yield session.agent
+            finally:
+                session.last_used = time.monotonic()
+
+    def peek(self, session_id: str, user_id: str = DEFAULT_USER_ID) -> FinancialAgent | None:
+        """Get the agent of an existing session without creating one."""
+        with self._lock:
+            session = self._sessions.get((user_id, session_id))
+            return session.agent if session else None
+
+    def discard(self, session_id: str, user_id: str = DEFAULT_USER_ID) -> bool:
+        """Remove a session and its stored conversation.
+
+        Returns:
+            Whether the session was held in memory.
+        """
+        with self._lock:
+            existed = self._sessions.pop((user_id, session_id), None) is not None
+        if self._conversations is not None:
+            self._conversations.clear(user_id, session_id)
+        return existed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def stats(self) -> dict[str, int | float]:
+        """Return session store occupancy."""
+        with self._lock:
+            return {
+                "active_sessions": len(self._sessions),
+                "max_sessions": self._max_sessions,
+                "ttl_seconds": self._ttl_seconds,
+            }
@@ -1,23 +1,62 @@
 """Tool definitions and registry for the agent."""
 
-from typing import Any, Callable
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from datetime import date
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable
 
-from duckduckgo_search import DDGS
-
-from src.database import FinancialRepository
+from src.agent.completion import WRITE_TOOLS
+from src.agent.search import SearchBackend, get_search_backend, get_search_cache, normalize_query
+from src.cache import TTLCache
+from src.config import get_settings
+from src.database import AsyncFinancialRepository, FinancialRepository
+from src.observability import span
 from src.schemas import TableName
 
+ToolCall = tuple[str, dict[str, Any]]
+
 
 class ToolRegistry:
     """Registro de tools"""
 
-    def __init__(self, repository: FinancialRepository):
+    # Tools that read or write the session user's records. They get the
+    # user from the caller, never from the model's arguments.
+    USER_TOOLS = frozenset({"insert_record", "insert_records", "query_records", "aggregate_records"})
+
+    def __init__(
+        self,
+        repository: FinancialRepository | AsyncFinancialRepository,
+        max_concurrency: int | None = None,
+        timeout_seconds: float | None = None,
+        search_backend: SearchBackend | None = None,
+        search_cache: TTLCache[dict[str, Any]] | None = None,
+    ):
+        settings = get_settings()
         self._repository = repository
+        self._search_backend = search_backend or get_search_backend()
+        self._search_cache = search_cache if search_cache is not None else get_search_cache()
+        self._max_concurrency = max_concurrency or settings.tool_max_concurrency
+        self._timeout_seconds = timeout_seconds or settings.tool_timeout_seconds
         self._tools: dict[str, Callable[..., Any]] = {
             "insert_record": self._insert_record,
+            "insert_records": self._insert_records,
             "query_records": self._query_records,
+            "aggregate_records": self._aggregate_records,
             "web_search": self._web_search,
         }
+        # With the async backend the database tools are awaited on the event loop
+        self._async_tools: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {}
+        if isinstance(repository, AsyncFinancialRepository):
+            self._async_tools = {
+                "insert_record": self._ainsert_record,
+                "insert_records": self._ainsert_records,
+                "query_records": self._aquery_records,
+                "aggregate_records": self._aaggregate_records,
+            }
 
     def get_tool_definitions(self) -> list[dict[str, Any]]:
         return [
@@ -62,6 +101,58 @@ class ToolRegistry:
                     },
                 },
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "insert_records",
+                    "description": (
+                        "Insertar varios registros financieros a la vez en una sola operación. "
+                        "Usar cuando el usuario da varios gastos, ahorros o inversiones en el mismo mensaje. "
+                        "Se guardan todos o ninguno."
+                    ),
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "records": {
+                                "type": "array",
+                                "description": "Los registros a insertar.",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "table": {
+                                            "type": "string",
+                                            "enum": ["expenses", "savings", "investments"],
+                                            "description": "La tabla donde insertar el registro.",
+                                        },
+                                        "amount": {
+                                            "type": "number",
+                                            "description": "La cantidad monetaria (debe ser positiva).",
+                                        },
+                                        "category": {
+                                            "type": "string",
+                                            "description": "Para gastos: la categoría.",
+                                        },
+                                        "goal": {
+                                            "type": "string",
+                                            "description": "Para ahorros: el objetivo.",
+                                        },
+                                        "asset_type": {
+                                            "type": "string",
+                                            "description": "Para inversiones: tipo de activo.",
+                                        },
+                                        "description": {
+                                            "type": "string",
+                                            "description": "Descripción opcional del registro.",
+                                        },
+                                    },
+                                    "required": ["table", "amount"],
+                                },
+                            },
+                        },
+                        "required": ["records"],
+                    },
+                },
+            },
             {
                 "type": "function",
                 "function": {
@@ -90,10 +181,91 @@ class ToolRegistry:
                                 "type": "string",
                                 "description": "Filtrar inversiones por tipo de activo.",
                             },
+                            "date_from": {
+                                "type": "string",
+                                "description": "Fecha inicial incluida (YYYY-MM-DD).",
+                            },
+                            "date_to": {
+                                "type": "string",
+                                "description": "Fecha final incluida (YYYY-MM-DD).",
+                            },
+                            "amount_min": {
+                                "type": "number",
+                                "description": "Cantidad mínima incluida.",
+                            },
+                            "amount_max": {
+                                "type": "number",
+                                "description": "Cantidad máxima incluida.",
+                            },
                             "limit": {
                                 "type": "integer",
                                 "description": "Número máximo de registros a devolver (default 100).",
                             },
+                            "cursor": {
+                                "type": "string",
+                                "description": "Valor next_cursor de una consulta anterior para obtener la página siguiente.",
+                            },
+                        },
+                        "required": ["table"],
+                    },
+                },
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "aggregate_records",
+                    "description": (
+                        "Calcular totales y estadísticas (suma, número, media, mínimo, máximo) "
+                        "directamente en la base de datos, opcionalmente agrupados por categoría/"
+                        "objetivo/tipo de activo y por día, semana o mes. Usar en lugar de "
+                        "query_records para preguntas como '¿cuánto gasté en comida este mes?'."
+                    ),
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "table": {
+                                "type": "string",
+                                "enum": ["expenses", "savings", "investments"],
+                                "description": "La tabla a resumir.",
+                            },
+                            "metrics": {
+                                "type": "array",
+                                "items": {"type": "string", "enum": ["sum", "count", "avg", "min", "max"]},
+                                "description": "Métricas a calcular sobre amount (default: sum y count).",
+                            },
+                            "group_by": {
+                                "type": "string",
+                                "enum": ["category", "goal", "asset_type"],
+                                "description": (
+                                    "Agrupar por category (expenses), goal (savings) "
+                                    "o asset_type (investments)."
+                                ),
+                            },
+                            "period": {
+                                "type": "string",
+                                "enum": ["day", "week", "month"],
+                                "description": "Agrupar por día, semana o mes.",
+                            },
+                            "date_from": {
+                                "type": "string",
+                                "description": "Fecha inicial incluida (YYYY-MM-DD).",
+                            },
+                            "date_to": {
+                                "type": "string",
+                                "description": "Fecha final incluida (YYYY-MM-DD).",
+                            },
+                            "category": {
+                                "type": "string",
+                                "description": "Filtrar gastos por categoría.",
+                            },
+                            "goal": {
+                                "type": "string",
+                                "description": "Filtrar ahorros por objetivo.",
+                            },
+                            "asset_type": {
+                                "type": "string",
+                                "description": "Filtrar inversiones por tipo de activo.",
+                            },
                         },
                         "required": ["table"],
                     },
@@ -126,15 +298,138 @@ class ToolRegistry:
             },
         ]
 
-    def execute(self, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    def execute(self, tool_name: str, arguments: dict[str, Any], user_id: str) -> dict[str, Any]:
+        return self._execute(tool_name, arguments, user_id, None)
+
+    async def aexecute(self, tool_name: str, arguments: dict[str, Any], user_id: str) -> dict[str, Any]:
+        """Run a tool from async code without blocking the event loop.
+
+        Database tools on the async backend are awaited directly; the rest
+        wrap blocking I/O (psycopg2, DuckDuckGo) and are offloaded to the
+        default thread pool.
+        """
+        return await self._aexecute(tool_name, arguments, user_id, None)
+
+    def _execute(
+        self, tool_name: str, arguments: dict[str, Any], user_id: str, timed_out: threading.Event | None
+    ) -> dict[str, Any]:
         tool = self._tools.get(tool_name)
         if not tool:
             raise ValueError(f"Unknown tool: {tool_name}")
+        if tool_name in self._async_tools:
+            raise RuntimeError(f"{tool_name} uses the async database backend; call aexecute")
+
+        with span(f"tool.{tool_name}", "tool", tool=tool_name) as tool_span:
+            try:
+                result = tool(**self._bind_user(tool_name, arguments, user_id))
+                tool_span.set("success", result.get("success", False))
+                return result
+            finally:
+                # Set by the caller once it gave up on the tool; record_span counts it as an error
+                if timed_out is not None and timed_out.is_set():
+                    tool_span.set("timed_out", True)
+
+    async def _aexecute(
+        self, tool_name: str, arguments: dict[str, Any], user_id: str, timed_out: threading.Event | None
+    ) -> dict[str, Any]:
+        if tool_name not in self._tools:
+            raise ValueError(f"Unknown tool: {tool_name}")
+
+        async_tool = self._async_tools.get(tool_name)
+        if async_tool is None:
+            return await asyncio.to_thread(self._execute, tool_name, arguments, user_id, timed_out)
+
+        # Cancelled at the deadline, which already closes the span as an error
+        with span(f"tool.{tool_name}", "tool", tool=tool_name) as tool_span:
+            result = await async_tool(**self._bind_user(tool_name, arguments, user_id))
+            tool_span.set("success", result.get("success", False))
+            return result
+
+    def execute_many(self, calls: list[ToolCall], user_id: str) -> list[dict[str, Any]]:
+        """Run independent tool calls in parallel, preserving their order.
 
-        return tool(**arguments)
+        At most ``max_concurrency`` tools of the call run at once. Each tool
+        gets ``timeout_seconds`` from the moment it starts; past that it
+        yields a timeout result and its slot goes to the next queued tool.
+        The worker threads belong to this call only, so a stuck tool left to
+        finish in the background never takes a slot from later turns.
+        """
+        results: list[dict[str, Any]] = [{} for _ in calls]
+        queued = deque(range(len(calls)))
+        timed_out = [threading.Event() for _ in calls]
+        running: dict[Future[dict[str, Any]], tuple[int, float]] = {}
+        # One thread per call: a tool past its deadline keeps its thread, not its slot
+        executor = ThreadPoolExecutor(max_workers=len(calls) or 1, thread_name_prefix="tool")
+        try:
+            while queued or running:
+                while queued and len(running) < self._max_concurrency:
+                    index = queued.popleft()
+                    tool_name, arguments = calls[index]
+                    # Each worker runs in a copy of the caller's context so tool spans nest under the turn
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._execute, tool_name, arguments, user_id, timed_out[index],
+                    )
+                    running[future] = (index, time.monotonic() + self._timeout_seconds)
+
+                next_deadline = min(deadline for _, deadline in running.values())
+                wait(running, timeout=max(next_deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+
+                now = time.monotonic()
+                for future, (index, deadline) in list(running.items()):
+                    if future.done():
+                        results[index] = future.result()
+                    elif deadline <= now:
+                        timed_out[index].set()
+                        results[index] = self._timeout_result(calls[index][0])
+                    else:
+                        continue
+                    del running[future]
+        finally:
+            # Tools past their deadline cannot be interrupted and finish on their own
+            executor.shutdown(wait=False)
+        return results
+
+    async def aexecute_many(self, calls: list[ToolCall], user_id: str) -> list[dict[str, Any]]:
+        """Async variant of execute_many built on asyncio.gather."""
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def run(tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+            timed_out = threading.Event()
+            async with semaphore:
+                # The deadline starts once the tool holds a slot, not while it waits for one
+                try:
+                    return await asyncio.wait_for(
+                        self._aexecute(tool_name, arguments, user_id, timed_out), self._timeout_seconds
+                    )
+                except asyncio.TimeoutError:
+                    timed_out.set()
+                    return self._timeout_result(tool_name)
+
+        return list(await asyncio.gather(*(run(name, args) for name, args in calls)))
+
+    def _bind_user(self, tool_name: str, arguments: dict[str, Any], user_id: str) -> dict[str, Any]:
+        if tool_name not in self.USER_TOOLS:
+            return arguments
+        # Overrides a user_id the model may have made up
+        return {**arguments, "user_id": user_id}
+
+    def _timeout_result(self, tool_name: str) -> dict[str, Any]:
+        message = f"Tiempo de espera agotado ({self._timeout_seconds}s) ejecutando {tool_name}"
+        if tool_name in WRITE_TOOLS:
+            # The insert may still commit after the deadline, so it did not necessarily fail
+            return {
+                "success": None,
+                "status": "unknown",
+                "error": (
+                    f"{message}: no se sabe si se guardó; compruébalo con query_records antes de reintentar"
+                ),
+            }
+        return {"success": False, "error": message}
 
     def _insert_record(
         self,
+        user_id: str,
         table: str,
         amount: float,
         category: str | None = None,
@@ -143,87 +438,254 @@ class ToolRegistry:
         description: str | None = None,
     ) -> dict[str, Any]:
         try:
-            table_enum = TableName(table)
-            data = {
-                "amount": amount,
-                "category": category,
-                "goal": goal,
-                "asset_type": asset_type,
-                "description": description,
-            }
-            data = {k: v for k, v in data.items() if v is not None}
-
-            record = self._repository.insert(table_enum, data)
+            table_enum, data = self._record_data(table, amount, category, goal, asset_type, description)
+            return self._inserted_result(table_enum, self._repository.insert(user_id, table_enum, data))
+        except Exception as e:
             return {
-                "success": True,
-                "message": f"Registro insertado correctamente en {table}",
-                "record": record,
+                "success": False,
+                "error": str(e),
             }
+
+    async def _ainsert_record(self, user_id: str, **arguments: Any) -> dict[str, Any]:
+        try:
+            table_enum, data = self._record_data(**arguments)
+            return self._inserted_result(table_enum, await self._repository.insert(user_id, table_enum, data))
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
             }
 
+    def _record_data(
+        self,
+        table: str,
+        amount: float,
+        category: str | None = None,
+        goal: str | None = None,
+        asset_type: str | None = None,
+        description: str | None = None,
+    ) -> tuple[TableName, dict[str, Any]]:
+        data = {
+            "amount": amount,
+            "category": category,
+            "goal": goal,
+            "asset_type": asset_type,
+            "description": description,
+        }
+        return TableName(table), {k: v for k, v in data.items() if v is not None}
+
+    def _inserted_result(self, table: TableName, record: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "success": True,
+            "message": f"Registro insertado correctamente en {table.value}",
+            "record": record,
+        }
+
+    def _insert_records(self, user_id: str, records: list[dict[str, Any]]) -> dict[str, Any]:
+        try:
+            return self._inserted_many_result(
+                self._repository.insert_many(user_id, self._record_entries(records))
+            )
+        except Exception as e:
+            return self._insert_records_error(e)
+
+    async def _ainsert_records(self, user_id: str, records: list[dict[str, Any]]) -> dict[str, Any]:
+        try:
+            return self._inserted_many_result(
+                await self._repository.insert_many(user_id, self._record_entries(records))
+            )
+        except Exception as e:
+            return self._insert_records_error(e)
+
+    def _record_entries(self, records: list[dict[str, Any]]) -> list[tuple[TableName, dict[str, Any]]]:
+        if not records:
+            raise ValueError("No records provided")
+        return [
+            (TableName(record.get("table", "")), {k: v for k, v in record.items() if k != "table"})
+            for record in records
+        ]
+
+    def _inserted_many_result(self, inserted: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "success": True,
+            "message": f"{len(inserted)} registros insertados correctamente",
+            "count": len(inserted),
+            "records": inserted,
+        }
+
+    def _insert_records_error(self, error: Exception) -> dict[str, Any]:
+        return {
+            "success": False,
+            "error": f"No se ha insertado ningún registro: {error}",
+        }
+
     def _query_records(
         self,
+        user_id: str,
         table: str,
         category: str | None = None,
         goal: str | None = None,
         asset_type: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        amount_min: float | None = None,
+        amount_max: float | None = None,
         limit: int = 100,
+        cursor: str | None = None,
     ) -> dict[str, Any]:
         try:
-            table_enum = TableName(table)
-            filters = {
-                "category": category,
-                "goal": goal,
-                "asset_type": asset_type,
+            table_enum, params = self._query_params(
+                table, category, goal, asset_type, date_from, date_to, amount_min, amount_max, limit, cursor
+            )
+            return self._query_result(self._repository.query(user_id, table_enum, **params), limit)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+            }
+
+    async def _aquery_records(self, user_id: str, **arguments: Any) -> dict[str, Any]:
+        try:
+            table_enum, params = self._query_params(**arguments)
+            records = await self._repository.query(user_id, table_enum, **params)
+            return self._query_result(records, params["limit"])
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
             }
-            filters = {k: v for k, v in filters.items() if v is not None}
 
-            records = self._repository.query(
-                table_enum,
-                filters=filters if filters else None,
-                limit=limit,
+    def _query_params(
+        self,
+        table: str,
+        category: str | None = None,
+        goal: str | None = None,
+        asset_type: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        amount_min: float | None = None,
+        amount_max: float | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[TableName, dict[str, Any]]:
+        filters = {
+            "category": category,
+            "goal": goal,
+            "asset_type": asset_type,
+        }
+        filters = {k: v for k, v in filters.items() if v is not None}
+
+        return TableName(table), {
+            "filters": filters if filters else None,
+            "limit": limit,
+            "date_from": date.fromisoformat(date_from) if date_from else None,
+            "date_to": date.fromisoformat(date_to) if date_to else None,
+            "amount_min": amount_min,
+            "amount_max": amount_max,
+            "cursor": cursor,
+        }
+
+    def _query_result(self, records: list[dict[str, Any]], limit: int) -> dict[str, Any]:
+        response: dict[str, Any] = {
+            "success": True,
+            "count": len(records),
+            "records": records,
+        }
+        if records and len(records) == limit:
+            response["next_cursor"] = self._repository.encode_cursor(records[-1])
+        return response
+
+    def _aggregate_records(
+        self,
+        user_id: str,
+        table: str,
+        metrics: list[str] | None = None,
+        group_by: str | None = None,
+        period: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        category: str | None = None,
+        goal: str | None = None,
+        asset_type: str | None = None,
+    ) -> dict[str, Any]:
+        try:
+            table_enum, params = self._aggregate_params(
+                table, metrics, group_by, period, date_from, date_to, category, goal, asset_type
             )
+            return self._aggregate_result(self._repository.aggregate(user_id, table_enum, **params))
+        except Exception as e:
             return {
-                "success": True,
-                "count": len(records),
-                "records": records,
+                "success": False,
+                "error": str(e),
             }
+
+    async def _aaggregate_records(self, user_id: str, **arguments: Any) -> dict[str, Any]:
+        try:
+            table_enum, params = self._aggregate_params(**arguments)
+            return self._aggregate_result(await self._repository.aggregate(user_id, table_enum, **params))
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
             }
 
+    def _aggregate_params(
+        self,
+        table: str,
+        metrics: list[str] | None = None,
+        group_by: str | None = None,
+        period: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        category: str | None = None,
+        goal: str | None = None,
+        asset_type: str | None = None,
+    ) -> tuple[TableName, dict[str, Any]]:
+        filters = {
+            "category": category,
+            "goal": goal,
+            "asset_type": asset_type,
+        }
+        filters = {k: v for k, v in filters.items() if v is not None}
+
+        return TableName(table), {
+            "metrics": metrics,
+            "group_by": group_by,
+            "period": period,
+            "date_from": date.fromisoformat(date_from) if date_from else None,
+            "date_to": date.fromisoformat(date_to) if date_to else None,
+            "filters": filters if filters else None,
+        }
+
+    def _aggregate_result(self, rows: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "success": True,
+            "count": len(rows),
+            "rows": rows,
+        }
+
     def _web_search(
         self,
         query: str,
         max_results: int = 5,
     ) -> dict[str, Any]:
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=max_results))
-
-            formatted_results = [
-                {
-                    "title": r.get("title", ""),
-                    "url": r.get("href", ""),
-                    "snippet": r.get("body", ""),
-                }
-                for r in results
-            ]
-
-            return {
-                "success": True,
-                "query": query,
-                "count": len(formatted_results),
-                "results": formatted_results,
-            }
+            # Identical concurrent searches share one backend call
+            return self._search_cache.get_or_load(
+                (normalize_query(query), max_results),
+                lambda: self._run_web_search(query, max_results),
+            )
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
             }
+
+    def _run_web_search(self, query: str, max_results: int) -> dict[str, Any]:
+        results = self._search_backend.search(query, max_results)
+        return {
+            "success": True,
+            "query": query,
+            "count": len(results),
+            "results": results,
+        }
@@ -1,9 +1,22 @@
-"""Tracer for Chain of Thought logging."""
+"""Tracer for Chain of Thought logging and per-turn latency spans."""
 
+import itertools
 import json
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Callable, Generator
+
+from src.config import get_settings
+from src.observability.metrics import record_span
+from src.observability.sinks import TraceSink
+from src.observability.spans import Span, current_span, current_tracer, next_span_id
+
+TraceListener = Callable[[dict[str, Any]], None]
 
 
 class TraceType(str, Enum):
@@ -12,10 +25,17 @@ class TraceType(str, Enum):
     TOOL_RESULT = "TOOL_RESULT"
     RESPONSE = "RESPONSE"
     ERROR = "ERROR"
+    SPAN = "SPAN"
 
 
 class AgentTracer:
-    """Traces and logs agent's chain of thought."""
+    """Traces and logs agent's chain of thought.
+
+    Entries are kept in a ring buffer of ``max_traces`` and optionally
+    forwarded to a ``sink``. With ``sample_rate`` below 1, only that share of
+    chat turns is stored (errors always are); listeners and the latency
+    summary still see every turn. Console printing is opt-in.
+    """
 
     COLORS = {
         TraceType.THINKING: "\033[94m",     # Blue
@@ -23,13 +43,30 @@ class AgentTracer:
         TraceType.TOOL_RESULT: "\033[92m",  # Green
         TraceType.RESPONSE: "\033[95m",     # Magenta
         TraceType.ERROR: "\033[91m",        # Red
+        TraceType.SPAN: "\033[96m",         # Cyan
     }
     RESET = "\033[0m"
     BOLD = "\033[1m"
 
-    def __init__(self, enabled: bool = True):
-        self._enabled = enabled
-        self._traces: list[dict[str, Any]] = []
+    def __init__(
+        self,
+        console: bool = False,
+        max_traces: int | None = None,
+        sample_rate: float | None = None,
+        sink: TraceSink | None = None,
+    ):
+        settings = get_settings()
+        self._console = console
+        self._traces: deque[dict[str, Any]] = deque(maxlen=max_traces or settings.trace_buffer_size)
+        self._traces_lock = threading.Lock()
+        self._sample_rate = settings.trace_sample_rate if sample_rate is None else sample_rate
+        self._sampled = True
+        self._sink = sink
+        self._listeners: list[TraceListener] = []
+        # Finished spans of each open chat turn, keyed by root span id
+        self._turn_spans: dict[int, list[Span]] = {}
+        self._turn_lock = threading.Lock()
+        self._last_summary: dict[str, Any] | None = None
 
     def trace(self, trace_type: TraceType, message: str, data: dict[str, Any] | None = None) -> None:
         timestamp = datetime.now().isoformat()
@@ -39,11 +76,139 @@ class AgentTracer:
             "message": message,
             "data": data,
         }
-        self._traces.append(trace_entry)
+        for listener in self._listeners:
+            listener(trace_entry)
 
-        if self._enabled:
+        if self._sampled or trace_type == TraceType.ERROR:
+            with self._traces_lock:
+                self._traces.append(trace_entry)
+            if self._sink is not None:
+                self._sink.emit(trace_entry)
+
+        if self._console and (trace_type != TraceType.SPAN or (data or {}).get("kind") == "turn"):
             self._print_trace(trace_type, message, data)
 
+    @contextmanager
+    def span(self, name: str, kind: str, **attributes: Any) -> Generator[Span, None, None]:
+        """Time a block and record it as a SPAN trace nested under the active span.
+
+        A span opened with no active parent starts a new chat turn; when it
+        ends, its trace entry carries a latency summary of the whole turn.
+        """
+        parent = current_span.get() if current_tracer.get() is self else None
+        active = Span(next_span_id(), parent, name, kind, attributes)
+        if parent is None:
+            with self._turn_lock:
+                self._turn_spans[active.span_id] = []
+            self._sampled = self._sample_rate >= 1.0 or random.random() < self._sample_rate
+
+        tracer_token = current_tracer.set(self)
+        span_token = current_span.set(active)
+        try:
+            yield active
+        except BaseException:
+            active.status = "error"
+            raise
+        finally:
+            active.duration_ms = round((time.perf_counter() - active.start) * 1000, 3)
+            try:
+                current_span.reset(span_token)
+                current_tracer.reset(tracer_token)
+            except ValueError:
+                # Closed from another context (e.g. an abandoned async generator)
+                current_span.set(parent)
+            self._finish_span(active, parent)
+
+    def _finish_span(self, finished: Span, parent: Span | None) -> None:
+        record_span(finished)
+        data = finished.to_dict()
+
+        if parent is None:
+            with self._turn_lock:
+                children = self._turn_spans.pop(finished.span_id, [])
+            summary = self._summarize_turn(finished, children)
+            data["summary"] = summary
+            self._last_summary = summary
+        else:
+            with self._turn_lock:
+                children = self._turn_spans.get(finished.root_id)
+                # Spans ending after their turn (e.g. timed-out tools) are dropped
+                if children is not None:
+                    children.append(finished)
+
+        self.trace(TraceType.SPAN, f"{finished.name}: {finished.duration_ms:.1f} ms", data)
+        if parent is None:
+            self._sampled = True
+
+    @staticmethod
+    def _summarize_turn(root: Span, spans: list[Span]) -> dict[str, Any]:
+        """Break a turn's wall time down by LLM, tools, DB and agent code.
+
+        Tool time excludes the DB queries nested in it. ``agent`` is the part
+        of the turn not covered by any LLM call or tool. The critical path
+        lists the direct children in order, keeping only the longest of each
+        group of overlapping (parallel) spans.
+        """
+        children: dict[int, list[Span]] = {}
+        for child in spans:
+            children.setdefault(child.parent_id, []).append(child)
+
+        def exclusive(item: Span) -> float:
+            nested = sum(c.duration_ms or 0.0 for c in children.get(item.span_id, []))
+            return max(0.0, (item.duration_ms or 0.0) - nested)
+
+        breakdown = {"llm": 0.0, "tool": 0.0, "db": 0.0}
+        for item in spans:
+            if item.kind in breakdown:
+                breakdown[item.kind] += exclusive(item) if item.kind == "tool" else item.duration_ms or 0.0
+
+        direct = sorted(children.get(root.span_id, []), key=lambda s: s.start)
+        critical_path: list[dict[str, Any]] = []
+        covered = 0.0
+        group_end = float("-inf")
+        for item in direct:
+            end = item.start + (item.duration_ms or 0.0) / 1000
+            if critical_path and item.start < group_end:
+                # Overlaps the previous step: keep whichever finishes last
+                if end > group_end:
+                    covered += (end - group_end) * 1000
+                    group_end = end
+                    critical_path[-1] = {"name": item.name, "kind": item.kind, "duration_ms": item.duration_ms}
+                continue
+            covered += item.duration_ms or 0.0
+            group_end = end
+            critical_path.append({"name": item.name, "kind": item.kind, "duration_ms": item.duration_ms})
+
+        total = root.duration_ms or 0.0
+        breakdown_ms = {kind: round(value, 3) for kind, value in breakdown.items()}
+        breakdown_ms["agent"] = round(max(0.0, total - covered), 3)
+
+        llm_spans = [item for item in spans if item.kind == "llm"]
+        return {
+            "total_ms": total,
+            "breakdown_ms": breakdown_ms,
+            "critical_path": critical_path,
+            "llm_calls": len(llm_spans),
+            "tool_calls": sum(1 for item in spans if item.kind == "tool"),
+            "db_queries": sum(1 for item in spans if item.kind == "db"),
+            "tokens": {
+                key: sum(item.attributes.get(key, 0) for item in llm_spans)
+                for key in ("prompt_tokens", "completion_tokens", "total_tokens")
+            },
+        }
+
+    def last_turn_summary(self) -> dict[str, Any] | None:
+        """Latency summary of the most recently finished chat turn."""
+        return self._last_summary
+
+    def add_listener(self, listener: TraceListener) -> None:
+        """Call ``listener`` with every new trace entry (e.g. to stream them)."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: TraceListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
     def _print_trace(self, trace_type: TraceType, message: str, data: dict[str, Any] | None) -> None:
         color = self.COLORS.get(trace_type, "")
 
@@ -76,8 +241,16 @@ class AgentTracer:
             return value
         return str(value)
 
-    def get_traces(self) -> list[dict[str, Any]]:
-        return self._traces.copy()
+    def get_traces(self, offset: int = 0, limit: int | None = None) -> list[dict[str, Any]]:
+        """Stored entries, oldest first, from ``offset`` up to ``limit`` of them."""
+        stop = offset + limit if limit is not None else None
+        with self._traces_lock:
+            return list(itertools.islice(self._traces, offset, stop))
+
+    def trace_count(self) -> int:
+        return len(self._traces)
 
     def clear(self) -> None:
-        self._traces.clear()
+        with self._traces_lock:
+            self._traces.clear()
+        self._last_summary = None
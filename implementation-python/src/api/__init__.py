@@ -1,6 +1,6 @@
 """API module."""
 
 from src.api.routes import router
-from src.api.dependencies import get_agent
+from src.api.dependencies import get_session_store
 
-__all__ = ["router", "get_agent"]
+__all__ = ["router", "get_session_store"]
@@ -1,7 +1,26 @@
 from functools import lru_cache
 
-from src.agent import FinancialAgent, LLMClient, ToolRegistry
-from src.database import DatabaseConnection, FinancialRepository
+from src.agent import (
+    AgentTracer,
+    ConversationStore,
+    FinancialAgent,
+    InMemoryConversationStore,
+    LLMClient,
+    SessionStore,
+    ToolRegistry,
+)
+from src.config import get_settings
+from src.database import (
+    DEFAULT_USER_ID,
+    AsyncDatabaseConnection,
+    AsyncFinancialRepository,
+    DatabaseConnection,
+    FinancialRepository,
+    PostgresConversationStore,
+    RecordExporter,
+    RecordImporter,
+)
+from src.observability import JsonlTraceSink
 
 
 @lru_cache
@@ -10,10 +29,101 @@ def get_db_connection() -> DatabaseConnection:
 
 
 @lru_cache
-def get_agent() -> FinancialAgent:
-    db_connection = get_db_connection()
-    repository = FinancialRepository(db_connection)
-    client = LLMClient()
-    tool_registry = ToolRegistry(repository)
+def get_repository() -> FinancialRepository:
+    return FinancialRepository(get_db_connection())
 
-    return FinancialAgent(client=client, tool_registry=tool_registry)
+
+def uses_async_backend() -> bool:
+    return get_settings().database_backend == "async"
+
+
+@lru_cache
+def get_async_db_connection() -> AsyncDatabaseConnection:
+    return AsyncDatabaseConnection()
+
+
+@lru_cache
+def get_async_repository() -> AsyncFinancialRepository:
+    # Same cache and write generations as the blocking repository, so bulk
+    # imports through it also invalidate what the async tools cached
+    repository = get_repository()
+    return AsyncFinancialRepository(
+        get_async_db_connection(), cache=repository.query_cache, generations=repository.generations
+    )
+
+
+@lru_cache
+def get_importer() -> RecordImporter:
+    settings = get_settings()
+    return RecordImporter(
+        get_repository(),
+        chunk_size=settings.import_chunk_size,
+        max_reported_errors=settings.import_max_reported_errors,
+    )
+
+
+@lru_cache
+def get_exporter() -> RecordExporter:
+    return RecordExporter(get_repository(), batch_size=get_settings().export_batch_size)
+
+
+@lru_cache
+def get_tool_registry() -> ToolRegistry:
+    if uses_async_backend():
+        return ToolRegistry(get_async_repository())
+    return ToolRegistry(get_repository())
+
+
+@lru_cache
+def get_llm_client() -> LLMClient:
+    return LLMClient()
+
+
+@lru_cache
+def get_trace_sink() -> JsonlTraceSink | None:
+    settings = get_settings()
+    if not settings.trace_log_path:
+        return None
+    return JsonlTraceSink(settings.trace_log_path, max_queue=settings.trace_log_queue_size)
+
+
+@lru_cache
+def get_conversation_store() -> ConversationStore:
+    if get_settings().conversation_store == "memory":
+        return InMemoryConversationStore()
+    # Blocking store on the psycopg2 pool; async agents call it from a thread
+    return PostgresConversationStore(get_db_connection())
+
+
+def get_user_id() -> str:
+    """User the request acts for.
+
+    The API has no authentication yet, so every request works on
+    DEFAULT_USER_ID; a client-supplied id would let anyone read or write
+    another user's records. Replace this dependency once requests carry
+    verified credentials.
+    """
+    return DEFAULT_USER_ID
+
+
+def create_agent(user_id: str, session_id: str) -> FinancialAgent:
+    """Build a fresh agent for a session; LLM client, tools, trace sink and conversation store are shared."""
+    return FinancialAgent(
+        client=get_llm_client(),
+        tool_registry=get_tool_registry(),
+        tracer=AgentTracer(sink=get_trace_sink()),
+        user_id=user_id,
+        session_id=session_id,
+        conversation_store=get_conversation_store(),
+    )
+
+
+@lru_cache
+def get_session_store() -> SessionStore:
+    settings = get_settings()
+    return SessionStore(
+        agent_factory=create_agent,
+        max_sessions=settings.session_max_count,
+        ttl_seconds=settings.session_ttl_seconds,
+        conversations=get_conversation_store(),
+    )
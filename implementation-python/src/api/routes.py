@@ -1,22 +1,48 @@
 """API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import contextlib
+import io
+import json
+from datetime import date
+from typing import Any, AsyncIterator, Literal
 
-from src.api.dependencies import get_agent, get_db_connection
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from src.api.dependencies import (
+    get_async_db_connection,
+    get_db_connection,
+    get_exporter,
+    get_importer,
+    get_repository,
+    get_session_store,
+    get_trace_sink,
+    get_user_id,
+    uses_async_backend,
+)
 from src.api.schemas import ChatRequest, ChatResponse, HealthResponse
-from src.agent import FinancialAgent
+from src.api.streaming import BodyReader
+from src.agent import SessionStore
+from src.agent.search import get_search_cache
+from src.database import RecordExporter, RecordImporter
+from src.observability import REGISTRY
+from src.observability.metrics import MetricFamily
+from src.schemas import TableName
 
 router = APIRouter()
 
 
 @router.get("/health", response_model=HealthResponse)
-def health_check() -> HealthResponse:
+async def health_check() -> HealthResponse:
     db_status = "healthy"
 
     try:
-        db = get_db_connection()
-        with db.get_cursor() as cursor:
-            cursor.execute("SELECT 1")
+        if uses_async_backend():
+            async with get_async_db_connection().get_cursor() as cursor:
+                await cursor.execute("SELECT 1")
+        else:
+            await asyncio.to_thread(_ping_database)
     except Exception:
         db_status = "unhealthy"
 
@@ -26,31 +52,194 @@ def health_check() -> HealthResponse:
     )
 
 
+def _ping_database() -> None:
+    with get_db_connection().get_cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+@router.get("/stats")
+def get_stats(
+    sessions: SessionStore = Depends(get_session_store),
+) -> dict:
+    return {
+        "database_backend": "async" if uses_async_backend() else "sync",
+        "database_pool": get_db_connection().pool_stats(),
+        "async_database_pool": get_async_db_connection().pool_stats() if uses_async_backend() else None,
+        "prepared_statements": get_db_connection().statement_stats(),
+        "sessions": sessions.stats(),
+        "web_search_cache": get_search_cache().stats(),
+        "query_cache": get_repository().cache_stats(),
+        "trace_sink": sink.stats() if (sink := get_trace_sink()) is not None else None,
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics(
+    sessions: SessionStore = Depends(get_session_store),
+) -> PlainTextResponse:
+    """Prometheus text exposition of latency histograms and runtime gauges."""
+    return PlainTextResponse(
+        REGISTRY.render(_runtime_metrics(sessions)),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def _runtime_metrics(sessions: SessionStore) -> list[MetricFamily]:
+    """Read pool, session and cache state at scrape time."""
+    pools = {"sync": get_db_connection().pool_stats()}
+    if uses_async_backend():
+        pools["async"] = get_async_db_connection().pool_stats()
+    session_stats = sessions.stats()
+    caches = {"web_search": get_search_cache().stats(), "query": get_repository().cache_stats()}
+    caches = {name: stats for name, stats in caches.items() if stats is not None}
+
+    def per_cache(key: str) -> list[tuple[dict[str, str], float]]:
+        return [({"cache": name}, stats[key]) for name, stats in caches.items()]
+
+    def per_pool(key: str, **labels: str) -> list[tuple[dict[str, str], float]]:
+        return [({"backend": name, **labels}, stats[key]) for name, stats in pools.items()]
+
+    return [
+        ("financial_agent_active_sessions", "gauge", "Agent sessions held in memory.",
+         [({}, session_stats["active_sessions"])]),
+        ("financial_agent_db_pool_connections", "gauge", "Database pool connections by state.",
+         per_pool("in_use", state="in_use") + per_pool("idle", state="idle")),
+        ("financial_agent_db_pool_max_connections", "gauge", "Database pool size limit.",
+         per_pool("max_size")),
+        ("financial_agent_db_pool_waits_total", "counter", "Checkouts that had to wait for a connection.",
+         per_pool("waits")),
+        ("financial_agent_db_pool_timeouts_total", "counter", "Checkouts that timed out.",
+         per_pool("timeouts")),
+        ("financial_agent_cache_hits_total", "counter", "Cache lookups served from memory.",
+         per_cache("hits")),
+        ("financial_agent_cache_misses_total", "counter", "Cache lookups that ran the loader.",
+         per_cache("misses")),
+        ("financial_agent_cache_entries", "gauge", "Entries currently cached.", per_cache("size")),
+    ]
+
+
 @router.post("/chat", response_model=ChatResponse)
-def chat(
+async def chat(
     request: ChatRequest,
-    agent: FinancialAgent = Depends(get_agent),
+    user_id: str = Depends(get_user_id),
+    sessions: SessionStore = Depends(get_session_store),
 ) -> ChatResponse:
     try:
-        response = agent.chat(request.message)
-        return ChatResponse(response=response)
+        async with sessions.session(request.session_id, user_id) as agent:
+            response = await agent.achat(request.message)
+        return ChatResponse(response=response, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    user_id: str = Depends(get_user_id),
+    sessions: SessionStore = Depends(get_session_store),
+) -> StreamingResponse:
+    """Stream tokens, tool calls and traces as Server-Sent Events."""
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async with sessions.session(request.session_id, user_id) as agent:
+                async for event in agent.astream(request.message):
+                    yield _sse(event["event"], event["data"])
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/chat/reset")
 def reset_conversation(
-    agent: FinancialAgent = Depends(get_agent),
+    session_id: str = "default",
+    user_id: str = Depends(get_user_id),
+    sessions: SessionStore = Depends(get_session_store),
 ) -> dict[str, str]:
-    agent.reset_conversation()
+    sessions.discard(session_id, user_id)
     return {"message": "Conversación reiniciada correctamente"}
 
 
+@router.post("/import/{table}")
+async def import_records(
+    table: TableName,
+    request: Request,
+    format: Literal["csv", "jsonl"] = "csv",
+    user_id: str = Depends(get_user_id),
+    importer: RecordImporter = Depends(get_importer),
+) -> dict:
+    """Bulk load the request body (CSV with header, or JSON Lines) into a user's table.
+
+    The body is streamed to the importer as it arrives, so the file is
+    never held in memory.
+    """
+    reader = BodyReader()
+    stream = io.TextIOWrapper(io.BufferedReader(reader), encoding="utf-8-sig", newline="")
+    worker = asyncio.ensure_future(asyncio.to_thread(importer.import_stream, user_id, table, stream, format))
+
+    try:
+        await reader.feed(request.stream(), worker)
+    except Exception:
+        with contextlib.suppress(Exception):
+            await worker
+        raise
+
+    try:
+        return await worker
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export/{table}")
+def export_records(
+    table: TableName,
+    format: Literal["csv", "jsonl", "columnar"] = "csv",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    user_id: str = Depends(get_user_id),
+    exporter: RecordExporter = Depends(get_exporter),
+) -> StreamingResponse:
+    """Stream a user's records of a table (oldest first) through a server-side cursor.
+
+    Chunks are produced one batch at a time as the client reads them, so
+    memory use does not depend on the table size.
+    """
+    filename = f"{table.value}.{RecordExporter.EXTENSIONS[format]}"
+    return StreamingResponse(
+        exporter.export(user_id, table, format, date_from=date_from, date_to=date_to),
+        media_type=RecordExporter.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/traces")
 def get_traces(
-    agent: FinancialAgent = Depends(get_agent),
+    session_id: str = "default",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    user_id: str = Depends(get_user_id),
+    sessions: SessionStore = Depends(get_session_store),
 ) -> dict:
+    """Page through the stored traces of a session, oldest first."""
+    agent = sessions.peek(session_id, user_id)
+    traces = agent.get_traces(offset, limit) if agent else []
     return {
-        "count": len(agent.get_traces()),
-        "traces": agent.get_traces(),
+        "session_id": session_id,
+        "total": agent.trace_count() if agent else 0,
+        "offset": offset,
+        "limit": limit,
+        "count": len(traces),
+        "summary": agent.last_turn_summary() if agent else None,
+        "traces": traces,
     }
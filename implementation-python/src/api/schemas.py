@@ -5,10 +5,14 @@ from pydantic import BaseModel, Field
 
 class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, description="User message to the agent")
+    session_id: str = Field(
+        "default", min_length=1, max_length=128, description="Conversation identifier"
+    )
 
 
 class ChatResponse(BaseModel):
     response: str = Field(..., description="Agent response")
+    session_id: str = Field(..., description="Conversation identifier")
 
 
 class HealthResponse(BaseModel):
@@ -0,0 +1,72 @@
+"""Bridge between an async request body and blocking readers in a worker thread."""
+
+import asyncio
+import io
+import queue
+from typing import AsyncIterator
+
+
+class BodyReader(io.RawIOBase):
+    """Readable file object fed with request body chunks through a bounded queue.
+
+    The consumer (e.g. csv / the importer) runs in a worker thread and
+    blocks on ``readinto``; the event loop pushes chunks with ``feed``,
+    which waits while the queue is full, so a slow database throttles the
+    upload instead of buffering it in memory.
+    """
+
+    def __init__(self, max_chunks: int = 16):
+        self._chunks: queue.Queue[bytes | None] = queue.Queue(maxsize=max_chunks)
+        self._pending = b""
+        self._eof = False
+        self._aborted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:  # type: ignore[override]
+        while not self._pending:
+            if self._eof:
+                return 0
+            try:
+                chunk = self._chunks.get(timeout=0.1)
+            except queue.Empty:
+                if self._aborted:
+                    raise OSError("Request body aborted")
+                continue
+            if chunk is None:
+                self._eof = True
+                return 0
+            self._pending = chunk
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    async def feed(self, body: AsyncIterator[bytes], consumer: asyncio.Future) -> None:
+        """Push ``body`` into the reader until it ends or ``consumer`` finishes.
+
+        If reading the body fails (e.g. the client disconnects), the reader
+        raises in the consumer instead of waiting for more data.
+        """
+        try:
+            async for chunk in body:
+                if chunk and not await self._put(chunk, consumer):
+                    return
+        except BaseException:
+            self._aborted = True
+            raise
+        await self._put(None, consumer)
+
+    async def _put(self, chunk: bytes | None, consumer: asyncio.Future) -> bool:
+        while True:
+            # A consumer that stopped early (e.g. a database error) must not
+            # leave the upload waiting on a full queue.
+            if consumer.done():
+                return False
+            try:
+                self._chunks.put_nowait(chunk)
+                return True
+            except queue.Full:
+                await asyncio.sleep(0.005)
@@ -0,0 +1,5 @@
+"""In-process caching utilities."""
+
+from src.cache.ttl import TTLCache
+
+__all__ = ["TTLCache"]
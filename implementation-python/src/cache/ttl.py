@@ -0,0 +1,217 @@
+"""Bounded LRU cache with per-entry TTL and single-flight loading."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class _Flight:
+    """A load in progress that concurrent callers for the same key wait on."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries expire after ``ttl_seconds``.
+
+    ``get_or_load`` deduplicates concurrent misses on the same key: only the
+    first caller runs the loader, the others wait for and share its result.
+    ``aget_or_load`` does the same for coroutines on one event loop.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0):
+        if max_size < 1:
+            raise ValueError(f"Invalid cache size: {max_size}")
+
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+        self._async_inflight: dict[Hashable, asyncio.Future[V]] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def _lookup(self, key: Hashable, now: float) -> tuple[bool, V | None]:
+        """Find a live entry. Must be called with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: V, now: float) -> None:
+        """Insert an entry, evicting the least recently used. Lock must be held."""
+        self._entries[key] = (now + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._store(key, value, time.monotonic())
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], V],
+        should_cache: Callable[[V], bool] | None = None,
+    ) -> V:
+        """Return the cached value for ``key`` or load it exactly once.
+
+        Args:
+            key: Cache key.
+            loader: Computes the value on a miss.
+            should_cache: Predicate deciding whether a loaded value is stored
+                (e.g. to skip error results). Waiting callers get the value
+                either way.
+
+        Raises:
+            Whatever ``loader`` raises, in the loading and in the waiting callers.
+        """
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self._hits += 1
+                return value  # type: ignore[return-value]
+
+            flight = self._inflight.get(key)
+            if flight is None:
+                self._misses += 1
+                flight = _Flight()
+                self._inflight[key] = flight
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+            flight.value = value
+            if should_cache is None or should_cache(value):
+                with self._lock:
+                    self._store(key, value, time.monotonic())
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    async def aget_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[V]],
+        should_cache: Callable[[V], bool] | None = None,
+    ) -> V:
+        """Async ``get_or_load``: waiting callers await the first loader
+        instead of blocking the event loop.
+
+        Raises:
+            Whatever ``loader`` raises, in the loading and in the waiting callers.
+        """
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self._hits += 1
+                return value  # type: ignore[return-value]
+
+            flight = self._async_inflight.get(key)
+            if flight is None:
+                self._misses += 1
+                flight = asyncio.get_running_loop().create_future()
+                # Nobody may be waiting: mark a failed load as retrieved
+                flight.add_done_callback(lambda done: done.cancelled() or done.exception())
+                self._async_inflight[key] = flight
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if not leader:
+            try:
+                # A waiter being cancelled must not cancel the shared load
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+            # The loading caller was cancelled (e.g. timed out): load again
+            return await self.aget_or_load(key, loader, should_cache)
+
+        try:
+            value = await loader()
+            flight.set_result(value)
+            if should_cache is None or should_cache(value):
+                with self._lock:
+                    self._store(key, value, time.monotonic())
+            return value
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._async_inflight[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "ttl_seconds": self._ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+                "hit_rate": (self._hits + self._coalesced) / lookups if lookups else 0.0,
+            }
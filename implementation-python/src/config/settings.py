@@ -15,12 +15,67 @@ class Settings(BaseSettings):
     database_user: str = "postgres"
     database_password: str = "postgres"
 
+    database_pool_min_size: int = 1
+    database_pool_max_size: int = 10
+    database_pool_idle_timeout: float = 300.0
+    database_pool_checkout_timeout: float = 30.0
+    database_pool_health_check_interval: float = 30.0
+    # Run repeated insert/query shapes as server-side prepared statements
+    database_prepared_statements: bool = True
+    # sync (psycopg2, tool calls in worker threads) | async (psycopg 3 on the event loop).
+    # Only the API honours it; the CLI and bulk import/export always use sync.
+    database_backend: str = "sync"
+
+    # Per process: invalidated only by writes made through this process, so leave it off when
+    # several workers (or other writers) share the database.
+    query_cache_enabled: bool = False
+    query_cache_ttl_seconds: float = 60.0
+    query_cache_max_entries: int = 1024
+
+    # Answer monthly/total aggregates from the trigger-maintained <table>_monthly rollups
+    aggregate_use_rollups: bool = True
+
+    # Bulk import (COPY): rows per chunk and rejected rows listed in the report
+    import_chunk_size: int = 5000
+    import_max_reported_errors: int = 100
+    # Streaming export: rows fetched from the server-side cursor per chunk
+    export_batch_size: int = 1000
+
     model_name: str = "gemini/gemini-2.5-flash"
+    # Custom endpoint, e.g. a self-hosted OpenAI-compatible server
+    llm_api_base: Optional[str] = None
 
     reasoning_effort: str = "low"
 
     max_iterations: int = 10
 
+    # Answer plain one-line inserts ("gasté 12 en comida") without calling the model
+    fast_path_enabled: bool = True
+    # always_model | skip_after_writes (reply from the tool results after successful inserts)
+    completion_policy: str = "skip_after_writes"
+
+    context_max_tokens: int = 16000
+    context_keep_recent_turns: int = 3
+
+    tool_max_concurrency: int = 4
+    tool_timeout_seconds: float = 30.0
+
+    web_search_cache_ttl_seconds: float = 300.0
+    web_search_cache_max_entries: int = 512
+
+    session_max_count: int = 1000
+    session_ttl_seconds: float = 3600.0
+    # postgres (shared by every worker, survives restarts) | memory (this process only)
+    conversation_store: str = "postgres"
+    # Messages loaded when a session is resumed by an agent that does not hold it
+    conversation_resume_messages: int = 40
+
+    trace_buffer_size: int = 1000
+    trace_sample_rate: float = 1.0
+    # JSON Lines file written by a background thread; disabled when unset
+    trace_log_path: Optional[str] = None
+    trace_log_queue_size: int = 10000
+
     @property
     def database_url(self) -> str:
         return (
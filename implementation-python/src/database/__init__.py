@@ -1,6 +1,28 @@
 """Database module."""
 
-from src.database.connection import DatabaseConnection
-from src.database.repository import FinancialRepository
+from src.database.connection import DEFAULT_USER_ID, DatabaseConnection
+from src.database.pool import ConnectionPool, PoolTimeoutError
+from src.database.statements import StatementRegistry
+from src.database.repository import FinancialRepository, TableGenerations
+from src.database.async_connection import AsyncDatabaseConnection
+from src.database.async_pool import AsyncConnectionPool
+from src.database.async_repository import AsyncFinancialRepository
+from src.database.importer import RecordImporter
+from src.database.exporter import RecordExporter
+from src.database.conversations import PostgresConversationStore
 
-__all__ = ["DatabaseConnection", "FinancialRepository"]
+__all__ = [
+    "DEFAULT_USER_ID",
+    "DatabaseConnection",
+    "ConnectionPool",
+    "PoolTimeoutError",
+    "StatementRegistry",
+    "FinancialRepository",
+    "TableGenerations",
+    "AsyncDatabaseConnection",
+    "AsyncConnectionPool",
+    "AsyncFinancialRepository",
+    "RecordImporter",
+    "RecordExporter",
+    "PostgresConversationStore",
+]
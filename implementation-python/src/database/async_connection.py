@@ -0,0 +1,91 @@
+"""Async database connection management (psycopg 3)."""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
+
+import psycopg
+from psycopg import AsyncConnection, AsyncCursor
+
+from src.config import get_settings
+from src.database.async_pool import AsyncConnectionPool
+from src.database.connection import SCHEMA_SQL
+from src.database.statements import GENERIC_PLAN_OPTIONS
+
+
+class AsyncDatabaseConnection:
+    """Manages async PostgreSQL connections for code running on the event loop."""
+
+    def __init__(self, database_url: str | None = None, pool: AsyncConnectionPool | None = None):
+        """Initialize async connection manager.
+
+        Args:
+            database_url: PostgreSQL connection URL. Uses settings if not provided.
+            pool: Connection pool to draw from. Built from settings if not provided.
+        """
+        settings = get_settings()
+        # Passed as execute(prepare=...): psycopg 3 keeps its own per-connection
+        # cache of prepared statements
+        self.prepare = settings.database_prepared_statements
+        self._database_url = database_url or settings.database_url
+        self._pool = pool or AsyncConnectionPool(
+            self._database_url,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size,
+            idle_timeout=settings.database_pool_idle_timeout,
+            checkout_timeout=settings.database_pool_checkout_timeout,
+            health_check_interval=settings.database_pool_health_check_interval,
+            connect_options=GENERIC_PLAN_OPTIONS if self.prepare else None,
+        )
+
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """Get a pooled connection, committed on success and rolled back on error.
+
+        Connections that failed at the driver level, or whose operation was
+        cancelled midway (e.g. a tool timeout), are discarded instead of reused.
+
+        Yields:
+            psycopg async connection.
+        """
+        conn = await self._pool.getconn()
+        discard = False
+        try:
+            yield conn
+            await conn.commit()
+        except Exception as e:
+            discard = isinstance(e, (psycopg.OperationalError, psycopg.InterfaceError))
+            if not conn.closed:
+                try:
+                    await conn.rollback()
+                except psycopg.Error:
+                    discard = True
+            raise
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            await self._pool.putconn(conn, discard=discard)
+
+    @asynccontextmanager
+    async def get_cursor(self) -> AsyncGenerator[AsyncCursor, None]:
+        """Get a cursor with tuple rows on a pooled connection.
+
+        Yields:
+            psycopg async cursor.
+        """
+        async with self.get_connection() as conn:
+            async with conn.cursor() as cursor:
+                yield cursor
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool usage statistics."""
+        return self._pool.stats()
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        await self._pool.close()
+
+    async def initialize_schema(self) -> None:
+        """Create database tables and their indexes if they don't exist."""
+        async with self.get_cursor() as cursor:
+            await cursor.execute(SCHEMA_SQL)
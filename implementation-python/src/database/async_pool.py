@@ -0,0 +1,228 @@
+"""Asyncio PostgreSQL connection pool on top of psycopg 3."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+import psycopg
+from psycopg import AsyncConnection
+from psycopg.pq import TransactionStatus
+
+from src.database.pool import PoolTimeoutError
+
+
+class AsyncConnectionPool:
+    """Bounded pool of reusable async PostgreSQL connections.
+
+    Same policy and statistics as ``ConnectionPool`` (LIFO reuse, idle
+    pruning down to ``min_size``, health check of long-idle connections),
+    but waiting for a free connection suspends the coroutine instead of
+    blocking a thread. Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        checkout_timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        connect_options: str | None = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            database_url: PostgreSQL connection URL.
+            min_size: Connections kept open even when idle.
+            max_size: Upper bound of open connections.
+            idle_timeout: Seconds after which an idle connection above
+                ``min_size`` is closed.
+            checkout_timeout: Seconds to wait for a free connection.
+            health_check_interval: Connections idle for longer than this are
+                pinged with ``SELECT 1`` before being handed out.
+            connect_options: Server settings (``-c name=value``) sent when
+                opening each connection, so they survive rollbacks.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self._database_url = database_url
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._checkout_timeout = checkout_timeout
+        self._health_check_interval = health_check_interval
+        self._connect_options = connect_options
+
+        self._available = asyncio.Condition()
+        self._idle: deque[tuple[AsyncConnection, float]] = deque()
+        self._size = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._connects = 0
+        self._discarded = 0
+        self._waits = 0
+        self._timeouts = 0
+
+    async def _connect(self) -> AsyncConnection:
+        conn = await AsyncConnection.connect(self._database_url, options=self._connect_options)
+        self._connects += 1
+        return conn
+
+    async def _is_healthy(self, conn: AsyncConnection, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self._health_check_interval:
+            return True
+        try:
+            await conn.execute("SELECT 1")
+            await conn.rollback()
+            return True
+        except psycopg.Error:
+            return False
+
+    async def _close_quietly(self, conn: AsyncConnection) -> None:
+        try:
+            await conn.close()
+        except psycopg.Error:
+            pass
+
+    def _prune_idle(self, now: float) -> list[AsyncConnection]:
+        """Pop expired idle connections."""
+        expired = []
+        # The oldest idle connections sit at the left end of the deque.
+        while self._idle and self._size > self._min_size:
+            conn, idle_since = self._idle[0]
+            if now - idle_since < self._idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._discarded += 1
+            expired.append(conn)
+        return expired
+
+    async def getconn(self) -> AsyncConnection:
+        """Check out a connection, opening a new one if the pool has room.
+
+        Raises:
+            PoolTimeoutError: If the pool is exhausted for ``checkout_timeout`` seconds.
+        """
+        deadline = time.monotonic() + self._checkout_timeout
+
+        while True:
+            candidate: tuple[AsyncConnection, float] | None = None
+
+            async with self._available:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                expired = self._prune_idle(time.monotonic())
+
+                if self._idle:
+                    candidate = self._idle.pop()
+                elif self._size < self._max_size:
+                    self._size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        self._waits += 1
+                        try:
+                            await asyncio.wait_for(self._available.wait(), remaining)
+                            continue
+                        except asyncio.TimeoutError:
+                            pass
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self._checkout_timeout}s "
+                        f"(max_size={self._max_size})"
+                    )
+
+            try:
+                for conn in expired:
+                    await self._close_quietly(conn)
+                healthy = candidate is not None and await self._is_healthy(*candidate)
+            except BaseException:
+                # Cancelled (e.g. a tool timeout) while holding the candidate:
+                # give its slot back instead of losing it with the connection
+                if candidate is not None:
+                    await self._release_slot()
+                    await self._close_quietly(candidate[0])
+                raise
+
+            if candidate is not None:
+                conn, _ = candidate
+                if healthy:
+                    self._checkouts += 1
+                    return conn
+                await self._close_quietly(conn)
+                await self._release_slot()
+                continue
+
+            try:
+                conn = await self._connect()
+            except BaseException:
+                # Also on cancellation, so the reserved slot is not leaked
+                await self._release_slot(discarded=False)
+                raise
+            self._checkouts += 1
+            return conn
+
+    async def putconn(self, conn: AsyncConnection, discard: bool = False) -> None:
+        """Return a connection to the pool, resetting any open transaction.
+
+        Args:
+            conn: Connection previously obtained from ``getconn``.
+            discard: Close the connection instead of reusing it.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != TransactionStatus.IDLE:
+                    await conn.rollback()
+            except psycopg.Error:
+                discard = True
+
+        if discard or conn.closed or self._closed:
+            await self._close_quietly(conn)
+            await self._release_slot()
+            return
+
+        async with self._available:
+            self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    async def _release_slot(self, discarded: bool = True) -> None:
+        async with self._available:
+            self._size -= 1
+            if discarded:
+                self._discarded += 1
+            self._available.notify()
+
+    async def close(self) -> None:
+        """Close all idle connections and refuse new checkouts."""
+        async with self._available:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._available.notify_all()
+
+        for conn in idle:
+            await self._close_quietly(conn)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool usage counters."""
+        return {
+            "min_size": self._min_size,
+            "max_size": self._max_size,
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._size - len(self._idle),
+            "checkouts": self._checkouts,
+            "connects": self._connects,
+            "discarded": self._discarded,
+            "waits": self._waits,
+            "timeouts": self._timeouts,
+        }
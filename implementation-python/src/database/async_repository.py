@@ -0,0 +1,164 @@
+"""Async repository for the API, on top of psycopg 3."""
+
+from datetime import date
+from typing import Any
+
+from src.cache import TTLCache
+from src.database.async_connection import AsyncDatabaseConnection
+from src.database.repository import BaseFinancialRepository, TableGenerations
+from src.observability import span
+from src.schemas import TableName
+
+
+class AsyncFinancialRepository(BaseFinancialRepository):
+    """Awaitable ``insert``/``insert_many``/``query``/``aggregate``.
+
+    Runs the same statements as ``FinancialRepository`` without tying up a
+    thread per database call. Bulk import/export (COPY, server-side
+    cursors) stays on the blocking repository.
+    """
+
+    def __init__(
+        self,
+        db_connection: AsyncDatabaseConnection,
+        cache: TTLCache | None = None,
+        generations: TableGenerations | None = None,
+    ):
+        """Initialize repository with an async database connection.
+
+        Args:
+            db_connection: Async database connection manager instance.
+            cache: Read-through cache for query results. Built from settings
+                when not provided (unless QUERY_CACHE_ENABLED is false).
+            generations: Write counters keying the cache. Pass those of the
+                blocking repository so writes through either invalidate both.
+        """
+        super().__init__(cache, generations)
+        self._db = db_connection
+
+    async def insert(self, user_id: str, table: TableName, data: dict[str, Any]) -> dict[str, Any]:
+        """Insert a record into the specified table.
+
+        Args:
+            user_id: Owner of the record.
+            table: Target table name.
+            data: Record data to insert.
+
+        Returns:
+            The inserted record with generated fields.
+
+        Raises:
+            ValueError: If table is invalid or required fields are missing.
+        """
+        query, values = self._insert_statement(user_id, table, data)
+
+        with span("db.insert", "db", table=table.value):
+            async with self._db.get_cursor() as cursor:
+                await cursor.execute(query, values, prepare=self._db.prepare)
+                records = self._records_converter(cursor.description)([await cursor.fetchone()])
+
+        self._invalidate(table, user_id)
+        return records[0]
+
+    async def insert_many(
+        self, user_id: str, records: list[tuple[TableName, dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        """Insert several records, possibly into different tables, atomically.
+
+        Args:
+            user_id: Owner of the records.
+            records: ``(table, data)`` pairs, as for ``insert``.
+
+        Returns:
+            The inserted records with generated fields, in input order.
+
+        Raises:
+            ValueError: If a table is invalid or a record has no valid data.
+        """
+        by_table = self._group_by_table(records)
+
+        inserted: list[dict[str, Any] | None] = [None] * len(records)
+        with span("db.insert_many", "db", rows=len(records)):
+            async with self._db.get_cursor() as cursor:
+                for table, rows in by_table.items():
+                    fields = ["user_id", *self.TABLE_FIELDS[table]]
+                    row_placeholders = f"({', '.join(['%s'] * len(fields))})"
+                    query = f"""
+                        INSERT INTO {table.value} ({', '.join(fields)})
+                        VALUES {', '.join([row_placeholders] * len(rows))}
+                        RETURNING {', '.join(self.record_columns(table))}
+                    """
+                    await cursor.execute(query, [value for _, values in rows for value in (user_id, *values)])
+                    returned = self._records_converter(cursor.description)(await cursor.fetchall())
+                    # ids come from the sequence in VALUES order; sorting maps them back
+                    returned.sort(key=lambda row: row["id"])
+                    for (position, _), record in zip(rows, returned):
+                        inserted[position] = record
+
+        for table in by_table:
+            self._invalidate(table, user_id)
+        return [record for record in inserted if record is not None]
+
+    async def query(
+        self,
+        user_id: str,
+        table: TableName,
+        filters: dict[str, Any] | None = None,
+        limit: int = 100,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        amount_min: float | None = None,
+        amount_max: float | None = None,
+        cursor: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Query records from the specified table, newest first.
+
+        See ``FinancialRepository.query`` for the arguments.
+
+        Raises:
+            ValueError: If table or cursor is invalid.
+        """
+        query, values = self._query_statement(
+            user_id, table, filters, limit, date_from, date_to, amount_min, amount_max, cursor
+        )
+        return await self._fetch_all("query", table, user_id, query, values)
+
+    async def aggregate(
+        self,
+        user_id: str,
+        table: TableName,
+        metrics: list[str] | None = None,
+        group_by: str | None = None,
+        period: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Compute SUM/COUNT/AVG/MIN/MAX of amounts in the database.
+
+        See ``FinancialRepository.aggregate`` for the arguments.
+
+        Raises:
+            ValueError: If table, metric, grouping column or period is invalid.
+        """
+        operation, query, values = self._aggregate_statement(
+            user_id, table, metrics, group_by, period, date_from, date_to, filters
+        )
+        return await self._fetch_all(operation, table, user_id, query, values)
+
+    async def _fetch_all(
+        self, operation: str, table: TableName, user_id: str, query: str, values: list[Any]
+    ) -> list[dict[str, Any]]:
+        """Run a read query through the result cache (see ``_cache_key``)."""
+
+        async def load() -> list[dict[str, Any]]:
+            with span(f"db.{operation}", "db", table=table.value):
+                async with self._db.get_cursor() as cursor:
+                    # Aggregates are planned per call, see FinancialRepository._fetch_all
+                    await cursor.execute(query, values, prepare=self._db.prepare and operation == "query")
+                    return self._records_converter(cursor.description)(await cursor.fetchall())
+
+        if self._cache is None:
+            return await load()
+
+        return await self._cache.aget_or_load(self._cache_key(table, user_id, query, values), load)
@@ -1,42 +1,286 @@
 """Database connection management."""
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Sequence
 
 import psycopg2
 from psycopg2.extensions import connection as PgConnection
+from psycopg2.extensions import cursor as PgCursor
 from psycopg2.extras import RealDictCursor
 
 from src.config import get_settings
+from src.database.pool import ConnectionPool
+from src.database.statements import GENERIC_PLAN_OPTIONS, StatementRegistry
+
+# Owner of the rows of a single-household deployment, and of the rows written
+# before the tables had a user_id
+DEFAULT_USER_ID = "default"
+
+# Hash partitions per table, so one user's rows live in a single partition.
+# Fixed when the tables are created; changing it means recreating them.
+USER_PARTITIONS = 16
+
+# Created if missing by every backend on startup
+SCHEMA_SQL = """
+-- Concurrent startups (several API workers) would race on CREATE OR REPLACE
+SELECT pg_advisory_xact_lock(hashtext('financial_agent_schema'));
+"""
+
+# Grouping column of each table, also the key of its monthly rollup
+ROLLUP_GROUPS = {"expenses": "category", "savings": "goal", "investments": "asset_type"}
+
+
+def _table_sql(table: str, group: str) -> str:
+    """DDL of one table, partitioned by user, with its indexes.
+
+    Tables from before ``user_id`` existed are plain tables: they are moved
+    aside, and their rows copied to ``DEFAULT_USER_ID`` (keeping ids and the
+    id sequence) once the partitioned table exists.
+    """
+    partitions = "\n".join(
+        f"CREATE TABLE IF NOT EXISTS {table}_p{remainder} PARTITION OF {table}\n"
+        f"    FOR VALUES WITH (MODULUS {USER_PARTITIONS}, REMAINDER {remainder});"
+        for remainder in range(USER_PARTITIONS)
+    )
+    return f"""
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('{table}')) = 'r' THEN
+        ALTER TABLE {table} RENAME TO {table}_single_user;
+        ALTER INDEX {table}_pkey RENAME TO {table}_single_user_pkey;
+        ALTER SEQUENCE {table}_id_seq OWNED BY NONE;
+        -- Recreated per user and backfilled below
+        DROP TABLE IF EXISTS {table}_monthly;
+    END IF;
+END;
+$$;
+
+CREATE SEQUENCE IF NOT EXISTS {table}_id_seq AS integer;
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'),
+    user_id VARCHAR(128) NOT NULL,
+    amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
+    {group} VARCHAR(100) NOT NULL,
+    description VARCHAR(500),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, id)
+) PARTITION BY HASH (user_id);
+ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id;
+{partitions}
+
+-- A user's newest-first listings and date ranges, with id as keyset tie-breaker
+CREATE INDEX IF NOT EXISTS idx_{table}_user_created_at
+    ON {table} (user_id, created_at DESC, id DESC);
+-- Same ordering filtered by the grouping column
+CREATE INDEX IF NOT EXISTS idx_{table}_user_{group}_created_at
+    ON {table} (user_id, {group}, created_at DESC, id DESC);
+
+DO $$
+BEGIN
+    IF to_regclass('{table}_single_user') IS NOT NULL THEN
+        INSERT INTO {table} (id, user_id, amount, {group}, description, created_at)
+        SELECT id, '{DEFAULT_USER_ID}', amount, {group}, description, created_at
+        FROM {table}_single_user;
+        DROP TABLE {table}_single_user;
+    END IF;
+END;
+$$;
+"""
+
+
+def _rollup_sql(table: str, group: str) -> str:
+    """DDL of one table's rollup and triggers, backfilled when first created."""
+    return f"""
+CREATE TABLE IF NOT EXISTS {table}_monthly (
+    user_id VARCHAR(128) NOT NULL,
+    month DATE NOT NULL,
+    {group} VARCHAR(100) NOT NULL,
+    record_count BIGINT NOT NULL,
+    amount_sum NUMERIC NOT NULL,
+    amount_min DECIMAL(12, 2) NOT NULL,
+    amount_max DECIMAL(12, 2) NOT NULL,
+    PRIMARY KEY (user_id, month, {group})
+);
+
+-- Maintained by statement-level triggers: one upsert per INSERT/COPY
+-- statement, grouped from its transition table. Updates and deletes
+-- recompute the (user_id, month, {group}) keys they touch from {table} itself.
+CREATE OR REPLACE FUNCTION {table}_rollup_add() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO {table}_monthly AS r (user_id, month, {group}, record_count, amount_sum, amount_min, amount_max)
+    SELECT user_id, date_trunc('month', created_at)::date, {group}, COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (user_id, month, {group}) DO UPDATE SET
+        record_count = r.record_count + EXCLUDED.record_count,
+        amount_sum = r.amount_sum + EXCLUDED.amount_sum,
+        amount_min = LEAST(r.amount_min, EXCLUDED.amount_min),
+        amount_max = GREATEST(r.amount_max, EXCLUDED.amount_max);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION {table}_rollup_recompute() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    CREATE TEMP TABLE IF NOT EXISTS {table}_rollup_keys (
+        user_id VARCHAR(128), month DATE, {group} VARCHAR(100)
+    ) ON COMMIT DROP;
+    INSERT INTO {table}_rollup_keys
+    SELECT DISTINCT user_id, date_trunc('month', created_at)::date, {group} FROM old_rows;
+    IF TG_OP = 'UPDATE' THEN
+        INSERT INTO {table}_rollup_keys
+        SELECT DISTINCT user_id, date_trunc('month', created_at)::date, {group} FROM new_rows;
+    END IF;
+
+    DELETE FROM {table}_monthly r USING {table}_rollup_keys k
+    WHERE r.user_id = k.user_id AND r.month = k.month AND r.{group} = k.{group};
+    INSERT INTO {table}_monthly (user_id, month, {group}, record_count, amount_sum, amount_min, amount_max)
+    SELECT k.user_id, k.month, k.{group}, COUNT(*), SUM(t.amount), MIN(t.amount), MAX(t.amount)
+    FROM (SELECT DISTINCT user_id, month, {group} FROM {table}_rollup_keys) k
+    JOIN {table} t
+        ON t.user_id = k.user_id AND t.{group} = k.{group}
+        AND t.created_at >= k.month AND t.created_at < k.month + interval '1 month'
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    -- A concurrent insert may have recreated a key after the DELETE
+    ON CONFLICT (user_id, month, {group}) DO UPDATE SET
+        record_count = EXCLUDED.record_count,
+        amount_sum = EXCLUDED.amount_sum,
+        amount_min = EXCLUDED.amount_min,
+        amount_max = EXCLUDED.amount_max;
+    DELETE FROM {table}_rollup_keys;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION {table}_rollup_clear() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE {table}_monthly;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER {table}_rollup_insert AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {table}_rollup_add();
+CREATE OR REPLACE TRIGGER {table}_rollup_update AFTER UPDATE ON {table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {table}_rollup_recompute();
+CREATE OR REPLACE TRIGGER {table}_rollup_delete AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {table}_rollup_recompute();
+CREATE OR REPLACE TRIGGER {table}_rollup_truncate AFTER TRUNCATE ON {table}
+    FOR EACH STATEMENT EXECUTE FUNCTION {table}_rollup_clear();
+
+-- Rows written before the rollup existed. The triggers above hold a lock
+-- on {table} until commit, so no write slips in between.
+INSERT INTO {table}_monthly (user_id, month, {group}, record_count, amount_sum, amount_min, amount_max)
+SELECT user_id, date_trunc('month', created_at)::date, {group}, COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+FROM {table}
+WHERE NOT EXISTS (SELECT 1 FROM {table}_monthly)
+GROUP BY 1, 2, 3;
+"""
+
+
+def rollup_rebuild_sql(table: str) -> str:
+    """Recompute a rollup from scratch, blocking writes to ``table`` meanwhile."""
+    group = ROLLUP_GROUPS[table]
+    return f"""
+LOCK TABLE {table} IN SHARE MODE;
+DELETE FROM {table}_monthly;
+INSERT INTO {table}_monthly (user_id, month, {group}, record_count, amount_sum, amount_min, amount_max)
+SELECT user_id, date_trunc('month', created_at)::date, {group}, COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+FROM {table}
+GROUP BY 1, 2, 3;
+"""
+
+
+SCHEMA_SQL += "".join(
+    _table_sql(table, group) + _rollup_sql(table, group) for table, group in ROLLUP_GROUPS.items()
+)
+
+# Chat history of each (user, session), appended to turn by turn. ``epoch``
+# grows on every reset so agents holding an older copy notice it.
+SCHEMA_SQL += """
+CREATE TABLE IF NOT EXISTS conversations (
+    user_id VARCHAR(128) NOT NULL,
+    session_id VARCHAR(128) NOT NULL,
+    epoch INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, session_id)
+);
+
+CREATE TABLE IF NOT EXISTS conversation_messages (
+    user_id VARCHAR(128) NOT NULL,
+    session_id VARCHAR(128) NOT NULL,
+    id BIGSERIAL,
+    -- Only ever read back whole: json keeps the text as written, no jsonb decomposition
+    message JSON NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, session_id, id)
+);
+"""
 
 
 class DatabaseConnection:
     """Manages PostgreSQL database connections."""
 
-    def __init__(self, database_url: str | None = None):
+    def __init__(
+        self,
+        database_url: str | None = None,
+        pool: ConnectionPool | None = None,
+        statements: StatementRegistry | None = None,
+    ):
         """Initialize database connection manager.
 
         Args:
             database_url: PostgreSQL connection URL. Uses settings if not provided.
+            pool: Connection pool to draw from. Built from settings if not provided.
+            statements: Prepared statement registry used by ``execute``. Built
+                unless DATABASE_PREPARED_STATEMENTS is false.
         """
-        self._database_url = database_url or get_settings().database_url
+        settings = get_settings()
+        if statements is None and settings.database_prepared_statements:
+            statements = StatementRegistry()
+        self._statements = statements
+        self._database_url = database_url or settings.database_url
+        self._pool = pool or ConnectionPool(
+            self._database_url,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size,
+            idle_timeout=settings.database_pool_idle_timeout,
+            checkout_timeout=settings.database_pool_checkout_timeout,
+            health_check_interval=settings.database_pool_health_check_interval,
+            connect_options=GENERIC_PLAN_OPTIONS if statements is not None else None,
+        )
 
     @contextmanager
     def get_connection(self) -> Generator[PgConnection, None, None]:
-        """Get a database connection context manager.
+        """Get a pooled database connection context manager.
+
+        The transaction is committed on success and rolled back on error before
+        the connection goes back to the pool. Connections that failed at the
+        driver level are discarded instead of reused.
 
         Yields:
             PostgreSQL connection object.
         """
-        conn = psycopg2.connect(self._database_url)
+        conn = self._pool.getconn()
+        discard = False
         try:
             yield conn
             conn.commit()
-        except Exception:
-            conn.rollback()
+        except Exception as e:
+            discard = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
             raise
         finally:
-            conn.close()
+            self._pool.putconn(conn, discard=discard)
 
     @contextmanager
     def get_cursor(self) -> Generator[RealDictCursor, None, None]:
@@ -52,32 +296,30 @@ class DatabaseConnection:
             finally:
                 cursor.close()
 
+    def execute(self, cursor: PgCursor, query: str, values: Sequence[Any]) -> None:
+        """Run a repeated query shape, as a prepared statement when enabled."""
+        if self._statements is None:
+            cursor.execute(query, values)
+        else:
+            self._statements.execute(cursor, query, values)
+
+    def statement_stats(self) -> dict[str, Any] | None:
+        """Get prepared statement counters, or None if they are disabled."""
+        return self._statements.stats() if self._statements is not None else None
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool usage statistics."""
+        return self._pool.stats()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._pool.close()
+
     def initialize_schema(self) -> None:
-        """Create database tables if they don't exist."""
-        schema_sql = """
-        CREATE TABLE IF NOT EXISTS expenses (
-            id SERIAL PRIMARY KEY,
-            amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
-            category VARCHAR(100) NOT NULL,
-            description VARCHAR(500),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS savings (
-            id SERIAL PRIMARY KEY,
-            amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
-            goal VARCHAR(100) NOT NULL,
-            description VARCHAR(500),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS investments (
-            id SERIAL PRIMARY KEY,
-            amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
-            asset_type VARCHAR(100) NOT NULL,
-            description VARCHAR(500),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
+        """Create database tables and their indexes if they don't exist.
+
+        Tables created before ``user_id`` existed are migrated in place, their
+        rows assigned to ``DEFAULT_USER_ID``.
         """
         with self.get_cursor() as cursor:
-            cursor.execute(schema_sql)
+            cursor.execute(SCHEMA_SQL)
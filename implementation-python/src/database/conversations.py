@@ -0,0 +1,112 @@
+"""PostgreSQL-backed conversation store."""
+
+from typing import Any
+
+from psycopg2.extras import Json, execute_values
+
+from src.database.connection import DatabaseConnection
+from src.observability import span
+
+
+class PostgresConversationStore:
+    """Keeps chat histories in the ``conversations`` tables, shared by every worker.
+
+    Messages are only ever appended; ``clear`` deletes them and bumps the
+    conversation epoch in the same transaction.
+    """
+
+    def __init__(self, db: DatabaseConnection):
+        """Initialize the store.
+
+        Args:
+            db: Connection manager whose pool the store uses.
+        """
+        self._db = db
+
+    def load(
+        self, user_id: str, session_id: str, epoch: int, after: int, limit: int
+    ) -> tuple[int, list[tuple[int, dict[str, Any]]]]:
+        """Fetch the messages of a conversation newer than what the caller holds.
+
+        Args:
+            user_id: Owner of the conversation.
+            session_id: Conversation identifier.
+            epoch: Epoch of the caller's copy.
+            after: Id of the last message the caller holds; ignored when the
+                conversation is no longer at ``epoch``.
+            limit: Maximum number of messages, the newest ones.
+
+        Returns:
+            The current epoch (0 for an unknown conversation) and
+            ``(id, message)`` pairs, oldest first.
+        """
+        query = """
+            SELECT c.epoch, m.id, m.message
+            FROM conversations c
+            LEFT JOIN LATERAL (
+                SELECT id, message FROM conversation_messages
+                WHERE user_id = c.user_id AND session_id = c.session_id
+                  AND id > CASE WHEN c.epoch = %s THEN %s ELSE 0 END
+                ORDER BY id DESC
+                LIMIT %s
+            ) m ON TRUE
+            WHERE c.user_id = %s AND c.session_id = %s
+            ORDER BY m.id
+        """
+        with span("db.conversation_load", "db"), self._db.get_cursor() as cursor:
+            cursor.execute(query, (epoch, after, limit, user_id, session_id))
+            rows = cursor.fetchall()
+
+        if not rows:
+            return 0, []
+        return rows[0]["epoch"], [(row["id"], row["message"]) for row in rows if row["id"] is not None]
+
+    def append(self, user_id: str, session_id: str, messages: list[dict[str, Any]]) -> list[int]:
+        """Append messages to a conversation, creating it if needed.
+
+        Args:
+            user_id: Owner of the conversation.
+            session_id: Conversation identifier.
+            messages: Messages in conversation order.
+
+        Returns:
+            Ids of the stored messages, in the same order.
+        """
+        if not messages:
+            return []
+
+        with span("db.conversation_append", "db", messages=len(messages)), self._db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO conversations (user_id, session_id) VALUES (%s, %s)
+                ON CONFLICT (user_id, session_id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP
+                """,
+                (user_id, session_id),
+            )
+            returned = execute_values(
+                cursor,
+                "INSERT INTO conversation_messages (user_id, session_id, message) VALUES %s RETURNING id",
+                [(user_id, session_id, Json(message)) for message in messages],
+                page_size=len(messages),
+                fetch=True,
+            )
+        # ids come from the sequence in VALUES order
+        return sorted(row["id"] for row in returned)
+
+    def clear(self, user_id: str, session_id: str) -> None:
+        """Delete a conversation's messages and start a new epoch.
+
+        Args:
+            user_id: Owner of the conversation.
+            session_id: Conversation identifier.
+        """
+        with span("db.conversation_clear", "db"), self._db.get_cursor() as cursor:
+            cursor.execute(
+                "UPDATE conversations SET epoch = epoch + 1, updated_at = CURRENT_TIMESTAMP "
+                "WHERE user_id = %s AND session_id = %s",
+                (user_id, session_id),
+            )
+            cursor.execute(
+                "DELETE FROM conversation_messages WHERE user_id = %s AND session_id = %s",
+                (user_id, session_id),
+            )
@@ -0,0 +1,91 @@
+"""Streaming export of the financial tables as CSV, JSON Lines or columnar chunks."""
+
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, Iterator
+
+from src.database.repository import FinancialRepository
+from src.schemas import TableName
+
+
+class RecordExporter:
+    """Serializes the batches of ``FinancialRepository.iter_records`` as text chunks."""
+
+    FORMATS = ("csv", "jsonl", "columnar")
+
+    MEDIA_TYPES = {
+        "csv": "text/csv",
+        "jsonl": "application/x-ndjson",
+        "columnar": "application/x-ndjson",
+    }
+
+    EXTENSIONS = {"csv": "csv", "jsonl": "jsonl", "columnar": "columns.jsonl"}
+
+    def __init__(self, repository: FinancialRepository, batch_size: int = 1000):
+        """Initialize the exporter.
+
+        Args:
+            repository: Repository to read the records from.
+            batch_size: Rows fetched from the server-side cursor per chunk.
+        """
+        self._repository = repository
+        self._batch_size = batch_size
+
+    def export(
+        self,
+        user_id: str,
+        table: TableName,
+        fmt: str = "csv",
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> Iterator[str]:
+        """Return an iterator of text chunks, one per batch of ``user_id``'s records.
+
+        ``csv`` starts with a header row; ``jsonl`` has one record per line;
+        ``columnar`` has one line per batch with ``columns`` and the values
+        of each column as arrays (the layout of a Parquet row group, without
+        a Parquet dependency).
+
+        The query only starts when the iterator is first advanced, and the
+        next batch is fetched only after the previous chunk was consumed, so
+        a slow reader holds back the database instead of filling memory.
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Invalid format: {fmt}. Use one of {', '.join(self.FORMATS)}")
+
+        # Each format reads the result shape it writes with the least work
+        shape = {"csv": "tuples", "jsonl": "records", "columnar": "columns"}[fmt]
+        batches = self._repository.iter_records(
+            user_id, table, date_from=date_from, date_to=date_to, batch_size=self._batch_size, shape=shape
+        )
+        columns = self._repository.record_columns(table)
+
+        if fmt == "csv":
+            return self._csv_chunks(batches, columns)
+        if fmt == "jsonl":
+            return self._jsonl_chunks(batches)
+        return self._columnar_chunks(batches, columns)
+
+    def _csv_chunks(self, batches: Iterator[list[tuple[Any, ...]]], columns: list[str]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        # Header only, for an empty export
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def _jsonl_chunks(self, batches: Iterator[list[dict[str, Any]]]) -> Iterator[str]:
+        for batch in batches:
+            yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+
+    def _columnar_chunks(self, batches: Iterator[dict[str, list[Any]]], columns: list[str]) -> Iterator[str]:
+        for batch in batches:
+            chunk = {"rows": len(batch["id"]), "columns": columns, "data": batch}
+            yield json.dumps(chunk, ensure_ascii=False) + "\n"
@@ -0,0 +1,173 @@
+"""Streaming bulk import of CSV / JSON Lines files into the financial tables."""
+
+import csv
+import json
+import re
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterator, TextIO
+
+from pydantic import BaseModel, ValidationError
+
+from src.database.repository import FinancialRepository
+from src.schemas import ExpenseCreate, InvestmentCreate, SavingCreate, TableName
+
+# "12,50" as written by Spanish bank exports
+_DECIMAL_COMMA = re.compile(r"-?\d+,\d+")
+
+# amount columns are DECIMAL(12, 2) with CHECK (amount > 0)
+_CENT = Decimal("0.01")
+_AMOUNT_LIMIT = Decimal(10) ** 10
+
+
+class RecordImporter:
+    """Validates rows against the create schemas and loads them with COPY."""
+
+    SCHEMAS: dict[TableName, type[BaseModel]] = {
+        TableName.EXPENSES: ExpenseCreate,
+        TableName.SAVINGS: SavingCreate,
+        TableName.INVESTMENTS: InvestmentCreate,
+    }
+
+    FORMATS = ("csv", "jsonl")
+
+    def __init__(
+        self,
+        repository: FinancialRepository,
+        chunk_size: int = 5000,
+        max_reported_errors: int = 100,
+    ):
+        """Initialize the importer.
+
+        Args:
+            repository: Repository used to COPY the valid rows.
+            chunk_size: Rows sent per COPY statement.
+            max_reported_errors: Rejected rows listed in the report; the
+                rest are only counted.
+        """
+        self._repository = repository
+        self._chunk_size = chunk_size
+        self._max_reported_errors = max_reported_errors
+
+    @classmethod
+    def detect_format(cls, filename: str) -> str:
+        """Guess the format from a file name (``.jsonl``/``.ndjson`` or CSV)."""
+        return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+    def import_stream(
+        self, user_id: str, table: TableName, stream: TextIO, fmt: str = "csv"
+    ) -> dict[str, Any]:
+        """Import every row of ``stream`` into ``table`` as records of ``user_id``.
+
+        Rows are read, validated and loaded one chunk at a time in a single
+        transaction. Invalid rows are skipped and reported; a database error
+        rolls the whole import back. Until it commits, the loaded rows are
+        not visible and other writes of the user to the same months and
+        categories wait for it, as the rollup rows they update stay locked.
+        Timestamps with a UTC offset are stored converted to UTC.
+
+        Args:
+            user_id: Owner of the imported records.
+            table: Target table name.
+            stream: Text stream with the file contents.
+            fmt: ``csv`` (header row required) or ``jsonl``.
+
+        Returns:
+            Report with the loaded and rejected counts and the first errors
+            (line number and reason).
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Invalid format: {fmt}. Use one of {', '.join(self.FORMATS)}")
+
+        report: dict[str, Any] = {"table": table.value, "loaded": 0, "rejected": 0, "errors": []}
+
+        def valid_records() -> Iterator[dict[str, Any]]:
+            for line, row in self._read(stream, fmt):
+                try:
+                    yield self._validate(table, row)
+                except ValueError as e:
+                    report["rejected"] += 1
+                    if len(report["errors"]) < self._max_reported_errors:
+                        report["errors"].append({"line": line, "error": self._describe(e)})
+
+        report["loaded"] = self._repository.copy_records(user_id, table, valid_records(), self._chunk_size)
+        return report
+
+    def _read(self, stream: TextIO, fmt: str) -> Iterator[tuple[int, Any]]:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f"Invalid JSON: {e.msg}")
+
+    def _validate(self, table: TableName, row: Any) -> dict[str, Any]:
+        if isinstance(row, ValueError):
+            raise row
+        if not isinstance(row, dict):
+            raise ValueError("Row must be an object")
+
+        values: dict[str, Any] = {}
+        for key, value in row.items():
+            if key is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip() or None
+            values[str(key).strip().lower()] = value
+
+        created_at = values.pop("created_at", None) or values.pop("date", None)
+        amount = values.get("amount")
+        if isinstance(amount, str) and _DECIMAL_COMMA.fullmatch(amount):
+            values["amount"] = amount.replace(",", ".")
+
+        record = self.SCHEMAS[table].model_validate(values).model_dump()
+        record["amount"] = self._column_amount(record["amount"])
+        record["created_at"] = self._parse_timestamp(created_at) if created_at is not None else None
+        return record
+
+    @staticmethod
+    def _column_amount(amount: Decimal) -> Decimal:
+        """Round an amount as the column does, rejecting values it cannot store.
+
+        A value COPY cannot store (overflow, or 0.00 after rounding) would
+        abort the whole import instead of rejecting just its row.
+        """
+        if amount >= _AMOUNT_LIMIT:
+            raise ValueError(f"amount: must be less than {_AMOUNT_LIMIT}")
+        # PostgreSQL rounds numeric half away from zero
+        rounded = amount.quantize(_CENT, rounding=ROUND_HALF_UP)
+        if rounded >= _AMOUNT_LIMIT:
+            raise ValueError(f"amount: must be less than {_AMOUNT_LIMIT}")
+        if rounded <= 0:
+            raise ValueError("amount: rounds to 0.00 at 2 decimals")
+        return rounded
+
+    @staticmethod
+    def _parse_timestamp(value: Any) -> datetime:
+        if isinstance(value, datetime):
+            parsed = value
+        else:
+            try:
+                parsed = datetime.fromisoformat(str(value))
+            except ValueError:
+                raise ValueError(f"Invalid created_at: {value!r} (expected ISO format, e.g. 2024-01-31)")
+        if parsed.tzinfo is not None:
+            # created_at has no time zone: COPY would drop the offset and keep the wall-clock time
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    @staticmethod
+    def _describe(error: ValueError) -> str:
+        if isinstance(error, ValidationError):
+            return "; ".join(
+                f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+                for item in error.errors()
+            )
+        return str(error)
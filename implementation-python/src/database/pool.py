@@ -0,0 +1,223 @@
+"""Thread-safe PostgreSQL connection pool."""
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extensions import connection as PgConnection
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """Bounded pool of reusable PostgreSQL connections.
+
+    Idle connections are kept in LIFO order so the most recently used (and
+    therefore warmest) connection is handed out first, while connections idle
+    for longer than ``idle_timeout`` are closed down to ``min_size``.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        checkout_timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        connect_options: str | None = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            database_url: PostgreSQL connection URL.
+            min_size: Connections kept open even when idle.
+            max_size: Upper bound of open connections.
+            idle_timeout: Seconds after which an idle connection above
+                ``min_size`` is closed.
+            checkout_timeout: Seconds to wait for a free connection.
+            health_check_interval: Connections idle for longer than this are
+                pinged with ``SELECT 1`` before being handed out.
+            connect_options: Server settings (``-c name=value``) sent when
+                opening each connection, so they survive rollbacks.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self._database_url = database_url
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._checkout_timeout = checkout_timeout
+        self._health_check_interval = health_check_interval
+        self._connect_options = connect_options
+
+        self._lock = threading.Condition()
+        self._idle: deque[tuple[PgConnection, float]] = deque()
+        self._size = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._connects = 0
+        self._discarded = 0
+        self._waits = 0
+        self._timeouts = 0
+
+    def _connect(self) -> PgConnection:
+        conn = psycopg2.connect(self._database_url, options=self._connect_options)
+        with self._lock:
+            self._connects += 1
+        return conn
+
+    def _is_healthy(self, conn: PgConnection, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self._health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _close_quietly(self, conn: PgConnection) -> None:
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _prune_idle(self, now: float) -> list[PgConnection]:
+        """Pop expired idle connections. Must be called with the lock held."""
+        expired = []
+        # The oldest idle connections sit at the left end of the deque.
+        while self._idle and self._size > self._min_size:
+            conn, idle_since = self._idle[0]
+            if now - idle_since < self._idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._discarded += 1
+            expired.append(conn)
+        return expired
+
+    def getconn(self) -> PgConnection:
+        """Check out a connection, opening a new one if the pool has room.
+
+        Raises:
+            PoolTimeoutError: If the pool is exhausted for ``checkout_timeout`` seconds.
+        """
+        deadline = time.monotonic() + self._checkout_timeout
+
+        while True:
+            candidate: tuple[PgConnection, float] | None = None
+            expired: list[PgConnection] = []
+
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                expired = self._prune_idle(time.monotonic())
+
+                if self._idle:
+                    candidate = self._idle.pop()
+                elif self._size < self._max_size:
+                    self._size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self._checkout_timeout}s "
+                            f"(max_size={self._max_size})"
+                        )
+                    self._waits += 1
+                    self._lock.wait(remaining)
+                    continue
+
+            for conn in expired:
+                self._close_quietly(conn)
+
+            if candidate is not None:
+                conn, idle_since = candidate
+                if self._is_healthy(conn, idle_since):
+                    with self._lock:
+                        self._checkouts += 1
+                    return conn
+                self._close_quietly(conn)
+                with self._lock:
+                    self._size -= 1
+                    self._discarded += 1
+                continue
+
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._checkouts += 1
+            return conn
+
+    def putconn(self, conn: PgConnection, discard: bool = False) -> None:
+        """Return a connection to the pool, resetting any open transaction.
+
+        Args:
+            conn: Connection previously obtained from ``getconn``.
+            discard: Close the connection instead of reusing it.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._lock:
+            if discard or conn.closed or self._closed:
+                self._size -= 1
+                self._discarded += 1
+                reuse = False
+            else:
+                self._idle.append((conn, time.monotonic()))
+                reuse = True
+            self._lock.notify()
+
+        if not reuse:
+            self._close_quietly(conn)
+
+    def close(self) -> None:
+        """Close all idle connections and refuse new checkouts."""
+        with self._lock:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._lock.notify_all()
+
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool usage counters."""
+        with self._lock:
+            return {
+                "min_size": self._min_size,
+                "max_size": self._max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "checkouts": self._checkouts,
+                "connects": self._connects,
+                "discarded": self._discarded,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+            }
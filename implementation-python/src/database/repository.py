@@ -1,14 +1,77 @@
 """Repository pattern for database operations."""
 
+import base64
+import binascii
+import csv
+import io
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
-from src.database.connection import DatabaseConnection
+from psycopg2.extras import execute_values
+
+from src.cache import TTLCache
+from src.config import get_settings
+from src.database.connection import DatabaseConnection, rollup_rebuild_sql
+from src.observability import span
 from src.schemas import TableName
 
 
-class FinancialRepository:
-    """Repository for financial data operations."""
+class TableGenerations:
+    """Per-user, per-table write counters that are part of every cached read's key.
+
+    Bumping the generation of a user's table makes that user's cached
+    results for it unreachable; other users' entries stay valid.
+    Repositories over the same tables (e.g. the sync and async backends)
+    share one instance so a write through either invalidates both.
+
+    User ids come from requests, so only the ``max_users`` most recently
+    used (table, user) counters are kept. Forgetting one bumps its table,
+    which invalidates everyone's entries for it instead of letting the
+    user's counter restart at a value an old entry was cached under.
+    """
+
+    def __init__(self, tables: Iterable[TableName], max_users: int = 10000):
+        self._tables: dict[TableName, int] = {table: 0 for table in tables}
+        # Only (table, user) pairs written since startup; the rest are at 0
+        self._users: OrderedDict[tuple[TableName, str], int] = OrderedDict()
+        self._max_users = max_users
+        self._lock = threading.Lock()
+
+    def get(self, table: TableName, user_id: str) -> tuple[int, int]:
+        key = (table, user_id)
+        with self._lock:
+            generation = self._users.get(key)
+            if generation is None:
+                return self._tables[table], 0
+            self._users.move_to_end(key)
+            return self._tables[table], generation
+
+    def bump(self, table: TableName, user_id: str | None = None) -> None:
+        """Invalidate a user's cached reads of ``table``, or everyone's if ``user_id`` is None."""
+        with self._lock:
+            if user_id is None:
+                self._tables[table] += 1
+                return
+            key = (table, user_id)
+            self._users[key] = self._users.get(key, 0) + 1
+            self._users.move_to_end(key)
+            if len(self._users) > self._max_users:
+                (evicted_table, _), _ = self._users.popitem(last=False)
+                self._tables[evicted_table] += 1
+
+
+class BaseFinancialRepository:
+    """Schema knowledge, SQL building and result conversion shared by the
+    blocking and the async repository.
+
+    Subclasses only add the I/O: running the statements built here on their
+    driver and feeding the rows to the converters.
+    """
 
     # Mapping of table names to their specific fields (excluding common fields)
     TABLE_FIELDS: dict[TableName, list[str]] = {
@@ -17,23 +80,106 @@ class FinancialRepository:
         TableName.INVESTMENTS: ["amount", "asset_type", "description"],
     }
 
-    def __init__(self, db_connection: DatabaseConnection):
-        """Initialize repository with database connection.
+    # Column each table is naturally grouped by in summaries
+    GROUP_FIELDS: dict[TableName, str] = {
+        TableName.EXPENSES: "category",
+        TableName.SAVINGS: "goal",
+        TableName.INVESTMENTS: "asset_type",
+    }
+
+    AGGREGATE_METRICS: dict[str, str] = {
+        "sum": "SUM(amount)",
+        "count": "COUNT(*)",
+        "avg": "AVG(amount)",
+        "min": "MIN(amount)",
+        "max": "MAX(amount)",
+    }
+
+    AGGREGATE_PERIODS = ("day", "week", "month")
+
+    # Upper bound of rows returned by aggregate
+    AGGREGATE_MAX_GROUPS = 1000
+
+    # How each metric is recombined from the <table>_monthly rollup columns
+    ROLLUP_METRICS: dict[str, str] = {
+        "sum": "SUM(amount_sum)",
+        "count": "COALESCE(SUM(record_count), 0)::bigint",
+        "avg": "SUM(amount_sum) / SUM(record_count)",
+        "min": "MIN(amount_min)",
+        "max": "MAX(amount_max)",
+    }
+
+    # Per PostgreSQL type OID, how to make a column value JSON-friendly;
+    # columns of any other type are passed through unchanged.
+    COLUMN_CONVERTERS: dict[int, Callable[[Any], Any]] = {
+        1700: float,  # numeric
+        1082: date.isoformat,  # date
+        1083: time.isoformat,  # time
+        1114: datetime.isoformat,  # timestamp
+        1184: datetime.isoformat,  # timestamptz
+    }
+
+    RESULT_SHAPES = ("records", "tuples", "columns")
+
+    def __init__(self, cache: TTLCache | None = None, generations: TableGenerations | None = None):
+        """Initialize the shared repository state.
 
         Args:
-            db_connection: Database connection manager instance.
+            cache: Read-through cache for query results. Built from settings
+                when not provided (unless QUERY_CACHE_ENABLED is false).
+            generations: Write counters keying the cache. Pass the ones of
+                another repository to share its cache invalidation.
         """
-        self._db = db_connection
+        settings = get_settings()
+        if cache is None and settings.query_cache_enabled:
+            cache = TTLCache(
+                max_size=settings.query_cache_max_entries,
+                ttl_seconds=settings.query_cache_ttl_seconds,
+            )
+        self._cache = cache
+        self._use_rollups = settings.aggregate_use_rollups
+        # Bumped on every write so cached reads of that table stop matching
+        self._generations = generations or TableGenerations(self.TABLE_FIELDS)
 
-    def insert(self, table: TableName, data: dict[str, Any]) -> dict[str, Any]:
-        """Insert a record into the specified table.
+    @property
+    def query_cache(self) -> TTLCache | None:
+        return self._cache
 
-        Args:
-            table: Target table name.
-            data: Record data to insert.
+    @property
+    def generations(self) -> TableGenerations:
+        return self._generations
 
-        Returns:
-            The inserted record with generated fields.
+    def record_columns(self, table: TableName) -> list[str]:
+        """Columns of a table's records, in result order."""
+        return ["id", *self.TABLE_FIELDS[table], "created_at"]
+
+    @staticmethod
+    def encode_cursor(record: dict[str, Any]) -> str:
+        """Build the keyset cursor pointing after a serialized record."""
+        payload = json.dumps([record["created_at"], record["id"]])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        """Parse a cursor built by encode_cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            created_at, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(created_at), int(record_id)
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    def cache_stats(self) -> dict[str, Any] | None:
+        """Get query result cache statistics, or None if caching is disabled."""
+        return self._cache.stats() if self._cache is not None else None
+
+    def _insert_statement(
+        self, user_id: str, table: TableName, data: dict[str, Any]
+    ) -> tuple[str, list[Any]]:
+        """Build the single-row INSERT of ``insert``.
 
         Raises:
             ValueError: If table is invalid or required fields are missing.
@@ -48,65 +194,353 @@ class FinancialRepository:
         if not filtered_data:
             raise ValueError("No valid data provided for insertion")
 
-        columns = list(filtered_data.keys())
+        columns = ["user_id", *filtered_data.keys()]
         placeholders = ["%s"] * len(columns)
-        values = list(filtered_data.values())
+        values = [user_id, *filtered_data.values()]
 
         query = f"""
             INSERT INTO {table.value} ({', '.join(columns)})
             VALUES ({', '.join(placeholders)})
-            RETURNING *
+            RETURNING {', '.join(self.record_columns(table))}
         """
+        return query, values
 
-        with self._db.get_cursor() as cursor:
-            cursor.execute(query, values)
-            result = cursor.fetchone()
-            return self._serialize_record(dict(result))
+    def _group_by_table(
+        self, records: list[tuple[TableName, dict[str, Any]]]
+    ) -> dict[TableName, list[tuple[int, list[Any]]]]:
+        """Validate ``insert_many`` input and group it per table.
 
-    def query(
+        Returns:
+            Per table, the input position and field values of each record.
+
+        Raises:
+            ValueError: If a table is invalid or a record has no valid data.
+        """
+        by_table: dict[TableName, list[tuple[int, list[Any]]]] = {}
+        for position, (table, data) in enumerate(records):
+            fields = self.TABLE_FIELDS.get(table)
+            if not fields:
+                raise ValueError(f"Invalid table: {table}")
+            if not any(data.get(field) is not None for field in fields):
+                raise ValueError(f"No valid data provided for record {position + 1}")
+            by_table.setdefault(table, []).append((position, [data.get(field) for field in fields]))
+        return by_table
+
+    def _query_statement(
         self,
+        user_id: str,
         table: TableName,
-        filters: dict[str, Any] | None = None,
-        limit: int = 100,
-    ) -> list[dict[str, Any]]:
-        """Query records from the specified table.
+        filters: dict[str, Any] | None,
+        limit: int,
+        date_from: date | None,
+        date_to: date | None,
+        amount_min: float | None,
+        amount_max: float | None,
+        cursor: str | None,
+    ) -> tuple[str, list[Any]]:
+        """Build the SELECT of ``query``.
 
-        Args:
-            table: Target table name.
-            filters: Optional filters to apply (column: value).
-            limit: Maximum number of records to return.
+        Raises:
+            ValueError: If table or cursor is invalid.
+        """
+        if table not in self.TABLE_FIELDS:
+            raise ValueError(f"Invalid table: {table}")
+
+        query = f"SELECT {', '.join(self.record_columns(table))} FROM {table.value}"
+
+        # Build WHERE clause with valid fields only
+        conditions, values = self._build_conditions(
+            user_id, table, filters, date_from, date_to, amount_min, amount_max
+        )
+        if cursor:
+            # Seek past the last row seen instead of scanning an OFFSET
+            conditions.append("(created_at, id) < (%s, %s)")
+            values.extend(self.decode_cursor(cursor))
+        query += f" WHERE {' AND '.join(conditions)}"
+
+        query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+        values.append(limit)
+        return query, values
+
+    def _aggregate_statement(
+        self,
+        user_id: str,
+        table: TableName,
+        metrics: list[str] | None,
+        group_by: str | None,
+        period: str | None,
+        date_from: date | None,
+        date_to: date | None,
+        filters: dict[str, Any] | None,
+    ) -> tuple[str, str, list[Any]]:
+        """Build the grouped SELECT of ``aggregate``.
 
         Returns:
-            List of matching records.
+            The operation name for spans/metrics (``aggregate`` or
+            ``aggregate_rollup``), the SQL and its parameters.
 
         Raises:
-            ValueError: If table is invalid.
+            ValueError: If table, metric, grouping column or period is invalid.
         """
         if table not in self.TABLE_FIELDS:
             raise ValueError(f"Invalid table: {table}")
 
-        query = f"SELECT * FROM {table.value}"
-        values: list[Any] = []
+        metrics = metrics or ["sum", "count"]
+        invalid = [m for m in metrics if m not in self.AGGREGATE_METRICS]
+        if invalid:
+            raise ValueError(f"Invalid metrics: {', '.join(invalid)}")
+
+        if group_by is not None and group_by != self.GROUP_FIELDS[table]:
+            raise ValueError(f"Cannot group {table.value} by {group_by}")
+
+        if period is not None and period not in self.AGGREGATE_PERIODS:
+            raise ValueError(f"Invalid period: {period}")
+
+        rollup = self._rollup_statement(user_id, table, metrics, group_by, period, date_from, date_to, filters)
+        if rollup is not None:
+            return "aggregate_rollup", *rollup
+
+        group_columns = []
+        if period:
+            group_columns.append(f"date_trunc('{period}', created_at) AS period")
+        if group_by:
+            group_columns.append(group_by)
+
+        select = group_columns + [f"{self.AGGREGATE_METRICS[m]} AS {m}" for m in metrics]
+        query = f"SELECT {', '.join(select)} FROM {table.value}"
+
+        conditions, values = self._build_conditions(user_id, table, filters, date_from, date_to)
+        query += f" WHERE {' AND '.join(conditions)}"
+
+        if group_columns:
+            positions = ", ".join(str(i + 1) for i in range(len(group_columns)))
+            query += f" GROUP BY {positions} ORDER BY {positions}"
+
+        query += " LIMIT %s"
+        values.append(self.AGGREGATE_MAX_GROUPS)
+        return "aggregate", query, values
+
+    def _rollup_statement(
+        self,
+        user_id: str,
+        table: TableName,
+        metrics: list[str],
+        group_by: str | None,
+        period: str | None,
+        date_from: date | None,
+        date_to: date | None,
+        filters: dict[str, Any] | None,
+    ) -> tuple[str, list[Any]] | None:
+        """Answer ``aggregate`` from the monthly rollup when possible.
+
+        Whole months in the range are read from ``<table>_monthly`` and only
+        the partial months at either end are scanned in the table itself, so
+        the cost grows with months x groups instead of rows. Returns None
+        (plain aggregate) for day/week periods, filters on other columns or
+        ranges within a single month.
+        """
+        group = self.GROUP_FIELDS[table]
+        filters = {column: value for column, value in (filters or {}).items() if value is not None}
+        if not self._use_rollups or period not in (None, "month") or set(filters) - {group}:
+            return None
+
+        # Half-open [start, end) ranges; None is unbounded
+        end = date_to + timedelta(days=1) if date_to is not None else None
+        months_from = date_from
+        if date_from is not None and date_from.day != 1:
+            months_from = (date_from.replace(day=1) + timedelta(days=32)).replace(day=1)
+        months_to = end.replace(day=1) if end is not None else None
+        if months_from is not None and months_to is not None and months_from >= months_to:
+            return None
+
+        rollup_conditions = ["user_id = %s"]
+        rollup_values: list[Any] = [user_id]
+        if months_from is not None:
+            rollup_conditions.append("month >= %s")
+            rollup_values.append(months_from)
+        if months_to is not None:
+            rollup_conditions.append("month < %s")
+            rollup_values.append(months_to)
+
+        edges = []
+        if date_from is not None and date_from < months_from:
+            edges.append((date_from, months_from))
+        if end is not None and months_to < end:
+            edges.append((months_to, end))
+
+        if group in filters:
+            rollup_conditions.append(f"{group} = %s")
+            rollup_values.append(filters[group])
+
+        parts = [
+            f"SELECT month, {group}, record_count, amount_sum, amount_min, amount_max "
+            f"FROM {table.value}_monthly WHERE {' AND '.join(rollup_conditions)}"
+        ]
+        values = rollup_values
+
+        if edges:
+            edge_conditions = [
+                "user_id = %s",
+                "(" + " OR ".join("(created_at >= %s AND created_at < %s)" for _ in edges) + ")",
+            ]
+            values += [user_id, *(bound for edge in edges for bound in edge)]
+            if group in filters:
+                edge_conditions.append(f"{group} = %s")
+                values.append(filters[group])
+            parts.append(
+                f"SELECT date_trunc('month', created_at)::date, {group}, COUNT(*), SUM(amount), "
+                f"MIN(amount), MAX(amount) FROM {table.value} "
+                f"WHERE {' AND '.join(edge_conditions)} GROUP BY 1, 2"
+            )
+
+        group_columns = []
+        if period:
+            group_columns.append("month::timestamp AS period")
+        if group_by:
+            group_columns.append(group_by)
+
+        select = group_columns + [f"{self.ROLLUP_METRICS[m]} AS {m}" for m in metrics]
+        query = f"SELECT {', '.join(select)} FROM ({' UNION ALL '.join(parts)}) AS parts"
+
+        if group_columns:
+            positions = ", ".join(str(i + 1) for i in range(len(group_columns)))
+            query += f" GROUP BY {positions} ORDER BY {positions}"
+
+        query += " LIMIT %s"
+        values.append(self.AGGREGATE_MAX_GROUPS)
+        return query, values
+
+    def _cache_key(self, table: TableName, user_id: str, query: str, values: list[Any]) -> tuple[Any, ...]:
+        """Key of a read in the result cache.
+
+        The exact SQL and parameters (which include the user) plus the
+        write generation of the user's table, so any insert by the user
+        invalidates their entries for it.
+        """
+        return (table, self._generations.get(table, user_id), query, tuple(values))
+
+    def _invalidate(self, table: TableName, user_id: str | None) -> None:
+        self._generations.bump(table, user_id)
+
+    def _build_conditions(
+        self,
+        user_id: str,
+        table: TableName,
+        filters: dict[str, Any] | None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        amount_min: float | None = None,
+        amount_max: float | None = None,
+    ) -> tuple[list[str], list[Any]]:
+        """Build WHERE conditions and their values.
+
+        The first condition always restricts the rows to ``user_id``, which
+        also limits the scan to the user's partition.
+
+        Args:
+            user_id: Owner of the rows.
+            table: Target table name.
+            filters: Equality filters; unknown columns are ignored.
+            date_from: Inclusive lower bound on created_at.
+            date_to: Inclusive upper bound (whole day) on created_at.
+            amount_min: Inclusive lower bound on amount.
+            amount_max: Inclusive upper bound on amount.
+
+        Returns:
+            SQL conditions and the matching parameter values.
+        """
+        conditions = ["user_id = %s"]
+        values: list[Any] = [user_id]
 
         if filters:
-            # Build WHERE clause with valid fields only
-            valid_filters = {
-                k: v for k, v in filters.items()
-                if k in self.TABLE_FIELDS[table] + ["id", "created_at"] and v is not None
-            }
-
-            if valid_filters:
-                conditions = [f"{col} = %s" for col in valid_filters.keys()]
-                query += f" WHERE {' AND '.join(conditions)}"
-                values = list(valid_filters.values())
-
-        query += f" ORDER BY created_at DESC LIMIT %s"
-        values.append(limit)
+            valid_fields = self.TABLE_FIELDS[table] + ["id", "created_at"]
+            for col, value in filters.items():
+                if col in valid_fields and value is not None:
+                    conditions.append(f"{col} = %s")
+                    values.append(value)
+
+        if date_from is not None:
+            conditions.append("created_at >= %s")
+            values.append(date_from)
+
+        if date_to is not None:
+            conditions.append("created_at < %s")
+            values.append(date_to + timedelta(days=1))
+
+        if amount_min is not None:
+            conditions.append("amount >= %s")
+            values.append(amount_min)
+
+        if amount_max is not None:
+            conditions.append("amount <= %s")
+            values.append(amount_max)
+
+        return conditions, values
+
+    @classmethod
+    def _typed_columns(cls, description: Sequence[Any]) -> list[tuple[int, Callable[[Any], Any]]]:
+        """Positions and converters of the columns that need converting."""
+        return [
+            (index, cls.COLUMN_CONVERTERS[column.type_code])
+            for index, column in enumerate(description)
+            if column.type_code in cls.COLUMN_CONVERTERS
+        ]
+
+    @classmethod
+    def _columns_converter(
+        cls, description: Sequence[Any]
+    ) -> Callable[[list[tuple[Any, ...]]], list[Sequence[Any]]]:
+        """Build a converter from plain cursor rows to converted column lists.
+
+        The converter of each column is chosen once from the cursor
+        description (type OIDs) and applied column by column, instead of
+        inspecting every value as ``_serialize_record`` does.
+        """
+        typed = cls._typed_columns(description)
+        width = len(description)
+
+        def convert(rows: list[tuple[Any, ...]]) -> list[Sequence[Any]]:
+            if not rows:
+                return [[] for _ in range(width)]
+            columns: list[Sequence[Any]] = list(zip(*rows))
+            for index, converter in typed:
+                columns[index] = [None if value is None else converter(value) for value in columns[index]]
+            return columns
+
+        return convert
+
+    @classmethod
+    def _records_converter(
+        cls, description: Sequence[Any]
+    ) -> Callable[[list[tuple[Any, ...]]], list[dict[str, Any]]]:
+        """Build a converter from plain cursor rows to serialized records.
+
+        Builds every dict first and then converts the typed columns in
+        place, which is cheaper than transposing for dict output.
+        """
+        names = [column.name for column in description]
+        typed = [(names[index], converter) for index, converter in cls._typed_columns(description)]
+
+        def convert(rows: list[tuple[Any, ...]]) -> list[dict[str, Any]]:
+            records = [dict(zip(names, row)) for row in rows]
+            for name, converter in typed:
+                for record in records:
+                    value = record[name]
+                    if value is not None:
+                        record[name] = converter(value)
+            return records
 
-        with self._db.get_cursor() as cursor:
-            cursor.execute(query, values)
-            results = cursor.fetchall()
-            return [self._serialize_record(dict(row)) for row in results]
+        return convert
+
+    @classmethod
+    def _tuples_converter(
+        cls, description: Sequence[Any]
+    ) -> Callable[[list[tuple[Any, ...]]], list[tuple[Any, ...]]]:
+        """Like ``_records_converter`` but keeping rows as value tuples."""
+        if not cls._typed_columns(description):
+            return lambda rows: rows
+        to_columns = cls._columns_converter(description)
+        return lambda rows: list(zip(*to_columns(rows)))
 
     def _serialize_record(self, record: dict[str, Any]) -> dict[str, Any]:
         """Serialize a database record for JSON compatibility.
@@ -126,3 +560,313 @@ class FinancialRepository:
             else:
                 serialized[key] = value
         return serialized
+
+
+class FinancialRepository(BaseFinancialRepository):
+    """Repository for financial data operations."""
+
+    def __init__(
+        self,
+        db_connection: DatabaseConnection,
+        cache: TTLCache | None = None,
+        generations: TableGenerations | None = None,
+    ):
+        """Initialize repository with database connection.
+
+        Args:
+            db_connection: Database connection manager instance.
+            cache: Read-through cache for query results. Built from settings
+                when not provided (unless QUERY_CACHE_ENABLED is false).
+            generations: Write counters keying the cache, to share the
+                invalidation of another repository.
+        """
+        super().__init__(cache, generations)
+        self._db = db_connection
+        self._export_ids = itertools.count(1)
+
+    def insert(self, user_id: str, table: TableName, data: dict[str, Any]) -> dict[str, Any]:
+        """Insert a record into the specified table.
+
+        Args:
+            user_id: Owner of the record.
+            table: Target table name.
+            data: Record data to insert.
+
+        Returns:
+            The inserted record with generated fields.
+
+        Raises:
+            ValueError: If table is invalid or required fields are missing.
+        """
+        query, values = self._insert_statement(user_id, table, data)
+
+        with span("db.insert", "db", table=table.value), self._db.get_cursor() as cursor:
+            self._db.execute(cursor, query, values)
+            result = cursor.fetchone()
+
+        self._invalidate(table, user_id)
+        return self._serialize_record(dict(result))
+
+    def insert_many(
+        self, user_id: str, records: list[tuple[TableName, dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        """Insert several records, possibly into different tables, atomically.
+
+        All rows are written in one transaction with a single multi-row
+        INSERT per table, so either every record is created or none is.
+
+        Args:
+            user_id: Owner of the records.
+            records: ``(table, data)`` pairs, as for ``insert``.
+
+        Returns:
+            The inserted records with generated fields, in input order.
+
+        Raises:
+            ValueError: If a table is invalid or a record has no valid data.
+        """
+        by_table = self._group_by_table(records)
+
+        inserted: list[dict[str, Any] | None] = [None] * len(records)
+        with span("db.insert_many", "db", rows=len(records)), self._db.get_cursor() as cursor:
+            for table, rows in by_table.items():
+                query = f"""
+                    INSERT INTO {table.value} (user_id, {', '.join(self.TABLE_FIELDS[table])})
+                    VALUES %s
+                    RETURNING {', '.join(self.record_columns(table))}
+                """
+                returned = execute_values(
+                    cursor, query, [[user_id, *values] for _, values in rows], page_size=len(rows), fetch=True
+                )
+                # ids come from the sequence in VALUES order; sorting maps them back
+                returned.sort(key=lambda row: row["id"])
+                for (position, _), row in zip(rows, returned):
+                    inserted[position] = self._serialize_record(dict(row))
+
+        for table in by_table:
+            self._invalidate(table, user_id)
+        return [record for record in inserted if record is not None]
+
+    def copy_records(
+        self, user_id: str, table: TableName, records: Iterable[dict[str, Any]], chunk_size: int = 5000
+    ) -> int:
+        """Bulk load records with COPY in a single transaction.
+
+        Records are consumed lazily and sent in chunks of ``chunk_size``, so
+        memory use does not depend on how many there are. Records must
+        already be validated; a missing ``created_at`` gets the load time.
+
+        Args:
+            user_id: Owner of the records.
+            table: Target table name.
+            records: Iterable of dicts keyed by the table fields (and
+                optionally ``created_at``).
+            chunk_size: Rows buffered per COPY statement.
+
+        Returns:
+            Number of rows loaded.
+        """
+        fields = self.TABLE_FIELDS.get(table)
+        if not fields:
+            raise ValueError(f"Invalid table: {table}")
+
+        columns = ["user_id", *fields, "created_at"]
+        statement = f"COPY {table.value} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        loaded_at = datetime.now()
+        total = 0
+
+        with span("db.copy", "db", table=table.value), self._db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                iterator = iter(records)
+                while chunk := list(itertools.islice(iterator, chunk_size)):
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    for record in chunk:
+                        # None is written unquoted, which COPY csv reads as NULL
+                        writer.writerow(
+                            [user_id, *(record.get(field) for field in fields), record.get("created_at") or loaded_at]
+                        )
+                    buffer.seek(0)
+                    cursor.copy_expert(statement, buffer)
+                    total += len(chunk)
+
+        self._invalidate(table, user_id)
+        return total
+
+    def query(
+        self,
+        user_id: str,
+        table: TableName,
+        filters: dict[str, Any] | None = None,
+        limit: int = 100,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        amount_min: float | None = None,
+        amount_max: float | None = None,
+        cursor: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Query records from the specified table, newest first.
+
+        Args:
+            user_id: Owner of the records.
+            table: Target table name.
+            filters: Optional filters to apply (column: value).
+            limit: Maximum number of records to return.
+            date_from: Only records created on or after this date.
+            date_to: Only records created on or before this date.
+            amount_min: Only records with at least this amount.
+            amount_max: Only records with at most this amount.
+            cursor: Keyset cursor from encode_cursor to continue after a previous page.
+
+        Returns:
+            List of matching records.
+
+        Raises:
+            ValueError: If table or cursor is invalid.
+        """
+        query, values = self._query_statement(
+            user_id, table, filters, limit, date_from, date_to, amount_min, amount_max, cursor
+        )
+        return self._fetch_all("query", table, user_id, query, values)
+
+    def iter_records(
+        self,
+        user_id: str,
+        table: TableName,
+        filters: dict[str, Any] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        batch_size: int = 1000,
+        shape: str = "records",
+    ) -> Iterator[Any]:
+        """Stream every matching record, oldest first, in batches.
+
+        Rows are read through a named (server-side) cursor, so only one
+        batch is held in memory. The pooled connection stays checked out
+        until the iterator is exhausted or closed, and the results bypass
+        the query cache.
+
+        Args:
+            user_id: Owner of the records.
+            table: Table to export.
+            filters: Equality filters on the table fields.
+            date_from: Only records created on or after this date.
+            date_to: Only records created on or before this date (inclusive).
+            batch_size: Rows fetched per round-trip.
+            shape: ``records`` (list of dicts), ``tuples`` (list of value
+                tuples) or ``columns`` (dict of column name to values list).
+                Columns are ordered as ``record_columns(table)``.
+
+        Yields:
+            One batch of up to ``batch_size`` converted rows per fetch.
+        """
+        if table not in self.TABLE_FIELDS:
+            raise ValueError(f"Invalid table: {table}")
+        if shape not in self.RESULT_SHAPES:
+            raise ValueError(f"Invalid shape: {shape}. Use one of {', '.join(self.RESULT_SHAPES)}")
+
+        conditions, values = self._build_conditions(user_id, table, filters, date_from, date_to)
+        query = f"SELECT {', '.join(self.record_columns(table))} FROM {table.value}"
+        query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at, id"
+
+        with self._db.get_connection() as conn:
+            with conn.cursor(name=f"export_{next(self._export_ids)}") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(query, values)
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                # Named cursors only describe the result after the first fetch
+                names = [column.name for column in cursor.description]
+                if shape == "records":
+                    convert_rows = self._records_converter(cursor.description)
+                elif shape == "tuples":
+                    convert_rows = self._tuples_converter(cursor.description)
+                else:
+                    to_columns = self._columns_converter(cursor.description)
+                    convert_rows = lambda batch: dict(zip(names, map(list, to_columns(batch))))  # noqa: E731
+
+                while rows:
+                    yield convert_rows(rows)
+                    rows = cursor.fetchmany(batch_size)
+
+    def aggregate(
+        self,
+        user_id: str,
+        table: TableName,
+        metrics: list[str] | None = None,
+        group_by: str | None = None,
+        period: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Compute SUM/COUNT/AVG/MIN/MAX of amounts in the database.
+
+        Args:
+            user_id: Owner of the records.
+            table: Target table name.
+            metrics: Metrics to compute (see AGGREGATE_METRICS). Defaults to sum and count.
+            group_by: Group by the table's category/goal/asset_type column.
+            period: Group by day, week or month of created_at.
+            date_from: Only records created on or after this date.
+            date_to: Only records created on or before this date.
+            filters: Optional equality filters (column: value).
+
+        Returns:
+            One row per group with the requested metrics.
+
+        Raises:
+            ValueError: If table, metric, grouping column or period is invalid.
+        """
+        operation, query, values = self._aggregate_statement(
+            user_id, table, metrics, group_by, period, date_from, date_to, filters
+        )
+        return self._fetch_all(operation, table, user_id, query, values)
+
+    def rebuild_rollups(self, table: TableName) -> int:
+        """Recompute a table's monthly rollup from its rows.
+
+        The triggers keep rollups current on their own; this is for repair
+        (e.g. after restoring the table with triggers disabled). Writes to
+        the table wait until the rebuild commits.
+
+        Args:
+            table: Table whose ``<table>_monthly`` rollup is rebuilt.
+
+        Returns:
+            Number of (user, month, group) rows in the rebuilt rollup.
+        """
+        if table not in self.TABLE_FIELDS:
+            raise ValueError(f"Invalid table: {table}")
+
+        with span("db.rebuild_rollups", "db", table=table.value), self._db.get_cursor() as cursor:
+            cursor.execute(rollup_rebuild_sql(table.value))
+            cursor.execute(f"SELECT COUNT(*) AS groups FROM {table.value}_monthly")
+            groups = cursor.fetchone()["groups"]
+
+        self._invalidate(table, None)
+        return groups
+
+    def _fetch_all(
+        self, operation: str, table: TableName, user_id: str, query: str, values: list[Any]
+    ) -> list[dict[str, Any]]:
+        """Run a read query through the result cache (see ``_cache_key``)."""
+
+        def load() -> list[dict[str, Any]]:
+            with span(f"db.{operation}", "db", table=table.value), self._db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    if operation == "query":
+                        self._db.execute(cursor, query, values)
+                    else:
+                        # Aggregates are planned per call: their date range decides
+                        # between rollup, index and sequential scans
+                        cursor.execute(query, values)
+                    return self._records_converter(cursor.description)(cursor.fetchall())
+
+        if self._cache is None:
+            return load()
+
+        return self._cache.get_or_load(self._cache_key(table, user_id, query, values), load)
+
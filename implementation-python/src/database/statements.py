@@ -0,0 +1,103 @@
+"""Server-side prepared statements for the repository's repeated queries."""
+
+import hashlib
+import threading
+import weakref
+from typing import Any, Sequence
+
+from psycopg2.extensions import connection as PgConnection
+from psycopg2.extensions import cursor as PgCursor
+
+# Startup options for connections running the registry's statements. Left on
+# "auto", PostgreSQL keeps re-planning them: a ``LIMIT $n`` generic plan is
+# costed for 10% of the table, so it never looks as cheap as the custom ones.
+# The prepared shapes are ordered index scans whose plan doesn't depend on the
+# parameters, and only prepared statements are affected by this setting.
+GENERIC_PLAN_OPTIONS = "-c plan_cache_mode=force_generic_plan"
+
+
+class StatementRegistry:
+    """Prepares each distinct SQL shape once per connection and runs it by name.
+
+    The repository builds a handful of statement shapes (table x column set
+    x filter set) whose text only varies with those choices, so the shape
+    is identified by the SQL text itself. The first time a connection sees
+    a shape it is sent as ``PREPARE``; afterwards only ``EXECUTE name(...)``
+    travels, and PostgreSQL skips parsing and, on connections opened with
+    ``GENERIC_PLAN_OPTIONS``, planning.
+
+    Prepared statements live as long as the session, which the pool keeps
+    open, so the per-connection bookkeeping holds only weak references.
+    """
+
+    def __init__(self, max_per_connection: int = 256):
+        """Initialize the registry.
+
+        Args:
+            max_per_connection: Statements kept prepared on one connection.
+                Reaching it deallocates them all, which bounds server memory
+                if shapes keep appearing (e.g. many aggregate combinations).
+        """
+        self._max_per_connection = max_per_connection
+        self._prepared: weakref.WeakKeyDictionary[PgConnection, set[str]] = weakref.WeakKeyDictionary()
+        self._names: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self._prepares = 0
+        self._executions = 0
+        self._resets = 0
+
+    @staticmethod
+    def statement_name(query: str) -> str:
+        """Stable name of a query shape."""
+        return "stmt_" + hashlib.sha1(query.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def numbered(query: str) -> str:
+        """Turn the ``%s`` placeholders of a query into ``$1, $2, ...``."""
+        parts = query.split("%s")
+        return "".join(
+            part + (f"${index}" if index < len(parts) else "") for index, part in enumerate(parts, start=1)
+        )
+
+    def execute(self, cursor: PgCursor, query: str, values: Sequence[Any]) -> None:
+        """Run ``query`` with ``values`` on ``cursor`` through a prepared statement.
+
+        Must be called with a connection that is checked out by the caller,
+        as the pool guarantees; results are read from ``cursor`` as usual.
+        """
+        conn = cursor.connection
+        with self._lock:
+            name = self._names.get(query)
+            if name is None:
+                name = self._names[query] = self.statement_name(query)
+            prepared = self._prepared.setdefault(conn, set())
+
+        if name not in prepared:
+            if len(prepared) >= self._max_per_connection:
+                cursor.execute("DEALLOCATE ALL")
+                prepared.clear()
+                with self._lock:
+                    self._resets += 1
+            cursor.execute(f"PREPARE {name} AS {self.numbered(query)}")
+            prepared.add(name)
+            with self._lock:
+                self._prepares += 1
+
+        if values:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(values))})", values)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+        with self._lock:
+            self._executions += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return prepare/execute counters."""
+        with self._lock:
+            return {
+                "shapes": len(self._names),
+                "connections": len(self._prepared),
+                "prepares": self._prepares,
+                "executions": self._executions,
+                "resets": self._resets,
+            }
@@ -0,0 +1,7 @@
+"""Tracing spans and runtime metrics."""
+
+from src.observability.metrics import REGISTRY, MetricsRegistry
+from src.observability.sinks import JsonlTraceSink, TraceSink
+from src.observability.spans import Span, span
+
+__all__ = ["REGISTRY", "JsonlTraceSink", "MetricsRegistry", "Span", "TraceSink", "span"]
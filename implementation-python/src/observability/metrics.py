@@ -0,0 +1,229 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Histograms are fed from finished spans (see ``record_span``), so the agent,
+tool and database code only pay for a bisect and a locked increment per
+operation. Runtime state that already lives elsewhere (pool, sessions,
+caches) is not mirrored here; the ``/metrics`` route passes it to
+``render`` as extra families at scrape time.
+"""
+
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from src.observability.spans import Span
+
+# (name, type, help, [(labels, value), ...])
+MetricFamily = tuple[str, str, str, list[tuple[dict[str, str], float]]]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    TYPE = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def _check(self, labels: tuple[str, ...]) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+
+    @abstractmethod
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Exposition lines as (sample name, labels, value)."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._check(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values (seconds) per label set."""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self._bounds = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last one is +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        self._check(labels)
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [[0] * (len(self._bounds) + 1), 0.0, 0]
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            snapshot = [(key, list(series[0]), series[1], series[2]) for key, series in self._series.items()]
+
+        result: list[tuple[str, dict[str, str], float]] = []
+        for key, buckets, total, count in snapshot:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self._bounds + (float("inf"),), buckets):
+                cumulative += bucket_count
+                result.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            result.append((f"{self.name}_sum", labels, total))
+            result.append((f"{self.name}_count", labels, count))
+        return result
+
+
+class MetricsRegistry:
+    """Owns the process metrics and renders them for scraping."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self, extra: Iterable[MetricFamily] = ()) -> str:
+        """Render all metrics, plus ``extra`` families, in text format 0.0.4."""
+        lines: list[str] = []
+        with self._lock:
+            metrics = list(self._metrics)
+
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, metric_type, help_text, samples in extra:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+CHAT_DURATION = REGISTRY.histogram(
+    "financial_agent_chat_duration_seconds", "Duration of a chat turn.", ("mode",)
+)
+LLM_DURATION = REGISTRY.histogram(
+    "financial_agent_llm_request_duration_seconds", "Duration of an LLM completion call.", ("model",)
+)
+TOOL_DURATION = REGISTRY.histogram(
+    "financial_agent_tool_duration_seconds", "Duration of a tool execution.", ("tool",)
+)
+DB_DURATION = REGISTRY.histogram(
+    "financial_agent_db_query_duration_seconds",
+    "Duration of a database query (cache misses only).",
+    ("operation", "table"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+AGENT_ITERATIONS = REGISTRY.counter(
+    "financial_agent_iterations_total", "Agent loop iterations (one LLM request each)."
+)
+MAX_ITERATIONS_REACHED = REGISTRY.counter(
+    "financial_agent_max_iterations_reached_total", "Chat turns aborted at the iteration limit."
+)
+FAST_PATH_TURNS = REGISTRY.counter(
+    "financial_agent_fast_path_total",
+    "Chat turns checked by the insert fast path, by outcome (hit, miss, fallback).",
+    ("outcome",),
+)
+LLM_CALLS_SKIPPED = REGISTRY.counter(
+    "financial_agent_llm_calls_skipped_total",
+    "Follow-up LLM calls replaced by a templated reply, by reason.",
+    ("reason",),
+)
+TOOL_ERRORS = REGISTRY.counter(
+    "financial_agent_tool_errors_total", "Tool executions that failed or timed out.", ("tool",)
+)
+
+
+def record_span(span: "Span") -> None:
+    """Feed a finished span into the latency histograms."""
+    seconds = (span.duration_ms or 0.0) / 1000
+    attributes = span.attributes
+
+    if span.kind == "turn":
+        CHAT_DURATION.observe(seconds, str(attributes.get("mode", "")))
+    elif span.kind == "llm":
+        LLM_DURATION.observe(seconds, str(attributes.get("model", "")))
+    elif span.kind == "tool":
+        tool = str(attributes.get("tool", span.name))
+        TOOL_DURATION.observe(seconds, tool)
+        if span.status == "error" or attributes.get("success") is False or attributes.get("timed_out"):
+            TOOL_ERRORS.inc(tool)
+    elif span.kind == "db":
+        operation = span.name.split(".", 1)[-1]
+        DB_DURATION.observe(seconds, operation, str(attributes.get("table", "")))
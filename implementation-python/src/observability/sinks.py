@@ -0,0 +1,81 @@
+"""Trace sinks that persist tracer entries off the request path."""
+
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Protocol
+
+
+class TraceSink(Protocol):
+    """Receives every stored trace entry; must not block the caller."""
+
+    def emit(self, entry: dict[str, Any]) -> None:
+        ...
+
+
+_STOP = object()
+
+
+class JsonlTraceSink:
+    """Append trace entries to a JSON Lines file from a background thread.
+
+    ``emit`` only enqueues the entry; serialization and file I/O happen in
+    the writer thread. When the queue is full the entry is dropped (and
+    counted) instead of making the chat wait on the disk.
+    """
+
+    def __init__(self, path: str | Path, max_queue: int = 10000):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="trace-sink", daemon=True)
+        self._thread.start()
+
+    def emit(self, entry: dict[str, Any]) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def _run(self) -> None:
+        with self._path.open("a", encoding="utf-8") as file:
+            while True:
+                entry = self._queue.get()
+                if entry is _STOP:
+                    break
+                try:
+                    file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+                except (TypeError, ValueError):
+                    with self._lock:
+                        self._dropped += 1
+                    continue
+                with self._lock:
+                    self._written += 1
+                # Flush once the backlog is drained rather than per line
+                if self._queue.empty():
+                    file.flush()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out the queued entries and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "path": str(self._path),
+                "queued": self._queue.qsize(),
+                "written": self._written,
+                "dropped": self._dropped,
+            }
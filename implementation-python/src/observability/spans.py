@@ -0,0 +1,99 @@
+"""Span primitives shared by the agent tracer and the instrumented layers.
+
+Kept outside ``src.agent`` so the database layer can open spans without
+importing the agent package.
+"""
+
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Generator, Protocol
+
+from src.observability.metrics import record_span
+
+
+class Span:
+    """A timed operation (chat turn, LLM call, tool execution, DB query)."""
+
+    __slots__ = (
+        "span_id", "parent_id", "root_id", "name", "kind",
+        "attributes", "started_at", "start", "duration_ms", "status",
+    )
+
+    def __init__(self, span_id: int, parent: "Span | None", name: str, kind: str, attributes: dict[str, Any]):
+        self.span_id = span_id
+        self.parent_id = parent.span_id if parent else None
+        self.root_id = parent.root_id if parent else span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.started_at = datetime.now().isoformat()
+        self.start = time.perf_counter()
+        self.duration_ms: float | None = None
+        self.status = "ok"
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_usage(self, usage: dict[str, Any] | None) -> None:
+        """Record token usage from a litellm response ``usage`` block."""
+        if usage:
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                if usage.get(key) is not None:
+                    self.attributes[key] = usage[key]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.started_at,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanRecorder(Protocol):
+    """Records spans (implemented by AgentTracer)."""
+
+    def span(self, name: str, kind: str, **attributes: Any) -> Any:
+        ...
+
+
+# The recorder and span active in the current thread / asyncio task, so code
+# without a tracer reference (repository, tools) can nest spans under a turn.
+current_tracer: ContextVar[SpanRecorder | None] = ContextVar("current_tracer", default=None)
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+_span_ids = itertools.count(1)
+
+
+def next_span_id() -> int:
+    return next(_span_ids)
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes: Any) -> Generator[Span, None, None]:
+    """Time a block as a child of the active span.
+
+    Outside of a traced chat turn the span is measured but not recorded.
+    """
+    tracer = current_tracer.get()
+    if tracer is not None:
+        with tracer.span(name, kind, **attributes) as active:
+            yield active
+        return
+
+    detached = Span(next_span_id(), None, name, kind, attributes)
+    try:
+        yield detached
+    except BaseException:
+        detached.status = "error"
+        raise
+    finally:
+        detached.duration_ms = (time.perf_counter() - detached.start) * 1000
+        record_span(detached)
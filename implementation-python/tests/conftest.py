@@ -0,0 +1,39 @@
+import uuid
+
+import psycopg2
+import pytest
+
+from src.config import get_settings
+from src.database import DatabaseConnection
+from src.schemas import TableName
+
+
+@pytest.fixture(scope="session")
+def database_url() -> str:
+    """URL of the configured PostgreSQL; tests needing it are skipped without one."""
+    url = get_settings().database_url
+    try:
+        psycopg2.connect(url, connect_timeout=2).close()
+    except psycopg2.OperationalError:
+        pytest.skip("PostgreSQL is not available")
+    return url
+
+
+@pytest.fixture(scope="session")
+def db(database_url: str):
+    db = DatabaseConnection(database_url)
+    db.initialize_schema()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def user_id(db: DatabaseConnection):
+    """A user of its own for the test, whose rows are deleted afterwards."""
+    user = f"test-{uuid.uuid4().hex[:12]}"
+    yield user
+    with db.get_cursor() as cursor:
+        for table in TableName:
+            cursor.execute(f"DELETE FROM {table.value} WHERE user_id = %s", (user,))
+        cursor.execute("DELETE FROM conversation_messages WHERE user_id = %s", (user,))
+        cursor.execute("DELETE FROM conversations WHERE user_id = %s", (user,))
@@ -0,0 +1,163 @@
+import json
+from datetime import date
+
+from src.agent import FinancialAgent, InMemoryConversationStore, LLMClient, ToolRegistry
+
+
+class ScriptedClient:
+    """LLM client answering with queued responses and recording each request."""
+
+    model = "test-model"
+    extract_response = LLMClient.extract_response
+
+    def __init__(self, *responses: dict):
+        self.responses = list(responses)
+        self.requests: list[list[dict]] = []
+
+    def chat_completion(self, messages: list[dict], tools: list[dict]) -> dict:
+        self.requests.append([dict(message) for message in messages])
+        return self.responses.pop(0)
+
+
+def answer(content: str) -> dict:
+    return {"choices": [{"message": {"content": content}, "finish_reason": "stop"}]}
+
+
+def tool_call(name: str, arguments: dict, call_id: str = "call_1") -> dict:
+    call = {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+    return {"choices": [{"message": {"content": None, "tool_calls": [call]}, "finish_reason": "tool_calls"}]}
+
+
+def make_agent(client: ScriptedClient, store=None, **kwargs) -> FinancialAgent:
+    registry = ToolRegistry(repository=None, max_concurrency=2, timeout_seconds=1)
+    registry._tools["insert_record"] = lambda user_id, table, amount, category=None, **rest: {
+        "success": True,
+        "record": {"id": 1, "amount": float(amount), "category": category},
+    }
+    kwargs.setdefault("fast_path", False)
+    return FinancialAgent(client, registry, session_id="s", conversation_store=store, **kwargs)
+
+
+def contents(messages: list[dict]) -> list[str]:
+    return [message.get("content") for message in messages if message["role"] in ("user", "assistant")]
+
+
+def test_skip_after_writes_answers_a_write_only_turn_without_a_second_call():
+    client = ScriptedClient(
+        tool_call("insert_record", {"table": "expenses", "amount": 12, "category": "comida"})
+    )
+    agent = make_agent(client, completion_policy="skip_after_writes")
+
+    reply = agent.chat("gasté 12 en comida")
+
+    assert reply == "He registrado un gasto de 12.00 en comida."
+    assert len(client.requests) == 1
+
+
+def test_always_model_asks_the_model_after_the_writes():
+    client = ScriptedClient(
+        tool_call("insert_record", {"table": "expenses", "amount": 12, "category": "comida"}),
+        answer("Hecho."),
+    )
+    agent = make_agent(client, completion_policy="always_model")
+
+    assert agent.chat("gasté 12 en comida") == "Hecho."
+    assert len(client.requests) == 2
+
+
+def test_agent_catches_up_with_turns_saved_by_another_agent():
+    store = InMemoryConversationStore()
+    first = make_agent(ScriptedClient(answer("uno")), store)
+    second_client = ScriptedClient(answer("dos"))
+    second = make_agent(second_client, store)
+
+    first.chat("hola")
+    second.chat("sigue")
+
+    assert contents(second_client.requests[0]) == ["hola", "uno", "sigue"]
+
+
+def test_new_agent_resumes_only_the_latest_window_from_a_user_message():
+    store = InMemoryConversationStore()
+    writer = make_agent(ScriptedClient(answer("r1"), answer("r2"), answer("r3")), store)
+    for message in ("m1", "m2", "m3"):
+        writer.chat(message)
+
+    client = ScriptedClient(answer("r4"))
+    reader = make_agent(client, store)
+    # A 3-message window starts at "r2"; the partial turn before "m3" is skipped
+    reader._resume_messages = 3
+    reader.chat("m4")
+
+    assert contents(client.requests[0]) == ["m3", "r3", "m4"]
+
+
+def test_reset_elsewhere_drops_the_old_history():
+    store = InMemoryConversationStore()
+    first = make_agent(ScriptedClient(answer("uno")), store)
+    second_client = ScriptedClient(answer("dos"), answer("tres"))
+    second = make_agent(second_client, store)
+    first.chat("hola")
+    second.chat("sigue")
+
+    first.reset_conversation()
+    second.chat("otra vez")
+
+    assert contents(second_client.requests[1]) == ["otra vez"]
+
+
+class FlakyStore(InMemoryConversationStore):
+    """Store whose next ``fail_appends`` appends fail."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail_appends = 0
+
+    def append(self, user_id: str, session_id: str, messages: list[dict]) -> list[int]:
+        if self.fail_appends:
+            self.fail_appends -= 1
+            raise ConnectionError("store unavailable")
+        return super().append(user_id, session_id, messages)
+
+
+def test_unsaved_messages_survive_a_restore_and_are_saved_later():
+    store = FlakyStore()
+    first_client = ScriptedClient(answer("uno"), answer("dos"), answer("cuatro"))
+    first = make_agent(first_client, store)
+    second = make_agent(ScriptedClient(answer("tres")), store)
+    first.chat("hola")
+
+    store.fail_appends = 1
+    first.chat("pendiente")
+    # Reset elsewhere: the next turn of ``first`` restores from a new epoch
+    second.reset_conversation()
+    second.chat("otra")
+    first.chat("sigue")
+
+    assert contents(first_client.requests[2]) == ["otra", "tres", "pendiente", "dos", "sigue"]
+    _, stored = store.load("default", "s", epoch=1, after=0, limit=10)
+    assert [message["content"] for _, message in stored] == [
+        "otra", "tres", "pendiente", "dos", "sigue", "cuatro"
+    ]
+
+
+def test_system_prompt_date_follows_the_calendar(monkeypatch):
+    today = date(2024, 3, 31)
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls) -> date:
+            return today
+
+    monkeypatch.setattr("src.agent.agent.date", FakeDate)
+    client = ScriptedClient(answer("uno"), answer("dos"))
+    agent = make_agent(client)
+
+    agent.chat("hola")
+    today = date(2024, 4, 1)
+    agent.chat("sigue")
+
+    assert [request[0]["content"].splitlines()[-1] for request in client.requests] == [
+        "Fecha actual: 2024-03-31",
+        "Fecha actual: 2024-04-01",
+    ]
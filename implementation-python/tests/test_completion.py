@@ -0,0 +1,47 @@
+import pytest
+
+from src.agent.completion import asks_for_more, write_only_reply
+
+INSERT = ("insert_record", {"table": "expenses", "amount": 12, "category": "comida"})
+INSERTED = {"success": True, "record": {"id": 1, "amount": 12.0, "category": "comida"}}
+
+
+def test_successful_writes_get_a_templated_reply():
+    calls = [
+        INSERT,
+        ("insert_records", {"records": [{"table": "savings", "amount": 50, "goal": "viaje"}]}),
+    ]
+    results = [INSERTED, {"success": True, "records": [{"id": 2, "amount": 50.0, "goal": "viaje"}]}]
+
+    reply = write_only_reply("gasté 12 en comida y ahorré 50 para el viaje", calls, results)
+
+    assert reply == "He registrado un gasto de 12.00 en comida. He registrado un ahorro de 50.00 para viaje."
+
+
+def test_reply_follows_the_language_of_the_message():
+    reply = write_only_reply("I spent 12 on food", [INSERT], [INSERTED])
+
+    assert reply == "Recorded an expense of 12.00 for comida."
+
+
+@pytest.mark.parametrize(
+    "message, calls, results",
+    [
+        # The user also asked for something
+        ("gasté 12 en comida, ¿cuánto llevo este mes?", [INSERT], [INSERTED]),
+        # A read among the calls
+        ("gasté 12 en comida", [INSERT, ("query_records", {})], [INSERTED, {"success": True}]),
+        # A failed write
+        ("gasté 12 en comida", [INSERT], [{"success": False, "error": "x"}]),
+        # A write whose outcome is unknown (timed out)
+        ("gasté 12 en comida", [INSERT], [{"success": None, "status": "unknown"}]),
+        ("gasté 12 en comida", [], []),
+    ],
+)
+def test_the_model_answers_anything_else(message, calls, results):
+    assert write_only_reply(message, calls, results) is None
+
+
+@pytest.mark.parametrize("message", ["¿qué gasté ayer?", "muéstrame el total", "show my savings"])
+def test_questions_ask_for_more(message):
+    assert asks_for_more(message)
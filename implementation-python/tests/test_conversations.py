@@ -0,0 +1,74 @@
+import pytest
+
+from src.agent.conversations import InMemoryConversationStore
+from src.database import PostgresConversationStore
+
+
+@pytest.fixture(params=["memory", "postgres"])
+def store(request):
+    if request.param == "memory":
+        return InMemoryConversationStore()
+    return PostgresConversationStore(request.getfixturevalue("db"))
+
+
+@pytest.fixture
+def key(request, store):
+    # The user_id fixture deletes the stored rows after the test
+    if isinstance(store, PostgresConversationStore):
+        return request.getfixturevalue("user_id"), "s"
+    return "u", "s"
+
+
+def messages(*contents: str) -> list[dict]:
+    return [{"role": "user", "content": content} for content in contents]
+
+
+def test_unknown_conversation_is_empty_at_epoch_zero(store, key):
+    assert store.load(*key, epoch=-1, after=0, limit=10) == (0, [])
+
+
+def test_load_returns_only_messages_after_the_callers_copy(store, key):
+    ids = store.append(*key, messages("a", "b", "c"))
+
+    epoch, stored = store.load(*key, epoch=0, after=ids[0], limit=10)
+
+    assert epoch == 0
+    assert stored == list(zip(ids[1:], messages("b", "c")))
+
+
+def test_load_is_limited_to_the_newest_messages(store, key):
+    ids = store.append(*key, messages("a", "b", "c", "d"))
+
+    _, stored = store.load(*key, epoch=0, after=0, limit=2)
+
+    assert stored == list(zip(ids[2:], messages("c", "d")))
+
+
+def test_clear_starts_a_new_epoch_and_ignores_the_old_position(store, key):
+    ids = store.append(*key, messages("a", "b"))
+    store.clear(*key)
+    new_ids = store.append(*key, messages("c"))
+
+    epoch, stored = store.load(*key, epoch=0, after=ids[-1], limit=10)
+
+    assert epoch == 1
+    assert stored == list(zip(new_ids, messages("c")))
+
+
+def test_conversations_are_scoped_to_user_and_session(store, key):
+    user_id, _ = key
+    store.append(user_id, "one", messages("a"))
+
+    assert store.load(user_id, "two", epoch=0, after=0, limit=10)[1] == []
+    assert store.load(f"{user_id}-other", "one", epoch=0, after=0, limit=10)[1] == []
+
+
+def test_messages_round_trip_unchanged(store, key):
+    message = {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{"id": "c1", "type": "function", "function": {"name": "x", "arguments": "{}"}}],
+    }
+    store.append(*key, [message])
+
+    assert store.load(*key, epoch=0, after=0, limit=10)[1][0][1] == message
@@ -0,0 +1,40 @@
+import pytest
+
+from src.agent.fast_path import parse_insert_intent
+from src.schemas import TableName
+
+
+@pytest.mark.parametrize(
+    "message, table, amount, label",
+    [
+        ("gasté 12 euros en comida", TableName.EXPENSES, 12.0, "comida"),
+        ("He gastado 7,5 € en el cine", TableName.EXPENSES, 7.5, "cine"),
+        ("ahorré 100 para vacaciones", TableName.SAVINGS, 100.0, "vacaciones"),
+        ("he invertido 500 en acciones", TableName.INVESTMENTS, 500.0, "acciones"),
+        ("I spent 12 on food", TableName.EXPENSES, 12.0, "food"),
+        ("gasté 20 en auto-escuela", TableName.EXPENSES, 20.0, "auto-escuela"),
+    ],
+)
+def test_plain_inserts_are_recognized(message, table, amount, label):
+    intent = parse_insert_intent(message)
+
+    assert intent is not None
+    assert (intent.table, intent.amount, intent.label) == (table, amount, label)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "gasté 12 en cena el lunes",
+        "gasté 12 en comida con amigos",
+        "gasté 30 en comida hace días",
+        "gasté 50 en regalo para mamá",
+        "gasté 12 en lunes",
+        "gasté 12 en comida y 5 en café",
+        "gasté 12 en comida ayer",
+        "spent 12 on food yesterday",
+        "¿cuánto gasté en comida?",
+    ],
+)
+def test_anything_beyond_a_plain_insert_falls_back_to_the_model(message):
+    assert parse_insert_intent(message) is None
@@ -0,0 +1,80 @@
+import json
+
+from src.agent.history import ConversationHistory
+
+MODEL = "test-model"
+
+
+def tool_turn(number: int, rows: int) -> list[dict]:
+    call_id = f"call_{number}"
+    records = [
+        {"id": i, "amount": 10.5, "category": "comida", "description": "cena con amigos"} for i in range(rows)
+    ]
+    content = json.dumps({"success": True, "records": records})
+    return [
+        {"role": "user", "content": f"lista mis gastos {number}"},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {"id": call_id, "type": "function", "function": {"name": "query_records", "arguments": "{}"}}
+            ],
+        },
+        {"role": "tool", "tool_call_id": call_id, "content": content},
+        {"role": "assistant", "content": f"Tienes {rows} gastos."},
+    ]
+
+
+def build(max_tokens: int, turns: list[list[dict]], keep_recent_turns: int = 1) -> ConversationHistory:
+    history = ConversationHistory(
+        "sistema", MODEL, max_tokens=max_tokens, keep_recent_turns=keep_recent_turns
+    )
+    for turn in turns:
+        for message in turn:
+            history.append(message)
+    return history
+
+
+def test_within_budget_nothing_changes():
+    history = build(100_000, [tool_turn(1, 20), tool_turn(2, 20)])
+
+    assert history.compact() is None
+    assert len(history) == 9
+
+
+def test_old_tool_results_are_summarized_before_dropping_turns():
+    turns = [tool_turn(1, 40), tool_turn(2, 2)]
+    full = build(100_000, turns)
+    old_tool_tokens = full._count_tokens(full.messages[3])
+
+    history = build(full.total_tokens - old_tool_tokens + 60, turns)
+    stats = history.compact()
+
+    assert stats["tool_results_summarized"] == 1
+    assert stats["messages_dropped"] == 0
+    summary = json.loads(history.messages[3]["content"])
+    assert summary == {"success": True, "records": "40 elementos omitidos", "compactado": True}
+    assert history.messages[3]["tool_call_id"] == "call_1"
+    # The recent turn is untouched
+    assert history.messages[7] == turns[1][2]
+
+
+def test_old_turns_are_dropped_whole_keeping_system_prompt_and_recent_turns():
+    turns = [tool_turn(1, 40), tool_turn(2, 40), tool_turn(3, 2)]
+    # Not even the recent turn fits: everything older goes, the recent turn stays
+    history = build(1, turns)
+
+    stats = history.compact()
+
+    assert stats["messages_dropped"] == 8
+    assert history.messages[0] == {"role": "system", "content": "sistema"}
+    assert history.messages[1:] == turns[2]
+
+
+def test_compaction_leaves_unsaved_messages_as_appended():
+    turns = [tool_turn(1, 40), tool_turn(2, 2)]
+    history = build(200, turns)
+
+    history.compact()
+
+    assert history.unsaved == [message for turn in turns for message in turn]
@@ -0,0 +1,52 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+
+from src.database.importer import RecordImporter
+from src.schemas import TableName
+
+
+class RecordingRepository:
+    def __init__(self):
+        self.records = []
+
+    def copy_records(self, user_id, table, records, chunk_size):
+        self.records = list(records)
+        return len(self.records)
+
+
+def test_amounts_the_column_cannot_store_are_rejected_per_row():
+    repository = RecordingRepository()
+    importer = RecordImporter(repository)
+    stream = io.StringIO(
+        "amount,category\n"
+        "12.505,comida\n"
+        "10000000000,casa\n"
+        "9999999999.995,casa\n"
+        "0.001,chicles\n"
+        "9999999999.99,casa\n"
+    )
+
+    report = importer.import_stream("u", TableName.EXPENSES, stream, "csv")
+
+    assert report["loaded"] == 2
+    assert [error["line"] for error in report["errors"]] == [3, 4, 5]
+    assert [record["amount"] for record in repository.records] == [Decimal("12.51"), Decimal("9999999999.99")]
+
+
+def test_timestamps_with_an_offset_are_stored_in_utc():
+    repository = RecordingRepository()
+    importer = RecordImporter(repository)
+    stream = io.StringIO(
+        '{"amount": 1, "category": "a", "created_at": "2024-01-31T23:30:00+02:00"}\n'
+        '{"amount": 1, "category": "a", "created_at": "2024-02-01T00:30:00Z"}\n'
+        '{"amount": 1, "category": "a", "date": "2024-02-01"}\n'
+    )
+
+    importer.import_stream("u", TableName.EXPENSES, stream, "jsonl")
+
+    assert [record["created_at"] for record in repository.records] == [
+        datetime(2024, 1, 31, 21, 30),
+        datetime(2024, 2, 1, 0, 30),
+        datetime(2024, 2, 1),
+    ]
@@ -0,0 +1,147 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.database import FinancialRepository
+from src.schemas import TableName
+
+EXPENSES = TableName.EXPENSES
+
+# Rows at month boundaries and inside partial edge months (2024 is a leap year)
+ROWS = [
+    (10.00, "comida", datetime(2024, 1, 1, 0, 0, 0)),
+    (20.00, "comida", datetime(2024, 1, 15, 12, 0, 0)),
+    (5.50, "ocio", datetime(2024, 1, 31, 23, 59, 59)),
+    (7.25, "comida", datetime(2024, 2, 1, 0, 0, 0)),
+    (100.00, "ocio", datetime(2024, 2, 29, 23, 59, 59)),
+    (3.00, "comida", datetime(2024, 3, 1, 0, 0, 0)),
+    (42.00, "ocio", datetime(2024, 3, 10, 8, 0, 0)),
+    (1.00, "comida", datetime(2024, 3, 11, 0, 0, 0)),
+    (60.00, "comida", datetime(2024, 4, 30, 23, 0, 0)),
+]
+
+RANGES = [
+    (None, None),
+    (date(2024, 1, 15), date(2024, 3, 10)),
+    (date(2024, 1, 1), date(2024, 2, 29)),
+    (date(2024, 1, 31), date(2024, 3, 1)),
+    (date(2024, 2, 1), None),
+    (None, date(2024, 3, 10)),
+]
+
+
+@pytest.fixture
+def repositories(db, user_id):
+    rollup = FinancialRepository(db)
+    scan = FinancialRepository(db)
+    scan._use_rollups = False
+    rollup.copy_records(
+        user_id,
+        EXPENSES,
+        [{"amount": amount, "category": category, "created_at": at} for amount, category, at in ROWS],
+    )
+    return rollup, scan
+
+
+def assert_same_rows(actual: list[dict], expected: list[dict]) -> None:
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got.keys() == want.keys()
+        for column, value in want.items():
+            assert got[column] == (pytest.approx(value) if isinstance(value, float) else value)
+
+
+@pytest.mark.parametrize("date_from, date_to", RANGES)
+@pytest.mark.parametrize("group_by, period", [(None, None), ("category", None), ("category", "month")])
+def test_rollup_aggregates_match_a_scan(repositories, user_id, date_from, date_to, group_by, period):
+    rollup, scan = repositories
+    metrics = ["sum", "count", "avg", "min", "max"]
+    arguments = dict(group_by=group_by, period=period, date_from=date_from, date_to=date_to)
+
+    operation, _, _ = rollup._aggregate_statement(
+        user_id, EXPENSES, metrics, group_by, period, date_from, date_to, None
+    )
+    assert operation == "aggregate_rollup"
+    assert_same_rows(
+        rollup.aggregate(user_id, EXPENSES, metrics, **arguments),
+        scan.aggregate(user_id, EXPENSES, metrics, **arguments),
+    )
+
+
+def test_range_within_one_month_is_scanned(repositories, user_id):
+    rollup, scan = repositories
+    date_from, date_to = date(2024, 3, 2), date(2024, 3, 20)
+
+    operation, _, _ = rollup._aggregate_statement(
+        user_id, EXPENSES, None, None, None, date_from, date_to, None
+    )
+
+    assert operation == "aggregate"
+    assert rollup.aggregate(user_id, EXPENSES, date_from=date_from, date_to=date_to) == [
+        {"sum": pytest.approx(43.0), "count": 2}
+    ]
+
+
+def test_rollup_follows_updates_and_deletes(repositories, db, user_id):
+    rollup, scan = repositories
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            "UPDATE expenses SET category = 'ocio', amount = amount * 2 WHERE user_id = %s AND amount = 20",
+            (user_id,),
+        )
+        cursor.execute("DELETE FROM expenses WHERE user_id = %s AND amount = 100", (user_id,))
+
+    arguments = dict(group_by="category", period="month")
+    metrics = ["sum", "count", "min", "max"]
+    assert_same_rows(
+        rollup.aggregate(user_id, EXPENSES, metrics, **arguments),
+        scan.aggregate(user_id, EXPENSES, metrics, **arguments),
+    )
+
+
+def test_keyset_pages_cover_every_record_once_newest_first(db, user_id):
+    repository = FinancialRepository(db)
+    # Several rows share a timestamp, so the cursor must also carry the id
+    tied = datetime(2024, 5, 1, 12, 0, 0)
+    repository.copy_records(
+        user_id,
+        EXPENSES,
+        [{"amount": n + 1, "category": "comida", "created_at": tied if n % 2 else datetime(2024, 5, n + 1)}
+         for n in range(7)],
+    )
+    everything = repository.query(user_id, EXPENSES, limit=100)
+
+    pages, cursor = [], None
+    while True:
+        page = repository.query(user_id, EXPENSES, limit=3, cursor=cursor)
+        if not page:
+            break
+        pages.append(page)
+        cursor = FinancialRepository.encode_cursor(page[-1])
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [record["id"] for page in pages for record in page] == [record["id"] for record in everything]
+    assert everything == sorted(everything, key=lambda r: (r["created_at"], r["id"]), reverse=True)
+
+
+def test_keyset_cursor_combines_with_filters(db, user_id):
+    repository = FinancialRepository(db)
+    repository.copy_records(
+        user_id,
+        EXPENSES,
+        [{"amount": n, "category": "ocio" if n % 2 else "comida", "created_at": datetime(2024, 6, n)}
+         for n in range(1, 7)],
+    )
+
+    first = repository.query(user_id, EXPENSES, filters={"category": "ocio"}, limit=2)
+    rest = repository.query(
+        user_id, EXPENSES, filters={"category": "ocio"}, limit=2,
+        cursor=FinancialRepository.encode_cursor(first[-1]),
+    )
+
+    assert [record["amount"] for record in first + rest] == [5.0, 3.0, 1.0]
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        FinancialRepository.decode_cursor("not-a-cursor")
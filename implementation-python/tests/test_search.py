@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agent import search
+from src.agent.search import DuckDuckGoBackend
+
+
+class FakeDDGS:
+    created = 0
+
+    def __init__(self) -> None:
+        FakeDDGS.created += 1
+
+    def text(self, query: str, max_results: int) -> list[dict]:
+        return [{"title": query, "href": "https://example.com", "body": ""}][:max_results]
+
+
+def test_clients_are_reused_across_threads_and_bounded(monkeypatch):
+    monkeypatch.setattr(search, "DDGS", FakeDDGS)
+    FakeDDGS.created = 0
+    backend = DuckDuckGoBackend(max_clients=2)
+
+    # Each batch runs on fresh threads, like execute_many
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda q: backend.search(q, 1), ["a", "b"]))
+
+    assert FakeDDGS.created <= 2
+    assert len(backend._idle) <= 2
+
+
+def test_close_drops_idle_clients(monkeypatch):
+    monkeypatch.setattr(search, "DDGS", FakeDDGS)
+    backend = DuckDuckGoBackend(max_clients=2)
+    assert backend.search("a", 1)[0]["title"] == "a"
+
+    backend.close()
+    backend.search("b", 1)
+
+    assert backend._idle == []
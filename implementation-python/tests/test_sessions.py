@@ -0,0 +1,75 @@
+import asyncio
+
+from src.agent.sessions import SessionStore
+
+
+def make_store(**kwargs) -> SessionStore:
+    return SessionStore(lambda user_id, session_id: object(), **kwargs)
+
+
+def test_sessions_are_scoped_to_their_user():
+    store = make_store()
+
+    async def main() -> None:
+        async with store.session("s", "alice") as alice:
+            pass
+        async with store.session("s", "bob") as bob:
+            pass
+        assert alice is not bob
+        assert store.peek("s", "alice") is alice
+        assert store.peek("s", "carol") is None
+
+    asyncio.run(main())
+
+
+def test_capacity_eviction_skips_a_session_in_use():
+    store = make_store(max_sessions=1)
+
+    async def main() -> None:
+        async with store.session("held") as held:
+            async with store.session("other"):
+                pass
+            # Over capacity, but the held session is the one in use
+            assert store.peek("held") is held
+        async with store.session("third"):
+            pass
+        assert store.peek("held") is None
+        assert store.peek("other") is None
+        assert len(store) == 1
+
+    asyncio.run(main())
+
+
+def test_idle_sessions_expire_unless_in_use():
+    store = make_store(ttl_seconds=0)
+
+    async def main() -> None:
+        async with store.session("held") as held:
+            async with store.session("other"):
+                pass
+            assert store.peek("held") is held
+        async with store.session("other"):
+            pass
+        assert store.peek("held") is None
+
+    asyncio.run(main())
+
+
+def test_requests_for_one_session_are_serialized():
+    store = make_store()
+    active = 0
+    overlap = False
+
+    async def request() -> None:
+        nonlocal active, overlap
+        async with store.session("s"):
+            active += 1
+            overlap = overlap or active > 1
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def main() -> None:
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    asyncio.run(main())
+    assert not overlap
@@ -0,0 +1,56 @@
+import pytest
+
+from src.database import ConnectionPool, DatabaseConnection, StatementRegistry
+from src.database.statements import GENERIC_PLAN_OPTIONS
+
+
+@pytest.fixture
+def registry_db(database_url):
+    statements = StatementRegistry(max_per_connection=2)
+    pool = ConnectionPool(database_url, min_size=0, max_size=1, connect_options=GENERIC_PLAN_OPTIONS)
+    db = DatabaseConnection(database_url, pool=pool, statements=statements)
+    yield db, statements
+    db.close()
+
+
+def run(db: DatabaseConnection, query: str, *values) -> tuple[list[dict], set[str]]:
+    with db.get_cursor() as cursor:
+        db.execute(cursor, query, values)
+        rows = cursor.fetchall()
+        cursor.execute("SELECT name FROM pg_prepared_statements")
+        prepared = {row["name"] for row in cursor.fetchall()}
+    return rows, prepared
+
+
+def test_numbered_placeholders():
+    assert StatementRegistry.numbered("a = %s AND b < %s") == "a = $1 AND b < $2"
+
+
+def test_each_shape_is_prepared_once_per_connection(registry_db):
+    db, statements = registry_db
+
+    for value in (1, 2, 3):
+        rows, _ = run(db, "SELECT %s::int AS value", value)
+        assert rows == [{"value": value}]
+
+    assert statements.stats()["prepares"] == 1
+    assert statements.stats()["executions"] == 3
+
+
+def test_reaching_the_limit_deallocates_and_prepares_again(registry_db):
+    db, statements = registry_db
+    shapes = ["SELECT %s::int AS value", "SELECT %s::int + 1 AS value", "SELECT %s::int + 2 AS value"]
+
+    run(db, shapes[0], 1)
+    run(db, shapes[1], 1)
+    rows, prepared = run(db, shapes[2], 1)
+
+    assert rows == [{"value": 3}]
+    assert prepared == {StatementRegistry.statement_name(shapes[2])}
+    assert statements.stats()["resets"] == 1
+
+    # The first shape was deallocated with the rest and is prepared again
+    rows, prepared = run(db, shapes[0], 5)
+    assert rows == [{"value": 5}]
+    assert len(prepared) == 2
+    assert statements.stats()["prepares"] == 4
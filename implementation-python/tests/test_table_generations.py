@@ -0,0 +1,37 @@
+from src.database.repository import TableGenerations
+from src.schemas import TableName
+
+EXPENSES, SAVINGS = TableName.EXPENSES, TableName.SAVINGS
+
+
+def test_bump_invalidates_only_that_user():
+    generations = TableGenerations(TableName)
+    before = {user: generations.get(EXPENSES, user) for user in ("ana", "bob")}
+
+    generations.bump(EXPENSES, "ana")
+
+    assert generations.get(EXPENSES, "ana") != before["ana"]
+    assert generations.get(EXPENSES, "bob") == before["bob"]
+
+
+def test_user_counters_are_bounded_and_eviction_bumps_the_table():
+    generations = TableGenerations(TableName, max_users=2)
+    generations.bump(EXPENSES, "ana")
+    stale = generations.get(EXPENSES, "ana")
+    savings = generations.get(SAVINGS, "ana")
+
+    generations.bump(EXPENSES, "bob")
+    generations.bump(EXPENSES, "eve")
+
+    assert len(generations._users) == 2
+    # ana's counter was forgotten: her old keys must not come back
+    assert generations.get(EXPENSES, "ana") != stale
+    assert generations.get(SAVINGS, "ana") == savings
+
+
+def test_reads_do_not_add_counters():
+    generations = TableGenerations(TableName, max_users=2)
+    for n in range(100):
+        generations.get(EXPENSES, f"user-{n}")
+
+    assert len(generations._users) == 0
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+
+from src.agent.tools import ToolRegistry
+from src.observability.metrics import TOOL_ERRORS
+
+
+def wait_for_errors(tool: str, expected: float) -> float:
+    deadline = time.monotonic() + 2
+    while TOOL_ERRORS.value(tool) < expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    return TOOL_ERRORS.value(tool)
+
+
+def make_registry(release: threading.Event, max_concurrency: int = 2) -> ToolRegistry:
+    registry = ToolRegistry(repository=None, max_concurrency=max_concurrency, timeout_seconds=0.2)
+
+    def stuck() -> dict:
+        release.wait(5)
+        return {"success": True}
+
+    def failing() -> dict:
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    def slow() -> dict:
+        time.sleep(0.12)
+        return {"success": True}
+
+    registry._tools.update({
+        "stuck": stuck,
+        "slow": slow,
+        "quick": lambda: {"success": True},
+        "failing": failing,
+        "insert_record": lambda **arguments: stuck(),
+    })
+    return registry
+
+
+def run_async(registry: ToolRegistry, release: threading.Event, calls: list) -> list[dict]:
+    async def main() -> list[dict]:
+        try:
+            return await registry.aexecute_many(calls, "u")
+        finally:
+            # Let to_thread workers finish before asyncio.run shuts the default executor down
+            release.set()
+
+    return asyncio.run(main())
+
+
+def test_execute_many_gives_each_tool_its_own_deadline():
+    release = threading.Event()
+    registry = make_registry(release, max_concurrency=1)
+    try:
+        start = time.perf_counter()
+        results = registry.execute_many([("slow", {}), ("slow", {}), ("slow", {})], "u")
+        elapsed = time.perf_counter() - start
+    finally:
+        release.set()
+
+    # Together they take longer than one timeout, but none of them runs past its own
+    assert elapsed > 0.3
+    assert [r["success"] for r in results] == [True, True, True]
+
+
+def test_execute_many_frees_the_slot_of_a_timed_out_tool():
+    release = threading.Event()
+    registry = make_registry(release)
+    try:
+        start = time.perf_counter()
+        results = registry.execute_many([("stuck", {}), ("stuck", {}), ("quick", {})], "u")
+        elapsed = time.perf_counter() - start
+    finally:
+        release.set()
+
+    assert elapsed < 0.5
+    assert [r["success"] for r in results] == [False, False, True]
+
+
+def test_execute_many_times_out_a_single_call():
+    release = threading.Event()
+    registry = make_registry(release)
+    try:
+        start = time.perf_counter()
+        results = registry.execute_many([("stuck", {})], "u")
+        elapsed = time.perf_counter() - start
+    finally:
+        release.set()
+
+    assert elapsed < 0.5
+    assert results[0]["success"] is False
+    assert "Tiempo de espera agotado" in results[0]["error"]
+
+
+def test_timed_out_write_is_reported_as_unknown():
+    release = threading.Event()
+    registry = make_registry(release)
+    try:
+        results = registry.execute_many([("insert_record", {"table": "expenses", "amount": 1})], "u")
+    finally:
+        release.set()
+
+    assert results[0]["success"] is None
+    assert results[0]["status"] == "unknown"
+
+
+def test_stuck_tools_do_not_starve_later_calls():
+    release = threading.Event()
+    registry = make_registry(release)
+    try:
+        registry.execute_many([("stuck", {}), ("stuck", {})], "u")
+        results = registry.execute_many([("quick", {}), ("quick", {})], "u")
+    finally:
+        release.set()
+
+    assert [r["success"] for r in results] == [True, True]
+
+
+def test_aexecute_many_gives_each_tool_its_own_deadline():
+    release = threading.Event()
+    registry = make_registry(release, max_concurrency=1)
+
+    results = run_async(registry, release, [("slow", {}), ("slow", {}), ("slow", {})])
+
+    assert [r["success"] for r in results] == [True, True, True]
+
+
+def test_aexecute_many_times_out_single_calls_and_reports_writes_as_unknown():
+    release = threading.Event()
+    registry = make_registry(release)
+
+    read = run_async(registry, release, [("stuck", {})])
+    release.clear()
+    write = run_async(registry, release, [("insert_record", {"table": "expenses", "amount": 1})])
+
+    assert read[0]["success"] is False
+    assert write[0]["status"] == "unknown"
+
+
+def test_timed_out_tool_counts_as_one_error_even_if_it_fails_later():
+    release = threading.Event()
+    registry = make_registry(release)
+    registry._tools["stuck_ok"] = registry._tools["stuck"]
+    before_failing, before_ok = TOOL_ERRORS.value("failing"), TOOL_ERRORS.value("stuck_ok")
+    try:
+        registry.execute_many([("failing", {}), ("stuck_ok", {})], "u")
+    finally:
+        release.set()
+
+    assert wait_for_errors("failing", before_failing + 1) == before_failing + 1
+    assert wait_for_errors("stuck_ok", before_ok + 1) == before_ok + 1
+
+
+def test_async_timeout_counts_as_one_error():
+    release = threading.Event()
+    registry = make_registry(release)
+    before = TOOL_ERRORS.value("failing")
+
+    run_async(registry, release, [("failing", {})])
+
+    assert wait_for_errors("failing", before + 1) == before + 1
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.cache import TTLCache
+
+
+def test_concurrent_misses_run_the_loader_once():
+    cache: TTLCache[int] = TTLCache()
+    calls = 0
+    release = threading.Event()
+
+    def loader() -> int:
+        nonlocal calls
+        calls += 1
+        release.wait(2)
+        return 42
+
+    results: list[int] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert results == [42] * 5
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_loader_error_reaches_every_waiter_and_is_not_cached():
+    cache: TTLCache[int] = TTLCache()
+    release = threading.Event()
+
+    def failing() -> int:
+        release.wait(2)
+        raise RuntimeError("boom")
+
+    errors: list[BaseException] = []
+
+    def call() -> None:
+        try:
+            cache.get_or_load("k", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert cache.get_or_load("k", lambda: 1) == 1
+
+
+def test_should_cache_skips_storing_but_returns_the_value():
+    cache: TTLCache[dict] = TTLCache()
+
+    assert cache.get_or_load("k", lambda: {"success": False}, lambda v: v["success"]) == {"success": False}
+    assert cache.get_or_load("k", lambda: {"success": True}, lambda v: v["success"]) == {"success": True}
+    assert cache.get("k") == {"success": True}
+
+
+def test_entries_expire_and_the_least_recently_used_is_evicted():
+    cache: TTLCache[int] = TTLCache(max_size=2, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_async_concurrent_misses_run_the_loader_once():
+    cache: TTLCache[int] = TTLCache()
+    calls = 0
+
+    async def loader() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return 42
+
+    async def main() -> list[int]:
+        return await asyncio.gather(*(cache.aget_or_load("k", loader) for _ in range(5)))
+
+    assert asyncio.run(main()) == [42] * 5
+    assert calls == 1
+
+
+def test_async_waiters_reload_when_the_loading_caller_is_cancelled():
+    cache: TTLCache[int] = TTLCache()
+    calls = 0
+
+    async def loader() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05 if calls == 1 else 0)
+        return calls
+
+    async def main() -> int:
+        leader = asyncio.ensure_future(cache.aget_or_load("k", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.aget_or_load("k", loader))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(main()) == 2
+
+
+def test_async_cancelled_waiter_does_not_cancel_the_load():
+    cache: TTLCache[int] = TTLCache()
+
+    async def loader() -> int:
+        await asyncio.sleep(0.03)
+        return 7
+
+    async def main() -> int:
+        leader = asyncio.ensure_future(cache.aget_or_load("k", loader))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(cache.aget_or_load("k", loader), 0.01)
+        return await leader
+
+    assert asyncio.run(main()) == 7